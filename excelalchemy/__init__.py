@@ -6,6 +6,12 @@ from excelalchemy.const import DataRangeOption
 from excelalchemy.const import DateFormat
 from excelalchemy.const import Option
 from excelalchemy.core.alchemy import ExcelAlchemy
+from excelalchemy.core.multi_sheet import MultiSheetExcelAlchemy
+from excelalchemy.core.source import BytesSource
+from excelalchemy.core.source import FileSource
+from excelalchemy.core.source import MinioSource
+from excelalchemy.core.source import PathSource
+from excelalchemy.core.stream import ImportRowStream
 from excelalchemy.exc import ConfigError
 from excelalchemy.exc import ExcelCellError
 from excelalchemy.exc import ProgrammaticError
@@ -13,6 +19,7 @@ from excelalchemy.helper.pydantic import extract_pydantic_model
 from excelalchemy.types.alchemy import ExporterConfig
 from excelalchemy.types.alchemy import ImporterConfig
 from excelalchemy.types.alchemy import ImportMode
+from excelalchemy.types.alchemy import ReaderEngine
 from excelalchemy.types.field import FieldMeta
 from excelalchemy.types.field import PatchFieldMeta
 from excelalchemy.types.identity import ColumnIndex
@@ -23,6 +30,7 @@ from excelalchemy.types.identity import RowIndex
 from excelalchemy.types.identity import UniqueKey
 from excelalchemy.types.identity import UniqueLabel
 from excelalchemy.types.result import ImportResult
+from excelalchemy.types.result import MultiSheetImportResult
 from excelalchemy.types.result import ValidateHeaderResult
 from excelalchemy.types.result import ValidateResult
 from excelalchemy.types.result import ValidateRowResult
@@ -48,6 +56,7 @@ from excelalchemy.util.file import flatten
 
 __all__ = [
     'Boolean',
+    'BytesSource',
     'ColumnIndex',
     'Date',
     'DateFormat',
@@ -58,13 +67,18 @@ __all__ = [
     'ExcelCellError',
     'ExporterConfig',
     'FieldMeta',
+    'FileSource',
     'ImportMode',
     'ImportResult',
+    'ImportRowStream',
     'ImporterConfig',
     'Key',
     'Label',
+    'MinioSource',
     'Money',
     'MultiCheckbox',
+    'MultiSheetExcelAlchemy',
+    'MultiSheetImportResult',
     'MultiOrganization',
     'MultiStaff',
     'MultiTreeNode',
@@ -73,10 +87,12 @@ __all__ = [
     'Option',
     'OptionId',
     'PatchFieldMeta',
+    'PathSource',
     'PhoneNumber',
     'ProgrammaticError',
     'ConfigError',
     'Radio',
+    'ReaderEngine',
     'RowIndex',
     'SingleOrganization',
     'SingleStaff',
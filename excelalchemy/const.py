@@ -40,6 +40,27 @@ BACKGROUND_REQUIRED_COLOR = 'FDAFB5'
 BACKGROUND_ERROR_COLOR = 'FEC100'
 FONT_READ_COLOR = 'FF0000'
 
+# 下载文件时, 小于该字节数的文件保存在内存中, 否则写入磁盘
+DEFAULT_SPOOL_MAX_SIZE = 16 * 1024 * 1024
+
+# 错误预算按失败比例判断时, 统计前多少行数据
+DEFAULT_FAILURE_RATIO_WINDOW = 100
+
+# 导入时每列按原始值缓存处理结果的数量
+DEFAULT_CELL_CACHE_SIZE = 4096
+
+# 导入时每处理多少行主动让出一次事件循环
+DEFAULT_YIELD_INTERVAL_ROWS = 256
+
+# 导入时在后台提前读取并校验的数据块数量
+DEFAULT_PREFETCH_CHUNKS = 2
+
+# 每次调用批量创建/更新函数的行数
+DEFAULT_BULK_BATCH_SIZE = 500
+
+# 按列返回导入数据时每批的行数
+DEFAULT_STREAM_BATCH_SIZE = 1024
+
 # 多选分隔符
 MULTI_CHECKBOX_SEPARATOR = '，'
 
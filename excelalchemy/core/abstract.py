@@ -1,7 +1,13 @@
+import itertools
 from abc import ABC
 from abc import abstractmethod
+from os import PathLike
+from typing import IO
+from typing import TYPE_CHECKING
 from typing import Any
+from typing import ContextManager
 from typing import Generic
+from typing import Iterator
 
 from excelalchemy.const import ContextT
 from excelalchemy.const import CreateModelT
@@ -9,11 +15,16 @@ from excelalchemy.const import ExporterModelT
 from excelalchemy.const import ImporterCreateModelT
 from excelalchemy.const import ImporterUpdateModelT
 from excelalchemy.const import UpdateModelT
+from excelalchemy.core.sheet_xml import RawRow
+from excelalchemy.exc import ConfigError
 from excelalchemy.types.identity import Base64Str
 from excelalchemy.types.identity import Key
 from excelalchemy.types.identity import UrlStr
 from excelalchemy.types.result import ImportResult
 
+if TYPE_CHECKING:
+    from excelalchemy.core.stream import ImportRowStream
+
 
 class ABCExcelAlchemy(
     ABC,
@@ -31,9 +42,17 @@ class ABCExcelAlchemy(
         """下载导入模版, Excel 字段顺序与定义的导出模型一致"""
 
     @abstractmethod
-    async def import_data(self, input_excel_name: str, output_excel_name: str) -> ImportResult:
+    async def import_data(self, input_excel_name: 'ImportSource', output_excel_name: str) -> ImportResult:
         """导入数据"""
 
+    @abstractmethod
+    async def validate_data(self, input_excel_name: 'ImportSource', output_excel_name: str) -> ImportResult:
+        """只校验数据, 不调用 creator/updater"""
+
+    @abstractmethod
+    def iter_rows(self, input_excel_name: 'ImportSource', output_excel_name: str) -> 'ImportRowStream':
+        """逐行返回校验后的数据, 由调用方写入数据"""
+
     @abstractmethod
     def export(self, data: list[dict[str, Any]], keys: list[Key] | None = None) -> Base64Str:
         """导出数据，返回 base64 编码的 excel 文件, 字段顺序与定义的导出模型一致"""
@@ -45,3 +64,120 @@ class ABCExcelAlchemy(
     @abstractmethod
     def add_context(self, context: ContextT):
         """添加上下文"""
+
+
+class ABCImportSource(ABC):
+    """用户上传文件的来源"""
+
+    name: str = ''  # 文件名, 用于根据后缀识别 CSV/TSV 文件
+
+    @abstractmethod
+    def open(self) -> ContextManager[IO[bytes]]:
+        """打开文件, 退出上下文时只释放来源自己创建的资源"""
+
+
+# import_data 支持的文件来源, 字符串视为 Minio 中的文件名, 兼容旧的调用方式
+ImportSource = ABCImportSource | str | bytes | PathLike[str] | IO[bytes]
+
+
+# 用于解析表头的行数, 合并表头占两行
+HEADER_PROBE_ROW_COUNT = 2
+
+
+class ABCExcelReader(ABC):
+    """读取用户上传的 Excel, 逐行返回单元格的字符串值 (typed 为 True 时为原生值), 空单元格为 None
+
+    读取规则与 pandas.read_excel(dtype=str) 保持一致: 空行会被保留, 但末尾的空行不会返回; 列数由表头决定.
+    连续空行达到 max_empty_rows 时停止读取, 避免遍历被整列设置过格式的空白区域.
+    指定 columns 时只解析并返回这些位置的列, 其余单元格不解码, 空行也只按这些列判断.
+    子类只需要实现 _iter_raw_rows 与 close
+    """
+
+    def __init__(
+        self,
+        file: IO[bytes],
+        sheet_name: str,
+        skip_rows: int = 0,
+        *,
+        column_count: int | None = None,
+        max_empty_rows: int | None = None,
+        typed: bool = False,
+        columns: list[int] | None = None,
+    ):
+        if columns is not None and column_count is None:
+            raise ConfigError('只读取部分列时需要指定列数')
+        self.file = file
+        self.sheet_name = sheet_name
+        self.skip_rows = skip_rows  # 跳过的行数, 例如 HEADER_HINT
+        self.column_count = column_count  # 表头的列数, 未指定时由 read_header 确定
+        self.max_empty_rows = max_empty_rows  # 连续空行的上限, None 表示不限制
+        self.typed = typed  # 是否返回单元格的原生值, 例如数值为 int/float, 日期为 datetime
+        self.columns = columns  # 需要读取的列在 Sheet 中的位置, None 表示读取全部列
+        self.column_set: frozenset[int] | None = frozenset(columns) if columns is not None else None
+        self.file.seek(0)
+
+    @abstractmethod
+    def _iter_raw_rows(self) -> Iterator[RawRow]:
+        """逐行返回跳过 skip_rows 之后的原始数据, 不需要补齐列数; 不在 column_set 中的单元格可以直接返回 None"""
+
+    @abstractmethod
+    def close(self) -> None:
+        """释放读取时占用的资源, 不负责关闭 file"""
+
+    def read_header(self, row_count: int = HEADER_PROBE_ROW_COUNT) -> list[RawRow]:
+        """读取表头所在的行, 并以此确定列数"""
+        header_rows, self.column_count = fit_header(list(itertools.islice(self._iter_raw_rows(), row_count)))
+        return header_rows
+
+    def iter_rows(self) -> Iterator[RawRow]:
+        """逐行返回数据, 包含表头行; 指定 columns 时每行只包含这些列, 顺序与 columns 一致"""
+        if self.column_count is None:
+            self.read_header()
+        column_count = self.column_count or 0
+        columns = self.columns
+        row_width = column_count if columns is None else len(columns)
+
+        empty_row_count = 0  # 连续空行的数量, 空行只有在后面还有数据时才返回
+        for row in self._iter_raw_rows():
+            row = fit_row(row, column_count)
+            if columns is not None:
+                row = [row[index] for index in columns]
+            if not is_empty_row(row):
+                for _ in range(empty_row_count):
+                    yield [None] * row_width
+                empty_row_count = 0
+                yield row
+                continue
+
+            empty_row_count += 1
+            if self.max_empty_rows is not None and empty_row_count >= self.max_empty_rows:
+                return  # 之后的行视为 Sheet 维度声明过大产生的空行
+
+    def __enter__(self) -> 'ABCExcelReader':
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+
+def is_empty_row(row: RawRow) -> bool:
+    """判断是否为空行"""
+    return all(value is None for value in row)
+
+
+def fit_row(row: RawRow, column_count: int) -> RawRow:
+    """按照列数截断或补齐"""
+    if len(row) >= column_count:
+        return row[:column_count]
+    return row + [None] * (column_count - len(row))
+
+
+def fit_header(header_rows: list[RawRow]) -> tuple[list[RawRow], int]:
+    """以表头中最长的一行确定列数, 末尾的空单元格不计入"""
+    column_count = 0
+    for row in header_rows:
+        length = len(row)
+        while length and row[length - 1] is None:
+            length -= 1
+        column_count = max(column_count, length)
+    return [fit_row(row, column_count) for row in header_rows], column_count
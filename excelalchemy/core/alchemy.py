@@ -1,15 +1,20 @@
+import asyncio
+import contextlib
 import itertools
 import logging
 from collections import defaultdict
+from collections import deque
+from concurrent.futures import Executor
 from decimal import Decimal
 from functools import cached_property
 from itertools import chain
-from os import PathLike
+from typing import IO
 from typing import Any
-from typing import Awaitable
+from typing import AsyncGenerator
 from typing import Callable
 from typing import Generator
 from typing import Iterable
+from typing import Iterator
 from typing import Type
 from typing import cast
 
@@ -30,14 +35,34 @@ from excelalchemy.const import ImporterCreateModelT
 from excelalchemy.const import ImporterUpdateModelT
 from excelalchemy.const import UpdateModelT
 from excelalchemy.core.abstract import ABCExcelAlchemy
+from excelalchemy.core.abstract import ABCExcelReader
+from excelalchemy.core.abstract import ABCImportSource
+from excelalchemy.core.abstract import ImportSource
+from excelalchemy.core.chunks import Chunk
+from excelalchemy.core.chunks import aggregate_chunks
+from excelalchemy.core.chunks import prefetch
+from excelalchemy.core.chunks import run_in_executor
+from excelalchemy.core.chunks import validate_chunk
+from excelalchemy.core.pipeline import ImportPipeline
+from excelalchemy.core.reader import create_reader
+from excelalchemy.core.reader import get_csv_delimiter
+from excelalchemy.core.reader import probe_header
+from excelalchemy.core.row_plan import RowPlan
+from excelalchemy.core.sheet_xml import RawRow
+from excelalchemy.core.sheet_xml import stringify_cell_value
+from excelalchemy.core.source import to_import_source
+from excelalchemy.core.stream import ImportRowStream
+from excelalchemy.core.writer import DataSheet
 from excelalchemy.core.writer import render_data_excel
 from excelalchemy.core.writer import render_merged_header_excel
+from excelalchemy.core.writer import render_multi_sheet_data_excel
 from excelalchemy.core.writer import render_simple_header_excel
 from excelalchemy.exc import ConfigError
 from excelalchemy.exc import ExcelCellError
 from excelalchemy.exc import ExcelRowError
 from excelalchemy.helper.pydantic import extract_pydantic_model
-from excelalchemy.helper.pydantic import instantiate_pydantic_model
+from excelalchemy.helper.pydantic import get_column_validated_keys
+from excelalchemy.helper.pydantic import validate_row_data
 from excelalchemy.types.abstract import SystemReserved
 from excelalchemy.types.alchemy import ExcelMode
 from excelalchemy.types.alchemy import ExporterConfig
@@ -58,12 +83,12 @@ from excelalchemy.types.result import ValidateHeaderResult
 from excelalchemy.types.result import ValidateResult
 from excelalchemy.types.result import ValidateRowResult
 from excelalchemy.util.file import flatten
-from excelalchemy.util.file import read_file_from_minio_object
 from excelalchemy.util.file import remove_excel_prefix
 from excelalchemy.util.file import upload_file_from_minio_object
 
 HEADER_HINT_LINE_COUNT = 1  # HEADER_HINT 占用的行数
 
+
 # 导入结果的字段元数据, 依据产品定义，占两列
 # 1. 导入结果结果列
 RESULT_COLUMN = FieldMetaInfo(label=RESULT_COLUMN_LABEL)
@@ -120,7 +145,7 @@ class ExcelAlchemy(
 
         # 业务端调用方法初始化·或者从配置文件初始化
         self.context: ContextT | None = None  # 转换器上下文
-        self.__state_df_has_been_loaded__ = False  # df 是否已经被加载
+        self.__state_df_has_been_loaded__ = False  # 表头是否已经被加载
 
         # 初始化·最后调用
         self.__init_from_config__()
@@ -194,37 +219,203 @@ class ExcelAlchemy(
             df = self._export_with_simple_header(sample_data, keys)
             return render_simple_header_excel(df, self.unique_label_to_field_meta)
 
-    async def import_data(self, input_excel_name: str, output_excel_name: str) -> ImportResult:
-        """导入数据"""
+    async def import_data(self, input_excel_name: ImportSource, output_excel_name: str) -> ImportResult:
+        """导入数据
+
+        input_excel_name 可以是 Minio 中的文件名, 也可以是文件内容、本地路径、文件对象或者 ABCImportSource
+        """
+        return await self._import_data(input_excel_name, output_excel_name)
+
+    async def validate_data(self, input_excel_name: ImportSource, output_excel_name: str) -> ImportResult:
+        """只校验表头与数据, 不调用 creator/updater, 用于在导入之前检查文件能否全部导入
+
+        校验失败时同样上传标记了错误的结果文件; CREATE_OR_UPDATE 模式下按创建模型校验, 不调用 is_data_exist
+        """
+        return await self._import_data(input_excel_name, output_excel_name, dry_run=True)
+
+    def iter_rows(self, input_excel_name: ImportSource, output_excel_name: str) -> ImportRowStream:
+        """逐行返回校验后的数据, 由调用方写入数据, 不调用 creator/updater
+
+        需要在 async with 中迭代, 退出时统计导入结果并上传标记了错误的结果文件, 结果保存在 ImportRowStream.result;
+        CREATE_OR_UPDATE 模式下按创建模型校验, 不调用 is_data_exist
+        """
+        if self.excel_mode != ExcelMode.IMPORT:
+            raise ConfigError('只支持导入模式调用此方法')
+        return ImportRowStream(self, input_excel_name, output_excel_name)
+
+    async def _import_data(
+        self,
+        input_excel_name: ImportSource,
+        output_excel_name: str,
+        dry_run: bool = False,
+    ) -> ImportResult:
         assert isinstance(self.config, ImporterConfig)  # only for type check
         if self.excel_mode != ExcelMode.IMPORT:
             raise ConfigError('只支持导入模式调用此方法')
 
-        validate_header = self._validate_header(input_excel_name)  # 验证表头
-        if not validate_header.is_valid:
-            return ImportResult.from_validate_header_result(validate_header)
+        executor = self.config.executor  # 配置了 executor 时, CPU 密集的步骤在其中执行, 不阻塞事件循环
+        source = self._import_source(input_excel_name)
+        delimiter = get_csv_delimiter(source.name)  # CSV/TSV 文件不经过 xlsx 的解析
+        with source.open() as file_object:
+            # 验证表头, 只读取表头所在的行
+            validate_header = await run_in_executor(executor, self._validate_header, file_object, delimiter)
+            if not validate_header.is_valid:
+                return ImportResult.from_validate_header_result(validate_header)
+
+            import_result = await self._import_rows(file_object, delimiter, executor, dry_run=dry_run)
+
+        if import_result.result == ValidateResult.DATA_INVALID:
+            content_with_prefix = await run_in_executor(executor, self._render_import_result_excel)
+            import_result.url = await run_in_executor(
+                executor, self._upload_file, output_excel_name, content_with_prefix
+            )
+        return import_result
 
-        self.df = self.df.iloc[1:]  # 去掉表头
-        self._set_columns(self.df)  # pyright: reportGeneralTypeIssues=false
-        self.df = self.df.reset_index(drop=True)  # 重置索引
+    # 以下方法供 ImportRowStream、MultiSheetExcelAlchemy 与 ImportPipeline 调用, 不属于对业务端承诺的接口
 
-        all_success, success_count, fail_count = True, 0, 0
-        for pandas_row_index, row in self.df.iloc[self.extra_header_count_on_import :].iterrows():
-            aggregate_data = self._aggregate_data(cast(dict[UniqueLabel, Any], row.to_dict()))
-            success = await self._dml_caller(cast(RowIndex, pandas_row_index), aggregate_data)
-            all_success = all_success and success
-            success_count, fail_count = (success_count + 1, fail_count) if success else (success_count, fail_count + 1)
+    def _import_source(self, input_excel_name: ImportSource) -> ABCImportSource:
+        """获取用户上传文件的来源"""
+        assert isinstance(self.config, ImporterConfig)  # only for type check
+        return to_import_source(
+            input_excel_name,
+            self.config.minio,
+            self.config.bucket_name,
+            self.config.spool_max_size,
+        )
 
-        url = None
+    async def _import_rows(
+        self,
+        file_object: IO[bytes],
+        delimiter: str | None = None,
+        executor: Executor | None = None,
+        dry_run: bool = False,
+    ) -> ImportResult:
+        """逐行导入数据, 调用前需要先验证表头; 导入失败时, 加载完整的 df 并写入结果列, 用于渲染导入结果
+
+        指定 executor 时, 解析、序列化、模型校验与 data_converter 按块在 executor 中执行, 事件循环只负责调用 DML
+        (未开启 single_pass_upsert 的 CREATE_OR_UPDATE 模式仍在事件循环中逐行校验);
+        配置了 validation_workers 时, 序列化与校验在进程池中并行执行;
+        prefetch_chunks 大于 0 时在后台任务中提前读取并校验后续的数据块, 与当前数据块的 DML 同时进行;
+        DML 的调用方式与错误预算见 ImportPipeline
+        """
+        assert isinstance(self.config, ImporterConfig)  # only for type check
+        reader = await run_in_executor(
+            executor, self._create_reader, file_object, self.imported_excel_columns, delimiter
+        )
+        pipeline = ImportPipeline(self, dry_run)
+        with reader:
+            plan = self._compile_row_plan(dry_run)
+            await pipeline.run(self._iter_chunks(reader, plan, executor))
+            logging.debug('单元格缓存的命中与未命中次数: %s', plan.cache_stats())
+
+        all_success = pipeline.fail_count == 0
         if not all_success:
-            self._add_result_column()
-            content_with_prefix = self._render_import_result_excel()
-            url = self._upload_file(output_excel_name, content_with_prefix)
+            # 只有导入失败时才需要完整的数据, 用于渲染导入结果
+            row_limit = cast(int, pipeline.last_row_index) + 1 if pipeline.is_aborted else None
+            await run_in_executor(executor, self._load_import_result, file_object, delimiter, row_limit)
+
         return ImportResult(
             result=(ValidateResult.DATA_INVALID, ValidateResult.SUCCESS)[int(all_success)],
-            url=url,
-            success_count=success_count,
-            fail_count=fail_count,
+            success_count=pipeline.success_count,
+            fail_count=pipeline.fail_count,
+            is_aborted=pipeline.is_aborted,
+        )
+
+    async def _iter_validated_rows(
+        self,
+        file_object: IO[bytes],
+        delimiter: str | None = None,
+        convert: bool = True,
+    ) -> AsyncGenerator[tuple[RowIndex, dict[str, Any] | list[ExcelCellError]], None]:
+        """逐行返回校验后的数据, convert 为 True 时经过 data_converter, 与传给 creator/updater 的数据一致;
+        校验失败时返回已经注册的错误. 每块数据的校验与转换在 executor 中执行
+        """
+        assert isinstance(self.config, ImporterConfig)  # only for type check
+        executor, yield_interval = self.config.executor, self.config.yield_interval_rows
+        importer_model = cast(type[BaseModel], self._importer_model)
+        data_converter = self.config.data_converter if convert else None
+        reader = await run_in_executor(
+            executor, self._create_reader, file_object, self.imported_excel_columns, delimiter
+        )
+        with reader:
+            chunks = self._iter_chunks(reader, self._compile_row_plan(dry_run=True), executor)
+            row_count = 0
+            async with contextlib.aclosing(chunks):
+                async for chunk in chunks:
+                    validated_rows = await self._validate_chunk(chunk, importer_model, data_converter, executor)
+                    pending = deque(validated_rows)
+                    try:
+                        while pending:
+                            row_index = pending.popleft()
+                            yield row_index, validated_rows[row_index]
+                            row_count += 1
+                            if yield_interval and row_count % yield_interval == 0:
+                                await asyncio.sleep(0)
+                    finally:
+                        self._discard_row_errors(pending)  # 调用方提前停止迭代时, 还没有返回的行不出现在导入结果中
+
+    def _iter_chunks(
+        self, reader: ABCExcelReader, plan: RowPlan, executor: Executor | None
+    ) -> AsyncGenerator[Chunk, None]:
+        """逐块读取并聚合数据, 按配置在进程池中聚合并提前预读后续的数据块"""
+        assert isinstance(self.config, ImporterConfig)  # only for type check
+        rows = self._iter_row_data(reader)  # 逐行读取, 不需要把整个文件读入内存
+        chunks = aggregate_chunks(executor, plan, rows, self.config.validation_workers)  # 进程池只在这次导入中使用
+        return prefetch(chunks, self.config.prefetch_chunks)
+
+    def _compile_row_plan(self, dry_run: bool = False) -> RowPlan:
+        """根据需要导入的列编译行处理计划, 每次导入只编译一次
+
+        CREATE_OR_UPDATE 模式下, 每行使用的模型在调用 is_data_exist 之后才能确定, 只校验或者开启 single_pass_upsert 时才预先按列校验
+        """
+        assert isinstance(self.config, ImporterConfig)  # only for type check
+        validated_model: type[BaseModel] | None = None
+        if dry_run or self.config.import_mode != ImportMode.CREATE_OR_UPDATE:
+            validated_model = cast(type[BaseModel], self._importer_model)
+        else:
+            validated_model = self._single_pass_model
+        validated_keys = get_column_validated_keys(validated_model) if validated_model else frozenset()
+        return RowPlan.compile(
+            [self.unique_label_to_field_meta[x] for x in self.imported_excel_columns],
+            self.parent_key_to_field_metas,
+            # 更新模式下, 空单元格表示将该值设置为 None
+            keep_missing=self.config.import_mode in (ImportMode.UPDATE, ImportMode.CREATE_OR_UPDATE),
+            validated_keys=validated_keys,
+            cache_size=self.config.cell_cache_size,
+        )
+
+    def _load_import_result(
+        self,
+        file_object: IO[bytes],
+        delimiter: str | None = None,
+        row_limit: int | None = None,
+    ) -> DataFrame:
+        """读取完整的 df 并写入结果列, 忽略导入的列也会原样写回导入结果; row_limit 为导入提前终止时已经处理的行数"""
+        with self._create_reader(file_object, self.input_excel_columns, delimiter) as reader:
+            self._read_dataframe(reader, row_limit)
+        self._add_result_column()
+        return self.df
+
+    def _create_reader(
+        self,
+        file_object: IO[bytes],
+        columns: list[UniqueLabel],
+        delimiter: str | None = None,
+    ) -> ABCExcelReader:
+        """创建只解析 columns 对应列的读取器"""
+        assert isinstance(self.config, ImporterConfig)  # only for type check
+        column_count = len(self.header_df.columns)
+        positions = [self.input_excel_column_positions[x] for x in columns]
+        return create_reader(
+            self.config.reader_engine,
+            file_object,
+            self.config.sheet_name,
+            skip_rows=HEADER_HINT_LINE_COUNT,
+            column_count=column_count,
+            max_empty_rows=self.config.max_empty_rows,
+            typed=self.config.typed_ingest,
+            delimiter=delimiter,
+            columns=None if positions == list(range(column_count)) else positions,  # 读取全部列时不需要逐个判断
         )
 
     def export(self, data: list[dict[str, Any]], keys: list[Key] | None = None) -> Base64Str:
@@ -281,6 +472,11 @@ class ExcelAlchemy(
                 return 1
         return 0
 
+    @property
+    def _importer_model(self) -> type[ImporterCreateModelT] | type[ImporterUpdateModelT] | type[ExporterModelT]:
+        """当前模式下校验数据使用的模型"""
+        return self.__get_importer_model__()
+
     @property
     def exporter_model(self) -> Type[ExporterModelT]:
         if isinstance(self.config, ImporterConfig):
@@ -337,16 +533,19 @@ class ExcelAlchemy(
 
         return df, has_merged_header
 
-    def _validate_header(self, input_excel_name: str) -> ValidateHeaderResult:
+    def _validate_header(self, file_object: IO[bytes], delimiter: str | None = None) -> ValidateHeaderResult:
         """验证表头"""
         if self.excel_mode != ExcelMode.IMPORT:
             raise ConfigError('只支持导入模式调用此方法')
         assert isinstance(self.config, ImporterConfig)  # only for type hint, not for runtime
-        self._read_dataframe(input_excel_name)
+        self._read_header(file_object, delimiter)
 
         required_labels = [x.label for x in self.ordered_field_meta if x.required]
         primary_labels = [x.label for x in self.ordered_field_meta if x.is_primary_key]
-        input_labels = [x.label for x in self.input_excel_headers]
+        # 重新上传的导入结果中的结果列与失败原因列不校验, 读取时也会被跳过
+        input_labels = [
+            x.label for x in self.input_excel_headers if x.unique_label not in self.import_result_label_to_field_meta
+        ]
 
         visited = set()
         duplicated = [x for x in input_labels if x in visited or visited.add(x)]  # type: ignore[func-returns-value]
@@ -368,15 +567,20 @@ class ExcelAlchemy(
 
     def _render_import_result_excel(self) -> str:
         """执行导入后，渲染数据"""
-        content_with_prefix = render_data_excel(
+        assert isinstance(self.config, ImporterConfig)  # only for type check
+        content_with_prefix = render_multi_sheet_data_excel({self.config.sheet_name: self._import_result_sheet()})
+
+        return content_with_prefix
+
+    def _import_result_sheet(self) -> DataSheet:
+        """执行导入后, 需要写入导入结果的 Sheet"""
+        return DataSheet(
             self.df,
             errors=self.cell_errors,
             field_meta_mapping=self.import_result_label_to_field_meta | self.unique_label_to_field_meta,
             has_merged_header=self.input_excel_has_merged_header,
         )
 
-        return content_with_prefix
-
     def _upload_file(self, output_name: str, content_with_prefix: str) -> UrlStr:
         """上传文件"""
         assert isinstance(self.config, (ExporterConfig, ImporterConfig))  # only for type check
@@ -404,14 +608,36 @@ class ExcelAlchemy(
 
     def _set_columns(self, df: DataFrame) -> DataFrame:
         """设置列名"""
-        columns = []
-        for header in self.input_excel_headers:
-            if header.unique_label not in self.get_output_parent_excel_headers():
+        df.columns = self.input_excel_columns  # type: ignore[assignment]
+        return df
+
+    @cached_property
+    def input_excel_column_positions(self) -> dict[UniqueLabel, int]:
+        """用户上传的 Excel 每一列的唯一标签到其在 Sheet 中位置的映射, 不包含重新上传的导入结果列"""
+        positions: dict[UniqueLabel, int] = {}
+        output_headers = set(self.get_output_parent_excel_headers())
+        for position, header in enumerate(self.input_excel_headers):
+            if header.unique_label in self.import_result_label_to_field_meta:
+                continue
+            if header.unique_label not in output_headers:
                 raise ConfigError(f'不支持的列名: {header.unique_label}')
-            columns.append(header.unique_label)
+            positions[header.unique_label] = position
+        return positions
 
-        df.columns = columns  # type: ignore[assignment]
-        return df
+    @cached_property
+    def input_excel_columns(self) -> list[UniqueLabel]:
+        """用户上传的 Excel 每一列对应的唯一标签, 即 df 的列名"""
+        return list(self.input_excel_column_positions)
+
+    @cached_property
+    def imported_excel_columns(self) -> list[UniqueLabel]:
+        """需要导入的列, 忽略导入的列不会被解析"""
+        return [x for x in self.input_excel_columns if not self.unique_label_to_field_meta[x].ignore_import]
+
+    @cached_property
+    def input_excel_column_index(self) -> dict[UniqueLabel, ColumnIndex]:
+        """唯一标签到列索引的映射"""
+        return {column: ColumnIndex(index) for index, column in enumerate(self.input_excel_columns)}
 
     def _select_output_excel_keys(self, keys: list[Key] | None = None) -> list[UniqueKey]:
         """选择出需要导出的键"""
@@ -450,30 +676,42 @@ class ExcelAlchemy(
             ),
         )
 
-    def _read_dataframe(self, input_excel_name: str) -> pandas.DataFrame:
-        """读取 DataFrame"""
+    def _read_header(self, file_object: IO[bytes], delimiter: str | None = None) -> DataFrame:
+        """只读取前两行, 用于解析表头"""
         assert isinstance(self.config, ImporterConfig)  # only for type check
         if not self.__state_df_has_been_loaded__:
-            file_object = read_file_from_minio_object(
-                # pyright: reportUnknownMemberType=false
-                # pyright: reportUnknownArgumentType=false
-                self.config.minio,
-                self.config.bucket_name,
-                input_excel_name,
+            self.header_df = DataFrame(
+                probe_header(file_object, self.config.sheet_name, HEADER_HINT_LINE_COUNT, delimiter=delimiter)
             )
-
-            df: DataFrame = pandas.read_excel(
-                cast(PathLike[str], file_object),  # cast to cheat type check
-                sheet_name=self.config.sheet_name,
-                skiprows=HEADER_HINT_LINE_COUNT,  # 跳过表头提示行
-                header=None,  # 不使用表头, 由程序自行解析
-                dtype=str,  # 读取所有数据为字符串
-                engine='openpyxl',  # 使用 openpyxl 引擎, 避免 xlrd 引擎读取 xlsx 文件时报错
-            )
-            file_object.close()
-            self.df = df
-            self.header_df = df.head(2)  # 只读取前两行, 用于解析表头
             self.__state_df_has_been_loaded__ = True
+        return self.header_df
+
+    def _iter_row_data(self, reader: ABCExcelReader) -> Iterator[tuple[RowIndex, RawRow]]:
+        """逐行读取需要导入的列, 列的顺序与 imported_excel_columns 一致, 行索引与 df 位置对应"""
+        columns = self.imported_excel_columns
+        # 按原生类型读取时, 只有接收原生值的列保留原值, 其余列与默认读取方式一样转换为字符串
+        keep_typed = [reader.typed and self.unique_label_to_field_meta[x].value_type.typed_input for x in columns]
+        extra_header_count = self.extra_header_count_on_import
+        rows = itertools.islice(reader.iter_rows(), 1, None)  # 去掉表头
+        for row_index, row in enumerate(rows):
+            if row_index < extra_header_count:
+                continue  # 合并表头的第二行
+            if reader.typed:
+                row = [value if keep else stringify_cell_value(value) for value, keep in zip(row, keep_typed)]
+            yield RowIndex(row_index), row
+
+    def _read_dataframe(self, reader: ABCExcelReader, row_limit: int | None = None) -> DataFrame:
+        """读取完整的 DataFrame, 表头已经被设置为列名; 按原生类型读取时也转换为字符串, 保证导入结果与默认读取方式一致
+
+        指定 row_limit 时只读取表头之后的前 row_limit 行
+        """
+        rows = itertools.islice(reader.iter_rows(), 1, None if row_limit is None else row_limit + 1)
+        cell_rows: Iterable[list[Any]] = rows
+        if reader.typed:
+            cell_rows = ([stringify_cell_value(value) for value in row] for row in rows)
+        df = DataFrame(cell_rows, columns=range(len(self.input_excel_columns)))
+        self._set_columns(df)
+        self.df = df
         return self.df
 
     def _generate_export_df(
@@ -546,153 +784,71 @@ class ExcelAlchemy(
 
         return self
 
-    async def _dml_caller(self, row_index: RowIndex, data: dict[Key, Any]) -> bool:
-        """调用 DML"""
-        if not isinstance(self.config, ImporterConfig):
-            raise TypeError('只有 ExcelImporterConfig 才支持 DML')
-
-        is_success = False
-        match self.config.import_mode:
-            case ImportMode.CREATE:
-                is_success = await self._creator_caller(row_index, data)
-            case ImportMode.UPDATE:
-                is_success = await self._updater_caller(row_index, data)
-            case ImportMode.CREATE_OR_UPDATE:
-                is_success = await self._creator_or_updater_caller(row_index, data)
-
-        return is_success
-
-    async def _creator_caller(self, row_index: RowIndex, data: dict[Key, Any]) -> bool:
-        """调用创建函数, 返回是否创建成功"""
-        if not isinstance(self.config, ImporterConfig):
-            raise TypeError('只有 ExcelImporterConfig 才支持 DML')
-        if self.config.creator is None:
-            raise ConfigError('未配置 creator')
-        if self.config.create_importer_model is None:
-            raise ConfigError('未配置 create_importer_model')
-        return await self.__caller_impl__(
-            row_index,
-            data,
-            self.config.create_importer_model,
-            self.config.creator,
-            self.config.data_converter,
-            self.config.exec_formatter,
-        )
-
-    async def _updater_caller(self, row_index: RowIndex, data: dict[Key, Any]) -> bool:
-        """调用更新函数, 返回是否创建成功"""
-        if not isinstance(self.config, ImporterConfig):
-            raise TypeError(f'只有 {ImporterConfig.__name__} 才支持 DML')
-        if self.config.updater is None:
-            raise ConfigError('未配置 updater')
-        if self.config.update_importer_model is None:
-            raise ConfigError('未配置 update_importer_model')
-        return await self.__caller_impl__(
-            row_index,
-            data,
-            self.config.update_importer_model,
-            self.config.updater,
-            self.config.data_converter,
-            self.config.exec_formatter,
-        )
+    @property
+    def _single_pass_model(self) -> type[BaseModel] | None:
+        """开启 single_pass_upsert 时, 判断数据是否存在之前校验数据的模型, 即创建与更新共用的模型; 未开启时返回 None"""
+        assert isinstance(self.config, ImporterConfig)  # only for type check
+        if self.config.import_mode != ImportMode.CREATE_OR_UPDATE or not self.config.single_pass_upsert:
+            return None
+        return self.config.create_importer_model
 
-    async def __caller_impl__(
+    def _validate_row(
         self,
         row_index: RowIndex,
         data: dict[Key, Any],
         importer_model: type[BaseModel],
-        dml_func: Callable[[dict[str, Any], ContextT | None], Awaitable[Any]],
+    ) -> dict[str, Any] | list[ExcelCellError]:
+        """校验一行数据, 返回与 model.dict(exclude_unset=True) 相同的结果; 校验失败时注册并返回错误"""
+        validated_data = validate_row_data(data, importer_model)
+        if isinstance(validated_data, list):
+            self._register_row_error(row_index, validated_data)
+            self._register_cell_errors(row_index, validated_data)
+        return validated_data
+
+    async def _validate_chunk(
+        self,
+        chunk: Chunk,
+        importer_model: type[BaseModel],
         data_converter: Callable[[dict[str, Any]], dict[str, Any]] | None,
+        executor: Executor | None,
+    ) -> dict[RowIndex, dict[str, Any] | list[ExcelCellError]]:
+        """按模型校验并转换一块数据, 指定 executor 时在其中执行; 校验失败的行回到事件循环之后再注册错误"""
+        validated_rows = await run_in_executor(executor, validate_chunk, chunk, importer_model, data_converter)
+        for row_index, validated_data in validated_rows.items():
+            if isinstance(validated_data, list):
+                self._register_row_error(row_index, validated_data)
+                self._register_cell_errors(row_index, validated_data)
+        return validated_rows
+
+    def _discard_row_errors(self, row_indexes: Iterable[RowIndex]) -> None:
+        """丢弃整块预先校验时注册的错误, 用于提前停止之后不再处理的行, 这些行也不会出现在导入结果中"""
+        for row_index in row_indexes:
+            self.cell_errors.pop(row_index, None)
+            self.row_errors.pop(row_index, None)
+
+    def _register_dml_error(
+        self,
+        row_index: RowIndex,
+        error: Exception,
         exec_formatter: Callable[[Exception], str],
-    ) -> bool:
-        """调用 DML 函数"""
-        # 第一步： 实例化 pydantic 模型，可能产生错误
-        importer_instance_or_errors = instantiate_pydantic_model(data, importer_model)
-        if not isinstance(importer_instance_or_errors, importer_model):
-            errors: list[ExcelCellError] = importer_instance_or_errors  # type: ignore[assignment]
-            self._register_row_error(row_index, errors)
-            self._register_cell_errors(row_index, errors)
-            return False
-
-        # 第二步： 调用 creator/updater, 可能产生错误
-        importer_instance = importer_instance_or_errors
-        if data_converter is not None:
-            converted_data = data_converter(importer_instance.dict(exclude_unset=True))
-        else:
-            converted_data = importer_instance.dict(exclude_unset=True)
-        try:
-            await dml_func(converted_data, self.context)
-        except ExcelCellError as e:
-            self.row_errors[row_index].append(e)
-            return False
-        except Exception as e:
-            self.row_errors[row_index].append(ExcelRowError(exec_formatter(e)))
-            return False
-
-        return True
-
-    async def _creator_or_updater_caller(self, row_index: RowIndex, data: dict[Key, Any]) -> bool:
-        """调用 creator 或者 updater"""
-        if not isinstance(self.config, ImporterConfig):
-            raise TypeError(f'只有 {ImporterConfig.__name__} 才支持 DML')
-        is_data_exists_func = self.config.is_data_exist
-        if is_data_exists_func is None:
-            raise ConfigError('未配置 is_data_exists')
-
-        converted_data = self.config.data_converter(cast(dict[str, Any], data)) if self.config.data_converter else data
-        is_data_exist = await is_data_exists_func(cast(dict[str, Any], converted_data), self.context)
-        if is_data_exist:
-            return await self._updater_caller(row_index, data)
-        else:
-            return await self._creator_caller(row_index, data)
-
-    def _aggregate_data(self, row_data: dict[UniqueLabel, Any]) -> dict[Key, Any]:
-        """聚合数据
-
-        1、将复合类型的数据聚集到同一个 key 中
-        2、将 Label 转换为 Key
+        mark_cell: bool = False,
+    ) -> None:
+        """注册 DML 产生的错误, ExcelCellError 原样显示, 其他异常经过 exec_formatter 格式化
 
+        mark_cell 为 True 时 (批量写入), ExcelCellError 同时标记对应的单元格; 逐行写入与之前一样只记录在行上
         """
-        agg_data: dict[Key, Any] = self.__agg_data__(row_data)
-        serialized_agg_data: dict[Key, Any] = self.__serialize_agg_data__(agg_data)
-
-        return serialized_agg_data
-
-    def __agg_data__(self, row_data: dict[UniqueLabel, Any]) -> dict[Key, Any]:
-        agg_data: dict[Key, Any] = {}
-        for unique_label, value in row_data.items():
-            field_meta = self.unique_label_to_field_meta[unique_label]
-
-            if field_meta.key is None or field_meta.parent_key is None:
-                raise ConfigError(f' {type(field_meta).__name__} 未配置 key/parent_key')
-
-            if pandas.isna(value):
-                if self.config.import_mode in {  # type: ignore[union-attr]
-                    ImportMode.UPDATE,
-                    ImportMode.CREATE_OR_UPDATE,
-                }:
-                    value = None  # 如果是更新模式，且值为 NaN，表示将该值设置为 None
-                else:
-                    continue
-
-            if field_meta.parent_key == field_meta.key:
-                agg_data[field_meta.key] = value
-            else:
-                agg_data.setdefault(field_meta.parent_key, {})
-                agg_data[field_meta.parent_key][field_meta.key] = value
-        return agg_data
-
-    def __serialize_agg_data__(self, agg_data: dict[Key, Any]) -> dict[Key, Any]:
-        serialized_agg_data: dict[Key, Any] = {}
-        for parent_key, value in agg_data.items():
-            field_metas = self.parent_key_to_field_metas[parent_key]
-            validator = field_metas[0]
-            if value is None:
-                serialized_agg_data[parent_key] = None
-            else:
-                serialized_agg_data[parent_key] = validator.value_type.serialize(value, validator)
+        if isinstance(error, ExcelCellError):
+            self.row_errors[row_index].append(error)
+            if mark_cell and self._has_error_column(error):
+                self._register_cell_errors(row_index, [error])
+        else:
+            self.row_errors[row_index].append(ExcelRowError(exec_formatter(error)))
 
-        return serialized_agg_data
+    def _has_error_column(self, error: ExcelCellError) -> bool:
+        """ExcelCellError 对应的列是否在导入的文件中"""
+        return error.unique_label in self.input_excel_column_index or (
+            error.label == error.unique_label and error.label in self.parent_label_to_field_metas
+        )
 
     def _get_column_index(self, unique_label: UniqueLabel) -> Generator[ColumnIndex, None, None]:
         """获取列索引"""
@@ -707,11 +863,10 @@ class ExcelAlchemy(
             yield from self.__get_column_index_impl__(unique_label)
 
     def __get_column_index_impl__(self, unique_label: UniqueLabel) -> Generator[ColumnIndex, None, None]:
-        index = self.df.columns.get_loc(unique_label)
-        if isinstance(index, int):
-            yield ColumnIndex(index)
-        else:
+        index = self.input_excel_column_index.get(unique_label)
+        if index is None:
             raise ValueError(f'找不到 {unique_label} 对应的列, 推测是 value_type 定义不正确')
+        yield index
 
     def _register_row_error(
         self,
@@ -0,0 +1,191 @@
+"""按块读取与聚合导入数据, 以及在后台任务中预读数据块"""
+import asyncio
+import contextlib
+import itertools
+import pickle
+from collections import deque
+from concurrent.futures import Executor
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any
+from typing import AsyncGenerator
+from typing import Callable
+from typing import Iterator
+from typing import TypeVar
+
+from pydantic import BaseModel
+
+from excelalchemy.core.row_plan import RowPlan
+from excelalchemy.core.row_plan import aggregate_rows
+from excelalchemy.core.sheet_xml import RawRow
+from excelalchemy.exc import ExcelCellError
+from excelalchemy.helper.pydantic import validate_row_data
+from excelalchemy.types.identity import Key
+from excelalchemy.types.identity import RowIndex
+
+ROW_CHUNK_SIZE = 256  # 每次读取并聚合的行数
+
+ResultT = TypeVar('ResultT')
+ChunkT = TypeVar('ChunkT')
+
+# 一块聚合后的数据: (行索引, {parent_key: 序列化后的值})
+Chunk = list[tuple[RowIndex, dict[Key, Any]]]
+
+
+async def run_in_executor(executor: Executor | None, func: Callable[..., ResultT], *args: Any) -> ResultT:
+    """在 executor 中执行 CPU 密集的步骤, 未指定 executor 时直接调用"""
+    if executor is None:
+        return func(*args)
+    return await asyncio.get_running_loop().run_in_executor(executor, func, *args)
+
+
+def read_chunk(rows: Iterator[tuple[RowIndex, RawRow]]) -> list[tuple[RowIndex, RawRow]]:
+    """读取下一批数据, 读完时返回空列表"""
+    return list(itertools.islice(rows, ROW_CHUNK_SIZE))
+
+
+def aggregate_chunk(plan: RowPlan, rows: Iterator[tuple[RowIndex, RawRow]]) -> Chunk:
+    """读取并按列聚合、校验下一批数据, 读完时返回空列表"""
+    return aggregate_rows(plan, read_chunk(rows))
+
+
+def validate_chunk(
+    chunk: Chunk,
+    importer_model: type[BaseModel],
+    data_converter: Callable[[dict[str, Any]], dict[str, Any]] | None = None,
+) -> dict[RowIndex, dict[str, Any] | list[ExcelCellError]]:
+    """按模型校验一块聚合后的数据, 校验通过的行经过 data_converter 转换; 不注册错误, 可以在 executor 中执行"""
+    validated_rows: dict[RowIndex, dict[str, Any] | list[ExcelCellError]] = {}
+    for row_index, data in chunk:
+        validated_data = validate_row_data(data, importer_model)
+        if isinstance(validated_data, dict) and data_converter is not None:
+            validated_data = data_converter(validated_data)
+        validated_rows[row_index] = validated_data
+    return validated_rows
+
+
+# 校验进程中的行处理计划, 创建进程时由 init_worker 设置, 之后每块数据只发送行数据
+_WORKER_STATE: dict[str, RowPlan] = {}
+
+
+def init_worker(plan_state: bytes) -> None:
+    """校验进程的初始化函数, 行处理计划在每个进程中只反序列化一次"""
+    _WORKER_STATE['plan'] = pickle.loads(plan_state)
+
+
+def aggregate_in_worker(rows: list[tuple[RowIndex, RawRow]]) -> Chunk:
+    """在校验进程中按 init_worker 设置的行处理计划聚合一批数据"""
+    return aggregate_rows(_WORKER_STATE['plan'], rows)
+
+
+@contextlib.contextmanager
+def validation_pool(workers: int, plan: RowPlan) -> Iterator[ProcessPoolExecutor]:
+    """创建加载了 plan 的校验进程池, 计划在创建进程时发送一次, 之后每块数据只发送行数据, 计划中的单元格缓存不会被发送
+
+    进程池只在一次导入中使用, 退出时取消还没有开始的数据块, 并等待进程退出
+    """
+    pool = ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(pickle.dumps(plan),))
+    try:
+        yield pool
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+
+def aggregate_chunks(
+    executor: Executor | None,
+    plan: RowPlan,
+    rows: Iterator[tuple[RowIndex, RawRow]],
+    validation_workers: int | None = None,
+) -> AsyncGenerator[Chunk, None]:
+    """逐块聚合数据; 指定 validation_workers 时在进程池中聚合, 读取仍在 executor 中执行"""
+    if validation_workers:
+        return aggregate_in_processes(executor, validation_workers, plan, rows)
+    return aggregate_in_executor(executor, plan, rows)
+
+
+async def aggregate_in_executor(
+    executor: Executor | None,
+    plan: RowPlan,
+    rows: Iterator[tuple[RowIndex, RawRow]],
+) -> AsyncGenerator[Chunk, None]:
+    """逐块读取并聚合, 读取与聚合都在 executor 中执行"""
+    while chunk := await run_in_executor(executor, aggregate_chunk, plan, rows):
+        yield chunk
+
+
+async def aggregate_in_processes(
+    executor: Executor | None,
+    workers: int,
+    plan: RowPlan,
+    rows: Iterator[tuple[RowIndex, RawRow]],
+) -> AsyncGenerator[Chunk, None]:
+    """在当前进程中逐块读取 (指定 executor 时在其中读取), 在进程池中聚合与校验;
+    每个进程最多预读两块, 结果按读取的顺序返回; 进程池在生成器关闭时关闭
+    """
+    loop = asyncio.get_running_loop()
+    with validation_pool(workers, plan) as pool:
+        pending: deque[asyncio.Future[Chunk]] = deque()
+        while True:
+            batch = await run_in_executor(executor, read_chunk, rows)
+            if batch:
+                pending.append(loop.run_in_executor(pool, aggregate_in_worker, batch))
+                if len(pending) < workers * 2:
+                    continue
+            if not pending:
+                return
+            yield await pending.popleft()
+
+
+class PrefetchDone:
+    """预读队列中的结束标记, 表示后台任务已经读完所有数据块"""
+
+
+@dataclass
+class PrefetchError:
+    """预读队列中后台任务抛出的异常, 由调用方重新抛出"""
+
+    error: Exception
+
+
+async def prefetch(chunks: AsyncGenerator[ChunkT, None], depth: int) -> AsyncGenerator[ChunkT, None]:
+    """在后台任务中提前准备最多 depth 块数据, 调用方处理当前块时, 后续数据块的读取与校验同时进行; depth 为 0 时不预读
+
+    调用方提前停止迭代时, 等待后台任务完成正在准备的数据块之后再返回, 避免读取器被关闭时仍在其他线程中读取
+    """
+    if not depth:
+        async with contextlib.aclosing(chunks):
+            async for chunk in chunks:
+                yield chunk
+        return
+
+    queue: asyncio.Queue[ChunkT | PrefetchDone | PrefetchError] = asyncio.Queue(maxsize=depth)
+    stopped = False
+
+    async def produce() -> None:
+        try:
+            async with contextlib.aclosing(chunks):
+                async for chunk in chunks:
+                    await queue.put(chunk)
+                    if stopped:
+                        return
+        except Exception as e:
+            if not stopped:
+                await queue.put(PrefetchError(e))
+            return
+        if not stopped:
+            await queue.put(PrefetchDone())
+
+    producer = asyncio.create_task(produce())
+    try:
+        while True:
+            item = await queue.get()
+            if isinstance(item, PrefetchDone):
+                break
+            if isinstance(item, PrefetchError):
+                raise item.error
+            yield item
+    finally:
+        stopped = True
+        while not queue.empty():  # 腾出空间, 让后台任务完成正在放入的数据块
+            queue.get_nowait()
+        await producer
@@ -0,0 +1,105 @@
+"""一次导入同一个 Excel 中的多个 Sheet, 每个 Sheet 对应一个导入模型"""
+# pylint: disable=protected-access
+import asyncio
+import contextlib
+import io
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from typing import Generic
+
+from excelalchemy.const import ContextT
+from excelalchemy.core.abstract import ImportSource
+from excelalchemy.core.alchemy import ExcelAlchemy
+from excelalchemy.core.chunks import run_in_executor
+from excelalchemy.core.reader import get_csv_delimiter
+from excelalchemy.core.source import SharedFileView
+from excelalchemy.core.writer import render_multi_sheet_data_excel
+from excelalchemy.exc import ConfigError
+from excelalchemy.types.alchemy import ImporterConfig
+from excelalchemy.types.identity import UrlStr
+from excelalchemy.types.result import ImportResult
+from excelalchemy.types.result import MultiSheetImportResult
+from excelalchemy.types.result import ValidateResult
+
+
+class MultiSheetExcelAlchemy(Generic[ContextT]):
+    """多 Sheet 导入
+
+    每个 ImporterConfig 通过 sheet_name 对应一个 Sheet, 文件的读取与结果的上传使用第一个配置的 minio.
+    先校验所有 Sheet 的表头, 任一 Sheet 表头错误时不导入任何数据;
+    之后各个 Sheet 并发导入, 解析与序列化在第一个配置的 executor 中执行, 未配置时使用 max_workers 个线程的线程池,
+    DML 仍在事件循环中调用
+    """
+
+    def __init__(self, configs: list[ImporterConfig[ContextT, Any, Any]], max_workers: int | None = None):
+        if not configs:
+            raise ConfigError('至少需要配置一个 Sheet')
+        sheet_names = [config.sheet_name for config in configs]
+        if len(set(sheet_names)) != len(sheet_names):
+            raise ConfigError(f'Sheet 名称不能重复: {sheet_names}')
+
+        self.config = configs[0]
+        self.max_workers = max_workers or len(configs)  # 默认每个 Sheet 一个线程
+        self.alchemies: dict[str, ExcelAlchemy[ContextT, Any, Any, Any, Any, Any]] = {
+            config.sheet_name: ExcelAlchemy(config) for config in configs
+        }
+
+    def add_context(self, context: ContextT) -> None:
+        """为所有 Sheet 添加转换模型上下文"""
+        for alchemy in self.alchemies.values():
+            alchemy.add_context(context)
+
+    async def import_data(self, input_excel_name: ImportSource, output_excel_name: str) -> MultiSheetImportResult:
+        """导入数据, 数据校验失败时, 导入结果文件中只包含存在失败数据的 Sheet"""
+        source = self.alchemies[self.config.sheet_name]._import_source(input_excel_name)
+        if get_csv_delimiter(source.name) is not None:
+            raise ConfigError('CSV/TSV 文件只有一个 Sheet, 请使用 ExcelAlchemy 导入')
+
+        with source.open() as file_object:
+            # 各个 Sheet 并发读取, 每个 Sheet 使用独立的读取位置, 不需要把整个文件读入内存
+            lock = threading.Lock()
+            views = {sheet_name: io.BufferedReader(SharedFileView(file_object, lock)) for sheet_name in self.alchemies}
+            header_results = {
+                sheet_name: await run_in_executor(self.config.executor, alchemy._validate_header, views[sheet_name])
+                for sheet_name, alchemy in self.alchemies.items()
+            }
+            if not all(x.is_valid for x in header_results.values()):  # 只返回表头错误的 Sheet
+                return MultiSheetImportResult.from_sheet_results(
+                    {
+                        sheet_name: ImportResult.from_validate_header_result(x)
+                        for sheet_name, x in header_results.items()
+                        if not x.is_valid
+                    }
+                )
+
+            with contextlib.ExitStack() as stack:
+                executor = self.config.executor or stack.enter_context(ThreadPoolExecutor(max_workers=self.max_workers))
+                results = await asyncio.gather(
+                    *(
+                        alchemy._import_rows(views[sheet_name], executor=executor)
+                        for sheet_name, alchemy in self.alchemies.items()
+                    )
+                )
+        import_result = MultiSheetImportResult.from_sheet_results(dict(zip(self.alchemies, results)))
+
+        if import_result.result == ValidateResult.DATA_INVALID:
+            data_sheets = {
+                sheet_name: self.alchemies[sheet_name]._import_result_sheet()
+                for sheet_name, result in import_result.sheets.items()
+                if result.result == ValidateResult.DATA_INVALID
+            }
+            content_with_prefix = await run_in_executor(
+                self.config.executor, render_multi_sheet_data_excel, data_sheets
+            )
+            import_result.url = await run_in_executor(
+                self.config.executor, self._upload_file, output_excel_name, content_with_prefix
+            )
+        return import_result
+
+    def _upload_file(self, output_name: str, content_with_prefix: str) -> UrlStr:
+        """上传文件"""
+        return self.alchemies[self.config.sheet_name]._upload_file(output_name, content_with_prefix)
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}(sheets={list(self.alchemies)!r})'
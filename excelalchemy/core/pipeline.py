@@ -0,0 +1,412 @@
+"""导入数据时逐块调用 DML 的流水线, 负责错误预算、并发调用、批量写入与创建或更新模式"""
+# pylint: disable=protected-access
+import asyncio
+import contextlib
+import logging
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import AsyncGenerator
+from typing import Awaitable
+from typing import Callable
+from typing import Coroutine
+from typing import cast
+
+from pydantic import BaseModel
+
+from excelalchemy.const import ContextT
+from excelalchemy.core.chunks import Chunk
+from excelalchemy.exc import ConfigError
+from excelalchemy.exc import ExcelCellError
+from excelalchemy.exc import ExcelRowError
+from excelalchemy.exc import ProgrammaticError
+from excelalchemy.types.alchemy import ImporterConfig
+from excelalchemy.types.alchemy import ImportMode
+from excelalchemy.types.identity import Key
+from excelalchemy.types.identity import RowIndex
+
+if TYPE_CHECKING:
+    from excelalchemy.core.alchemy import ExcelAlchemy
+
+
+class ImportPipeline:
+    """一次导入中逐块校验数据并调用 DML, 统计成功与失败的行数
+
+    dry_run 为 True 时只校验, 不调用 DML; dml_concurrency 大于 1 时并发调用 DML, 错误仍记录在对应的行中;
+    配置了批量函数时按批写入; 失败数据超出错误预算时提前终止, 之后不再处理新的数据
+    """
+
+    def __init__(self, alchemy: 'ExcelAlchemy[Any, Any, Any, Any, Any, Any]', dry_run: bool = False):
+        assert isinstance(alchemy.config, ImporterConfig)  # only for type check
+        self.alchemy = alchemy
+        self.config: ImporterConfig[Any, Any, Any] = alchemy.config
+        self.dry_run = dry_run
+
+        self.success_count = 0
+        self.fail_count = 0
+        self.last_row_index: RowIndex | None = None  # 最后一个开始处理的行
+        self.is_aborted = False
+        self._ratio_checked = False  # 失败比例只判断一次
+
+        # 并发调用时进行中的 DML; 只校验时不调用 DML, 不需要并发
+        self.concurrency = 1 if dry_run else self.config.dml_concurrency
+        self.in_flight: set[asyncio.Task[list[bool]]] = set()
+        # 使用批量函数时, 每种模式等待写入的数据
+        self.bulk_batches: dict[ImportMode, list[tuple[RowIndex, dict[str, Any]]]] | None = None
+        if not dry_run and (self.config.bulk_creator or self.config.bulk_updater):
+            self.bulk_batches = {}
+        self._row_count = 0
+
+    async def run(self, chunks: AsyncGenerator[Chunk, None]) -> None:
+        """处理所有数据块, 写入剩余的批次并等待进行中的 DML 完成"""
+        try:
+            async with contextlib.aclosing(chunks):  # 提前终止时停止预读并关闭生成器, 释放进程池
+                async for chunk in chunks:
+                    await self._process_chunk(chunk)
+                    if self.is_aborted:
+                        logging.warning('失败数据超出错误预算, 导入在第 %s 行提前终止', cast(int, self.last_row_index) + 1)
+                        break
+            await self._flush()
+        finally:
+            for task in self.in_flight:  # 只有出现异常时才会剩余
+                task.cancel()
+
+    async def _process_chunk(self, chunk: Chunk) -> None:
+        validated_rows = await self._validate_chunk(chunk)
+        data_exist = {} if self.dry_run else await self._resolve_data_exist(chunk, validated_rows)
+        yield_interval = self.config.yield_interval_rows
+        for row_index, aggregate_data in chunk:
+            self.last_row_index, self._row_count = row_index, self._row_count + 1
+            validated_data = validated_rows.get(row_index)
+            if isinstance(validated_data, list):
+                outcomes = [False]  # 整块预先校验时失败, 错误已经注册
+            else:
+                outcomes = await self._process_row(row_index, aggregate_data, data_exist.get(row_index), validated_data)
+            self._tally(outcomes)
+            if self.is_aborted:
+                self.alchemy._discard_row_errors(x for x in validated_rows if x > row_index)
+                return
+            # 每处理 yield_interval_rows 行主动让出一次事件循环, 避免 DML 没有真正挂起时长时间阻塞其他协程
+            if yield_interval and self._row_count % yield_interval == 0:
+                await asyncio.sleep(0)
+
+    async def _process_row(
+        self,
+        row_index: RowIndex,
+        data: dict[Key, Any],
+        exists: bool | None,
+        validated_data: dict[str, Any] | None,
+    ) -> list[bool]:
+        """处理一行数据, 返回这一行与期间完成的其他 DML 中每行是否成功; validated_data 为整块预先校验并转换后的数据"""
+        if self.dry_run:
+            if validated_data is not None:
+                return [True]
+            importer_model = cast(type[BaseModel], self.alchemy._importer_model)
+            return [isinstance(self.alchemy._validate_row(row_index, data, importer_model), dict)]
+        if self.bulk_batches is not None:
+            return await self._add_to_bulk_batch(row_index, data, exists, validated_data)
+        return await self._dispatch_dml(self._dml_outcomes(row_index, data, exists, validated_data))
+
+    def _tally(self, outcomes: list[bool]) -> None:
+        for success in outcomes:
+            self.success_count, self.fail_count = self.success_count + success, self.fail_count + (not success)
+            self.is_aborted = self.is_aborted or self._exceeds_error_budget()
+
+    def _exceeds_error_budget(self) -> bool:
+        """失败数据是否超出配置的错误预算, 失败比例只在处理完前 failure_ratio_window 行时判断一次"""
+        if self.config.max_failed_rows is not None and self.fail_count > self.config.max_failed_rows:
+            return True
+        if self.config.max_failure_ratio is None or self._ratio_checked:
+            return False
+        processed_count = self.success_count + self.fail_count
+        if processed_count < self.config.failure_ratio_window:
+            return False
+        self._ratio_checked = True  # 一次统计多行结果时可能越过 failure_ratio_window, 只要达到就判断
+        return self.fail_count > processed_count * self.config.max_failure_ratio
+
+    async def _flush(self) -> None:
+        """写入剩余的批次并等待进行中的 DML 完成; 提前终止时不再写入剩余的批次, 这些行记为失败, 但不取消已经开始的写入"""
+        outcomes: list[bool] = []
+        for import_mode, batch in (self.bulk_batches or {}).items():
+            if self.is_aborted:
+                for row_index, _ in batch:
+                    self.alchemy.row_errors[row_index].append(ExcelRowError('失败数据超出错误预算, 导入提前终止, 该行没有写入'))
+                outcomes.extend([False] * len(batch))
+            else:
+                outcomes.extend(await self._dispatch_dml(self._bulk_dml_caller(import_mode, batch)))
+        outcomes.extend(await self._wait_for_dml(0))
+        for success in outcomes:
+            self.success_count, self.fail_count = self.success_count + success, self.fail_count + (not success)
+
+    async def _dispatch_dml(self, call: Coroutine[Any, Any, list[bool]]) -> list[bool]:
+        """concurrency 为 1 时直接调用; 否则等待进行中的 DML 少于 concurrency 个之后作为任务执行, 返回已经完成的 DML 的结果"""
+        if self.concurrency == 1:
+            return await call
+        outcomes = await self._wait_for_dml(self.concurrency - 1)
+        self.in_flight.add(asyncio.create_task(call))
+        return outcomes
+
+    async def _wait_for_dml(self, limit: int) -> list[bool]:
+        """等待进行中的 DML 不超过 limit 个, 返回已经完成的 DML 中每行是否成功; 只统计数量, 与完成的顺序无关"""
+        outcomes: list[bool] = []
+        while True:
+            done = {task for task in self.in_flight if task.done()}
+            self.in_flight -= done
+            for task in done:
+                outcomes.extend(task.result())
+            if len(self.in_flight) <= limit:
+                return outcomes
+            await asyncio.wait(self.in_flight, return_when=asyncio.FIRST_COMPLETED)
+
+    async def _dml_outcomes(
+        self,
+        row_index: RowIndex,
+        data: dict[Key, Any],
+        exists: bool | None = None,
+        validated_data: dict[str, Any] | None = None,
+    ) -> list[bool]:
+        """调用 DML, 结果与批量调用的格式一致"""
+        return [await self._dml_caller(row_index, data, exists, validated_data)]
+
+    async def _dml_caller(
+        self,
+        row_index: RowIndex,
+        data: dict[Key, Any],
+        exists: bool | None = None,
+        validated_data: dict[str, Any] | None = None,
+    ) -> bool:
+        """调用 DML, exists 为 CREATE_OR_UPDATE 模式下按块查询的数据是否已经存在, validated_data 为整块预先校验并转换后的数据"""
+        is_success = False
+        match self.config.import_mode:
+            case ImportMode.CREATE:
+                is_success = await self._creator_caller(row_index, data, validated_data)
+            case ImportMode.UPDATE:
+                is_success = await self._updater_caller(row_index, data, validated_data)
+            case ImportMode.CREATE_OR_UPDATE:
+                is_success = await self._creator_or_updater_caller(row_index, data, exists, validated_data)
+
+        return is_success
+
+    async def _validate_chunk(self, chunk: Chunk) -> dict[RowIndex, dict[str, Any] | list[ExcelCellError]]:
+        """整块预先校验并转换数据, 判断数据是否存在与调用 DML 时直接使用; 不需要预先校验时返回空字典
+
+        开启 single_pass_upsert 时按创建与更新共用的模型校验; 配置了 executor 时, 模型已经确定的导入 (只校验、创建或更新)
+        也整块校验, 模型校验与 data_converter 在 executor 中执行. 未开启 single_pass_upsert 的 CREATE_OR_UPDATE 模式
+        在判断数据是否存在之后才能确定模型, 仍在事件循环中逐行校验
+        """
+        importer_model = self._chunk_model()
+        if importer_model is None:
+            return {}
+        data_converter = None if self.dry_run else self.config.data_converter
+        return await self.alchemy._validate_chunk(chunk, importer_model, data_converter, self.config.executor)
+
+    def _chunk_model(self) -> type[BaseModel] | None:
+        """整块预先校验使用的模型, 不需要预先校验时返回 None"""
+        if not self.dry_run and self.alchemy._single_pass_model is not None:
+            return self.alchemy._single_pass_model
+        if self.config.executor is None:
+            return None
+        if self.dry_run:
+            return cast(type[BaseModel], self.alchemy._importer_model)
+        match self.config.import_mode:
+            case ImportMode.CREATE:
+                return self.config.create_importer_model
+            case ImportMode.UPDATE:
+                return self.config.update_importer_model
+        return None
+
+    async def _resolve_data_exist(
+        self,
+        chunk: Chunk,
+        validated_rows: dict[RowIndex, dict[str, Any] | list[ExcelCellError]],
+    ) -> dict[RowIndex, bool]:
+        """CREATE_OR_UPDATE 模式下配置了 are_data_exist 时, 一次查询一块数据是否已经存在; 否则返回空字典, 逐行调用 is_data_exist
+
+        开启 single_pass_upsert 时, 只查询校验通过的行, 使用校验并转换后的数据; 否则使用只经过 data_converter 转换的数据
+        """
+        are_data_exist = self.config.are_data_exist
+        if self.config.import_mode != ImportMode.CREATE_OR_UPDATE or are_data_exist is None:
+            return {}
+        rows: list[tuple[RowIndex, dict[str, Any]]]
+        if validated_rows:
+            rows = [(row_index, data) for row_index, data in validated_rows.items() if isinstance(data, dict)]
+        else:
+            rows = [(row_index, self._convert_raw_data(data)) for row_index, data in chunk]
+        if not rows:
+            return {}
+        results = list(await are_data_exist([data for _, data in rows], self.alchemy.context))
+        if len(results) != len(rows):
+            raise ProgrammaticError(f'are_data_exist 返回了 {len(results)} 个结果, 与传入的 {len(rows)} 行数据不一致')
+        return {row_index: bool(result) for (row_index, _), result in zip(rows, results)}
+
+    async def _is_data_exist(
+        self,
+        data: dict[Key, Any],
+        exists: bool | None = None,
+        validated_data: dict[str, Any] | None = None,
+    ) -> bool:
+        """判断数据是否已经存在, 已经按块查询过时直接使用查询结果; 已经校验并转换过时直接使用转换后的数据"""
+        if exists is not None:
+            return exists
+        if self.config.is_data_exist is None:
+            raise ConfigError('未配置 is_data_exists')
+        if validated_data is None:
+            validated_data = self._convert_raw_data(data)
+        return await self.config.is_data_exist(validated_data, self.alchemy.context)
+
+    def _convert_raw_data(self, data: dict[Key, Any]) -> dict[str, Any]:
+        """未经模型校验的数据只经过 data_converter 转换, 用于判断数据是否存在"""
+        raw_data = cast(dict[str, Any], data)  # Key 是 str 的子类, 不需要复制
+        return self.config.data_converter(raw_data) if self.config.data_converter else raw_data
+
+    async def _add_to_bulk_batch(
+        self,
+        row_index: RowIndex,
+        data: dict[Key, Any],
+        exists: bool | None = None,
+        validated_data: dict[str, Any] | None = None,
+    ) -> list[bool]:
+        """校验并转换一行数据后加入批次, 批次已满时调用批量函数; 返回校验失败的行与已经完成的批次中每行是否成功"""
+        assert self.bulk_batches is not None  # only for type check
+        prepared = await self._prepare_bulk_row(row_index, data, exists, validated_data)
+        if prepared is None:
+            return [False]
+        import_mode, converted_data = prepared
+        batch = self.bulk_batches.setdefault(import_mode, [])
+        batch.append((row_index, converted_data))
+        if len(batch) < self.config.bulk_batch_size:
+            return []
+        del self.bulk_batches[import_mode]
+        return await self._dispatch_dml(self._bulk_dml_caller(import_mode, batch))
+
+    async def _prepare_bulk_row(
+        self,
+        row_index: RowIndex,
+        data: dict[Key, Any],
+        exists: bool | None = None,
+        validated_data: dict[str, Any] | None = None,
+    ) -> tuple[ImportMode, dict[str, Any]] | None:
+        """确定一行数据使用创建还是更新, 返回转换后的数据; 校验失败时返回 None, 错误已经注册"""
+        data_converter = self.config.data_converter
+        import_mode = self.config.import_mode
+        if import_mode == ImportMode.CREATE_OR_UPDATE:
+            is_data_exist = await self._is_data_exist(data, exists, validated_data)
+            import_mode = ImportMode.UPDATE if is_data_exist else ImportMode.CREATE
+        if validated_data is not None:
+            return import_mode, validated_data  # 已经整块预先校验并转换
+
+        importer_model = (
+            self.config.create_importer_model if import_mode == ImportMode.CREATE else self.config.update_importer_model
+        )
+        validated_or_errors = self.alchemy._validate_row(row_index, data, cast(type[BaseModel], importer_model))
+        if not isinstance(validated_or_errors, dict):
+            return None
+        return import_mode, data_converter(validated_or_errors) if data_converter is not None else validated_or_errors
+
+    async def _bulk_dml_caller(
+        self,
+        import_mode: ImportMode,
+        rows: list[tuple[RowIndex, dict[str, Any]]],
+    ) -> list[bool]:
+        """调用批量创建/更新函数, 把每行的结果对应回行索引, 返回每行是否成功; 整批调用失败时所有行都记为失败"""
+        bulk_func = self.config.bulk_creator if import_mode == ImportMode.CREATE else self.config.bulk_updater
+        if bulk_func is None:
+            raise ConfigError(f'未配置 {import_mode} 模式的批量函数')
+        try:
+            results = list(await bulk_func(rows, self.alchemy.context))
+        except Exception as e:
+            results = [e] * len(rows)
+        if len(results) != len(rows):
+            raise ProgrammaticError(f'批量函数返回了 {len(results)} 个结果, 与传入的 {len(rows)} 行数据不一致')
+
+        outcomes: list[bool] = []
+        for (row_index, _), result in zip(rows, results):
+            if isinstance(result, Exception):
+                self.alchemy._register_dml_error(row_index, result, self.config.exec_formatter, mark_cell=True)
+            outcomes.append(not isinstance(result, Exception))
+        return outcomes
+
+    async def _creator_caller(
+        self,
+        row_index: RowIndex,
+        data: dict[Key, Any],
+        validated_data: dict[str, Any] | None = None,
+    ) -> bool:
+        """调用创建函数, 返回是否创建成功"""
+        if self.config.creator is None:
+            raise ConfigError('未配置 creator')
+        if self.config.create_importer_model is None:
+            raise ConfigError('未配置 create_importer_model')
+        return await self._caller_impl(
+            row_index, data, self.config.create_importer_model, self.config.creator, validated_data
+        )
+
+    async def _updater_caller(
+        self,
+        row_index: RowIndex,
+        data: dict[Key, Any],
+        validated_data: dict[str, Any] | None = None,
+    ) -> bool:
+        """调用更新函数, 返回是否创建成功"""
+        if self.config.updater is None:
+            raise ConfigError('未配置 updater')
+        if self.config.update_importer_model is None:
+            raise ConfigError('未配置 update_importer_model')
+        return await self._caller_impl(
+            row_index, data, self.config.update_importer_model, self.config.updater, validated_data
+        )
+
+    async def _caller_impl(
+        self,
+        row_index: RowIndex,
+        data: dict[Key, Any],
+        importer_model: type[BaseModel],
+        dml_func: Callable[[dict[str, Any], ContextT | None], Awaitable[Any]],
+        validated_data: dict[str, Any] | None = None,
+    ) -> bool:
+        """调用 DML 函数; 传入整块预先校验并转换后的 validated_data 时不再校验与转换"""
+        if validated_data is not None:
+            return await self._call_dml_func(row_index, validated_data, dml_func)
+
+        # 第一步： 实例化 pydantic 模型，可能产生错误; 所有单元格都已经按列校验通过时，不需要实例化模型
+        validated_or_errors = self.alchemy._validate_row(row_index, data, importer_model)
+        if not isinstance(validated_or_errors, dict):
+            return False
+
+        # 第二步： 调用 creator/updater, 可能产生错误
+        data_converter = self.config.data_converter
+        converted_data = data_converter(validated_or_errors) if data_converter is not None else validated_or_errors
+        return await self._call_dml_func(row_index, converted_data, dml_func)
+
+    async def _call_dml_func(
+        self,
+        row_index: RowIndex,
+        converted_data: dict[str, Any],
+        dml_func: Callable[[dict[str, Any], ContextT | None], Awaitable[Any]],
+    ) -> bool:
+        """以校验并转换后的数据调用 DML 函数, 返回是否成功"""
+        try:
+            await dml_func(converted_data, self.alchemy.context)
+        except Exception as e:
+            self.alchemy._register_dml_error(row_index, e, self.config.exec_formatter)
+            return False
+
+        return True
+
+    async def _creator_or_updater_caller(
+        self,
+        row_index: RowIndex,
+        data: dict[Key, Any],
+        exists: bool | None = None,
+        validated_data: dict[str, Any] | None = None,
+    ) -> bool:
+        """调用 creator 或者 updater; 传入 validated_data 时不再校验与转换, 判断数据是否存在与调用 DML 使用同一份数据"""
+        is_data_exist = await self._is_data_exist(data, exists, validated_data)
+        if validated_data is not None:
+            dml_func = self.config.updater if is_data_exist else self.config.creator
+            if dml_func is None:
+                raise ConfigError(f'未配置 {"updater" if is_data_exist else "creator"}')
+            return await self._call_dml_func(row_index, validated_data, dml_func)
+        if is_data_exist:
+            return await self._updater_caller(row_index, data)
+        else:
+            return await self._creator_caller(row_index, data)
@@ -0,0 +1,288 @@
+"""负责以流式的方式读取用户上传的 Excel 文件"""
+import codecs
+import csv
+import io
+import itertools
+import posixpath
+from typing import IO
+from typing import Any
+from typing import Iterator
+
+from openpyxl import load_workbook
+from openpyxl.cell.cell import TYPE_ERROR
+from openpyxl.cell.cell import TYPE_NUMERIC
+from openpyxl.workbook import Workbook
+from openpyxl.worksheet.worksheet import Worksheet
+
+from excelalchemy.core.abstract import HEADER_PROBE_ROW_COUNT
+from excelalchemy.core.abstract import ABCExcelReader
+from excelalchemy.core.abstract import fit_header
+from excelalchemy.core.sheet_xml import RawRow
+from excelalchemy.core.sheet_xml import SheetXml
+from excelalchemy.core.sheet_xml import normalize_na
+from excelalchemy.core.sheet_xml import stringify_cell_value
+from excelalchemy.exc import ConfigError
+from excelalchemy.types.alchemy import ReaderEngine
+
+# 按文件后缀识别 CSV/TSV 文件
+CSV_DELIMITERS = {'.csv': ',', '.tsv': '\t'}
+
+# 检测 CSV 编码时读取的字节数
+ENCODING_DETECT_SAMPLE_SIZE = 64 * 1024
+
+# 不能按 UTF-8 解码的 CSV 文件使用的编码, 兼容 GBK
+FALLBACK_ENCODING = 'gb18030'
+
+
+def convert_cell(cell: Any, typed: bool = False) -> Any:
+    """把 openpyxl 的单元格转换为字符串, 空值返回 None; typed 为 True 时返回原生值
+
+    转换规则与 pandas.read_excel(dtype=str, engine='openpyxl') 保持一致
+    """
+    value = cell.value
+    if value is None or cell.data_type == TYPE_ERROR:
+        return None
+
+    if cell.data_type == TYPE_NUMERIC:
+        int_value = int(value)
+        value = int_value if int_value == value else float(value)
+
+    if typed and not isinstance(value, str):
+        return value
+    return stringify_cell_value(value)
+
+
+def get_csv_delimiter(file_name: str) -> str | None:
+    """根据文件后缀判断是否为 CSV/TSV 文件, 返回分隔符, 不是则返回 None"""
+    return CSV_DELIMITERS.get(posixpath.splitext(file_name)[1].lower())
+
+
+def detect_encoding(file: IO[bytes]) -> str:
+    """检测 CSV 文件的编码
+
+    优先根据 BOM 判断; 没有 BOM 时, 如果文件开头可以按 UTF-8 解码则视为 UTF-8, 否则视为 GB18030 (兼容 GBK)
+    """
+    file.seek(0)
+    sample = file.read(ENCODING_DETECT_SAMPLE_SIZE)
+    file.seek(0)
+
+    if sample.startswith(codecs.BOM_UTF8):
+        return 'utf-8-sig'
+    if sample.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return 'utf-16'
+    try:
+        # 采样可能截断多字节字符, 只有读完整个文件时才要求解码完整
+        codecs.getincrementaldecoder('utf-8')().decode(sample, final=len(sample) < ENCODING_DETECT_SAMPLE_SIZE)
+    except UnicodeDecodeError:
+        return FALLBACK_ENCODING
+    return 'utf-8'
+
+
+def probe_header(
+    file: IO[bytes],
+    sheet_name: str,
+    skip_rows: int = 0,
+    row_count: int = HEADER_PROBE_ROW_COUNT,
+    delimiter: str | None = None,
+) -> list[RawRow]:
+    """只读取表头所在的行
+
+    直接解析 Sheet 的 XML, 读到表头就停止, 不加载完整的 sharedStrings 与样式表,
+    用于在解析数据之前尽早拒绝模版不正确的文件; 指定 delimiter 时按 CSV/TSV 读取
+    """
+    if delimiter is not None:
+        with CsvReader(file, sheet_name, skip_rows, delimiter=delimiter) as reader:
+            return reader.read_header(row_count)
+
+    with SheetXml(file, sheet_name) as sheet:
+        rows = list(itertools.islice(sheet.iter_rows(skip_rows), row_count))
+    return fit_header(rows)[0]
+
+
+class OpenpyxlReader(ABCExcelReader):
+    """基于 openpyxl 只读模式的流式读取器, 内存占用与文件大小无关"""
+
+    def __init__(
+        self,
+        file: IO[bytes],
+        sheet_name: str,
+        skip_rows: int = 0,
+        *,
+        column_count: int | None = None,
+        max_empty_rows: int | None = None,
+        typed: bool = False,
+        columns: list[int] | None = None,
+    ):
+        super().__init__(
+            file,
+            sheet_name,
+            skip_rows,
+            column_count=column_count,
+            max_empty_rows=max_empty_rows,
+            typed=typed,
+            columns=columns,
+        )
+        self._workbook: Workbook = load_workbook(self.file, read_only=True, data_only=True)
+        if self.sheet_name not in self._workbook.sheetnames:
+            self.close()
+            raise ConfigError(f'Excel 中不存在名为 {self.sheet_name} 的 Sheet')
+        self._worksheet: Worksheet = self._workbook[self.sheet_name]
+        self._worksheet.reset_dimensions()  # 不信任文件中声明的维度, 避免按维度补齐大量空单元格
+
+    def close(self) -> None:
+        self._workbook.close()
+
+    def _iter_raw_rows(self) -> Iterator[RawRow]:
+        column_set = self.column_set
+        max_col = max(column_set, default=-1) + 1 if column_set is not None else self.column_count
+        rows = self._worksheet.iter_rows(min_row=self.skip_rows + 1, max_col=max_col)
+        for cells in rows:
+            yield [
+                convert_cell(cell, self.typed) if column_set is None or index in column_set else None
+                for index, cell in enumerate(cells)
+            ]
+
+
+class XmlReader(ABCExcelReader):
+    """直接以 iterparse 解析 Sheet 的 XML 与 sharedStrings.xml, 不构造 openpyxl 的单元格对象
+
+    对于列数较多的 Sheet, 比 openpyxl 快数倍
+    """
+
+    def __init__(
+        self,
+        file: IO[bytes],
+        sheet_name: str,
+        skip_rows: int = 0,
+        *,
+        column_count: int | None = None,
+        max_empty_rows: int | None = None,
+        typed: bool = False,
+        columns: list[int] | None = None,
+    ):
+        super().__init__(
+            file,
+            sheet_name,
+            skip_rows,
+            column_count=column_count,
+            max_empty_rows=max_empty_rows,
+            typed=typed,
+            columns=columns,
+        )
+        self._sheet = SheetXml(self.file, self.sheet_name, parse_dates=True, typed=self.typed, columns=self.column_set)
+
+    def close(self) -> None:
+        self._sheet.close()
+
+    def _iter_raw_rows(self) -> Iterator[RawRow]:
+        return self._sheet.iter_rows(self.skip_rows)
+
+
+class CsvReader(ABCExcelReader):
+    """以 csv 模块流式读取 CSV/TSV 文件, 跳过 xlsx 的压缩与 XML 解析
+
+    空字符串与 pandas 默认的缺失值字符串视为空, 与 pandas.read_csv(dtype=str) 保持一致;
+    CSV 没有单元格类型, typed 与 sheet_name 不生效; 编码只根据文件开头检测, 开头只有 ASCII 字符、
+    之后才出现 GB18030 字符的文件会在读到时切换为 GB18030, 从中断的行继续读取
+    """
+
+    def __init__(
+        self,
+        file: IO[bytes],
+        sheet_name: str,
+        skip_rows: int = 0,
+        *,
+        column_count: int | None = None,
+        max_empty_rows: int | None = None,
+        typed: bool = False,
+        columns: list[int] | None = None,
+        delimiter: str = ',',
+    ):
+        super().__init__(
+            file,
+            sheet_name,
+            skip_rows,
+            column_count=column_count,
+            max_empty_rows=max_empty_rows,
+            typed=typed,
+            columns=columns,
+        )
+        self.delimiter = delimiter
+        self.encoding = detect_encoding(self.file)
+
+    def close(self) -> None:
+        pass
+
+    def _iter_raw_rows(self) -> Iterator[RawRow]:
+        column_set = self.column_set
+        for row in itertools.islice(self._iter_csv_rows(), self.skip_rows, None):
+            yield [
+                normalize_na(value) if value and (column_set is None or index in column_set) else None
+                for index, value in enumerate(row)
+            ]
+
+    def _iter_csv_rows(self) -> Iterator[list[str]]:
+        """逐行返回 CSV 的原始字符串, 包括需要跳过的行"""
+        row_count = 0
+        ascii_only = True  # 已经读取的行只有 ASCII 字符时, 按 GB18030 重新读取的结果相同
+        try:
+            for row in self._read_csv(self.encoding):
+                ascii_only = ascii_only and all(map(str.isascii, row))
+                row_count += 1
+                yield row
+        except UnicodeDecodeError as exc:
+            if self.encoding != 'utf-8' or not ascii_only:
+                raise ConfigError(f'CSV 文件无法按 {self.encoding} 编码读取, 请转换为 UTF-8 编码后重新上传') from exc
+            self.encoding = FALLBACK_ENCODING
+            yield from itertools.islice(self._read_csv(self.encoding), row_count, None)
+
+    def _read_csv(self, encoding: str) -> Iterator[list[str]]:
+        self.file.seek(0)
+        text = io.TextIOWrapper(self.file, encoding=encoding, newline='')  # type: ignore[arg-type]
+        try:
+            yield from csv.reader(text, delimiter=self.delimiter)
+        finally:
+            text.detach()  # 避免关闭 TextIOWrapper 时关闭用户上传的文件
+
+
+READER_ENGINES: dict[ReaderEngine, type[ABCExcelReader]] = {
+    ReaderEngine.OPENPYXL: OpenpyxlReader,
+    ReaderEngine.XML: XmlReader,
+}
+
+
+def create_reader(
+    engine: ReaderEngine,
+    file: IO[bytes],
+    sheet_name: str,
+    skip_rows: int = 0,
+    *,
+    column_count: int | None = None,
+    max_empty_rows: int | None = None,
+    typed: bool = False,
+    delimiter: str | None = None,
+    columns: list[int] | None = None,
+) -> ABCExcelReader:
+    """根据配置创建读取器, 指定 delimiter 时按 CSV/TSV 读取, 与 engine 无关; 指定 columns 时只解析这些列"""
+    if delimiter is not None:
+        return CsvReader(
+            file,
+            sheet_name,
+            skip_rows,
+            column_count=column_count,
+            max_empty_rows=max_empty_rows,
+            typed=typed,
+            columns=columns,
+            delimiter=delimiter,
+        )
+    if engine not in READER_ENGINES:
+        raise ConfigError(f'不支持的读取引擎 {engine}')
+    return READER_ENGINES[engine](
+        file,
+        sheet_name,
+        skip_rows,
+        column_count=column_count,
+        max_empty_rows=max_empty_rows,
+        typed=typed,
+        columns=columns,
+    )
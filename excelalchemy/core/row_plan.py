@@ -0,0 +1,256 @@
+"""导入时的行处理计划, 每次导入只根据表头编译一次, 之后按位置聚合、序列化与校验, 不再按标签查找字段元数据"""
+import math
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import partial
+from typing import Any
+from typing import Callable
+from typing import Collection
+from typing import Hashable
+from typing import Sequence
+
+from excelalchemy.core.sheet_xml import RawRow
+from excelalchemy.exc import ConfigError
+from excelalchemy.types.abstract import ABCValueType
+from excelalchemy.types.abstract import ValidatedCell
+from excelalchemy.types.field import FieldMetaInfo
+from excelalchemy.types.identity import Key
+from excelalchemy.types.identity import RowIndex
+
+
+def is_missing(value: Any) -> bool:
+    """单元格是否为空, 与 pandas.isna 对单元格值的判断保持一致"""
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+
+class CellCache:
+    """按原始单元格值缓存一列的处理结果, 超出容量时淘汰最久未使用的值
+
+    只在一次导入中使用, 重复的值只序列化与校验一次; 缓存按列校验的 ValidatedCell 时, 校验异常也一并缓存.
+    发送到校验进程时只保留容量, 每个进程从空缓存开始
+    """
+
+    # get 未命中时的返回值, 处理结果本身可能为 None
+    MISSING: Any = object()
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Hashable, Any] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __getstate__(self) -> dict[str, Any]:
+        return {'max_size': self.max_size}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.max_size = state['max_size']
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def get(self, key: Hashable) -> Any:
+        entry = self._entries.get(key, self.MISSING)
+        if entry is self.MISSING:
+            self.misses += 1
+            return entry
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key: Hashable, entry: Any) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+
+def cell_cache_key(value: Any) -> Hashable:
+    """缓存的键带上类型, 避免按原生类型读取时 1、1.0 与 True 被视为同一个值"""
+    return value.__class__, value
+
+
+def detach(cell: Any) -> Any:
+    """缓存的结果被多行共享, 可变的值复制一份, 避免一行的修改影响其他行"""
+    if isinstance(cell, ValidatedCell):
+        return ValidatedCell(detach(cell.value), cell.error)
+    if isinstance(cell, (list, dict, set)):
+        return cell.copy()
+    return cell
+
+
+@dataclass
+class ColumnSlot:
+    """一列的处理方式"""
+
+    position: int  # 在行中的位置
+    key: Key
+    parent_key: Key
+    value_type: type[ABCValueType]
+    field_meta: FieldMetaInfo  # 序列化与校验使用的字段元数据, 复合字段为父字段的元数据
+    serialize: Callable[[Any], Any]  # 绑定了 field_meta 的 value_type.serialize
+    validate: bool = False  # 是否在实例化模型之前按列校验
+    cache: CellCache | None = None  # 按原始值缓存处理结果, 复合字段不缓存
+
+    @property
+    def is_complex(self) -> bool:
+        return self.key != self.parent_key
+
+
+class RowPlan:
+    """把一批行聚合为 {parent_key: 序列化后的值}
+
+    同一个 parent_key 的列聚合到同一个 dict 中, 按父字段序列化; 空单元格在 keep_missing 为 True 时
+    (更新模式) 以 None 表示将该值设置为空, 否则不出现在结果中.
+    简单字段按列调用 serialize_many; validate 为 True 的列再按列调用 validate_many,
+    结果以 ValidatedCell 返回, 实例化模型时直接取值或抛出记录的异常, 错误仍按原来的方式对应到单元格.
+    设置 cache_size 时, 简单字段按原始值缓存处理结果, 重复的值只处理一次
+    """
+
+    def __init__(self, slots: list[ColumnSlot], keep_missing: bool):
+        self.slots = slots
+        self.keep_missing = keep_missing
+        # 按 parent_key 首次出现的顺序分组, 简单字段为 (parent_key, slot, None), 复合字段带上子字段的位置与 key
+        groups: dict[Key, list[ColumnSlot]] = {}
+        for slot in slots:
+            groups.setdefault(slot.parent_key, []).append(slot)
+        self.groups: list[tuple[Key, ColumnSlot, list[tuple[int, Key]] | None]] = [
+            (parent_key, group[0], [(x.position, x.key) for x in group] if group[0].is_complex else None)
+            for parent_key, group in groups.items()
+        ]
+
+    @classmethod
+    def compile(
+        cls,
+        field_metas: list[FieldMetaInfo],
+        parent_key_to_field_metas: dict[Key, list[FieldMetaInfo]],
+        keep_missing: bool,
+        validated_keys: Collection[Key] = (),
+        cache_size: int = 0,
+    ) -> 'RowPlan':
+        """field_metas 与行中的列一一对应, validated_keys 为可以按列校验的字段, cache_size 为每列缓存的值的数量"""
+        slots = []
+        for position, field_meta in enumerate(field_metas):
+            if field_meta.key is None or field_meta.parent_key is None:
+                raise ConfigError(f' {type(field_meta).__name__} 未配置 key/parent_key')
+            validator = parent_key_to_field_metas[field_meta.parent_key][0]
+            slots.append(
+                ColumnSlot(
+                    position=position,
+                    key=field_meta.key,
+                    parent_key=field_meta.parent_key,
+                    value_type=validator.value_type,
+                    field_meta=validator,
+                    serialize=partial(validator.value_type.serialize, field_meta=validator),
+                    validate=field_meta.parent_key in validated_keys and field_meta.key == field_meta.parent_key,
+                    cache=CellCache(cache_size) if cache_size and field_meta.key == field_meta.parent_key else None,
+                )
+            )
+        return cls(slots, keep_missing)
+
+    def cache_stats(self) -> dict[Key, tuple[int, int]]:
+        """每列缓存的 (命中次数, 未命中次数), 在进程池中处理时统计留在子进程中"""
+        return {slot.key: (slot.cache.hits, slot.cache.misses) for slot in self.slots if slot.cache is not None}
+
+    def aggregate(self, row: RawRow) -> dict[Key, Any]:
+        """聚合并序列化一行数据"""
+        return self.aggregate_many([row])[0]
+
+    def aggregate_many(self, rows: Sequence[RawRow]) -> list[dict[Key, Any]]:
+        """按列聚合、序列化并校验一批数据"""
+        records: list[dict[Key, Any]] = [{} for _ in rows]
+        for parent_key, slot, children in self.groups:
+            if children is None:
+                self._aggregate_column(records, rows, parent_key, slot)
+            else:
+                self._aggregate_complex(records, rows, parent_key, slot, children)
+        return records
+
+    def _aggregate_column(
+        self,
+        records: list[dict[Key, Any]],
+        rows: Sequence[RawRow],
+        parent_key: Key,
+        slot: ColumnSlot,
+    ) -> None:
+        indexes: list[int] = []
+        values: list[Any] = []
+        for index, row in enumerate(rows):
+            value = row[slot.position]
+            if is_missing(value):
+                if self.keep_missing:
+                    records[index][parent_key] = None
+                continue
+            indexes.append(index)
+            values.append(value)
+        if not values:
+            return
+
+        if slot.cache is not None:
+            serialized = self._process_cached(slot, slot.cache, values)
+        else:
+            serialized = slot.value_type.serialize_many(values, slot.field_meta)
+            if slot.validate:
+                serialized = self._validate_column(slot, serialized)
+        for index, value in zip(indexes, serialized):
+            records[index][parent_key] = value
+
+    def _process_cached(self, slot: ColumnSlot, cache: CellCache, values: list[Any]) -> list[Any]:
+        """只处理缓存中没有的值, 同一批中重复的值也只处理一次"""
+        keys = [cell_cache_key(value) for value in values]
+        resolved: dict[Hashable, Any] = {}
+        missed: dict[Hashable, Any] = {}
+        for key, value in zip(keys, values):
+            if key in resolved or key in missed:
+                cache.hits += 1
+            elif (cell := cache.get(key)) is not CellCache.MISSING:
+                resolved[key] = cell
+            else:
+                missed[key] = value
+
+        if missed:
+            cells = slot.value_type.serialize_many(list(missed.values()), slot.field_meta)
+            if slot.validate:
+                cells = self._validate_column(slot, cells)
+            for key, cell in zip(missed, cells):
+                resolved[key] = cell
+                cache.put(key, cell)
+        return [detach(resolved[key]) for key in keys]
+
+    @staticmethod
+    def _validate_column(slot: ColumnSlot, values: list[Any]) -> list[Any]:
+        """按列校验, 序列化结果为 None 的单元格交给 pydantic 处理必填"""
+        positions = [index for index, value in enumerate(values) if value is not None]
+        validated, errors = slot.value_type.validate_many([values[x] for x in positions], slot.field_meta)
+        for index, (position, value) in enumerate(zip(positions, validated)):
+            values[position] = ValidatedCell(value, errors.get(index))
+        return values
+
+    def _aggregate_complex(
+        self,
+        records: list[dict[Key, Any]],
+        rows: Sequence[RawRow],
+        parent_key: Key,
+        slot: ColumnSlot,
+        children: list[tuple[int, Key]],
+    ) -> None:
+        keep_missing = self.keep_missing
+        for record, row in zip(records, rows):
+            values: dict[Key, Any] = {}
+            for position, key in children:
+                value = row[position]
+                if is_missing(value):
+                    if not keep_missing:
+                        continue
+                    value = None
+                values[key] = value
+            if values:
+                record[parent_key] = slot.serialize(values)
+
+
+def aggregate_rows(plan: RowPlan, rows: Sequence[tuple[RowIndex, RawRow]]) -> list[tuple[RowIndex, dict[Key, Any]]]:
+    """聚合一批带行索引的数据, 定义在模块中以便在进程池中调用"""
+    records = plan.aggregate_many([row for _, row in rows])
+    return [(row_index, record) for (row_index, _), record in zip(rows, records)]
@@ -0,0 +1,314 @@
+"""直接解析 xlsx 压缩包中 Sheet 的 XML, 不构造 openpyxl 的 Workbook"""
+import contextlib
+import posixpath
+import zipfile
+from functools import lru_cache
+from typing import IO
+from typing import Any
+from typing import Callable
+from typing import Collection
+from typing import Iterator
+from xml.etree.ElementTree import Element
+from xml.etree.ElementTree import iterparse
+from xml.etree.ElementTree import parse
+
+from openpyxl.styles.numbers import builtin_format_code
+from openpyxl.styles.numbers import is_date_format
+from openpyxl.styles.numbers import is_timedelta_format
+from openpyxl.utils.cell import column_index_from_string
+from openpyxl.utils.datetime import CALENDAR_MAC_1904
+from openpyxl.utils.datetime import CALENDAR_WINDOWS_1900
+from openpyxl.utils.datetime import from_excel
+from openpyxl.utils.datetime import from_ISO8601
+
+from excelalchemy.exc import ConfigError
+
+# 一行单元格的值, 默认为 str | None; 按原生类型读取时还可能是 int, float, bool, datetime 等
+RawRow = list[Any]
+
+ROOT_RELS_PATH = '_rels/.rels'
+DEFAULT_WORKBOOK_PATH = 'xl/workbook.xml'
+
+OFFICE_DOCUMENT_REL_TYPE = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument'
+SHARED_STRINGS_REL_TYPE = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/sharedStrings'
+STYLES_REL_TYPE = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles'
+RELATIONSHIP_ID_ATTR = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id'
+
+# 缺失值字符串, 与 pandas.read_excel 的默认值保持一致
+NA_VALUES = frozenset(
+    {
+        '',
+        '#N/A',
+        '#N/A N/A',
+        '#NA',
+        '-1.#IND',
+        '-1.#QNAN',
+        '-NaN',
+        '-nan',
+        '1.#IND',
+        '1.#QNAN',
+        '<NA>',
+        'N/A',
+        'NA',
+        'NULL',
+        'NaN',
+        'None',
+        'n/a',
+        'nan',
+        'null',
+    }
+)
+
+
+def local_name(tag: str) -> str:
+    """去掉 XML 标签的命名空间, 同时兼容 Transitional 与 Strict 两种格式"""
+    return tag.rsplit('}', 1)[-1]
+
+
+def _text_of(element: Element) -> str:
+    """读取 <si>、<is> 中的文本, 忽略注音 <rPh>"""
+    parts: list[str] = []
+    for child in element:
+        match local_name(child.tag):
+            case 't':
+                parts.append(child.text or '')
+            case 'r':
+                parts.extend(t.text or '' for t in child if local_name(t.tag) == 't')
+    return ''.join(parts)
+
+
+def _cast_number(value: str) -> int | float:
+    """与 openpyxl 保持一致, 整数值不带小数位"""
+    if '.' in value or 'E' in value or 'e' in value:
+        parsed = float(value)
+        return int(parsed) if parsed.is_integer() else parsed
+    return int(value)
+
+
+@lru_cache(maxsize=None)
+def _column_index(coordinate: str) -> int:
+    """单元格坐标转换为从 0 开始的列索引, 例如 C12 -> 2"""
+    return column_index_from_string(coordinate.rstrip('0123456789')) - 1
+
+
+def normalize_na(value: str) -> str | None:
+    """与 pandas.read_excel 保持一致, 默认的缺失值字符串视为空"""
+    return None if value in NA_VALUES else value
+
+
+# 不依赖共享字符串与样式的单元格类型 (t 属性) 的转换函数, 未列出的类型 (str 等) 按字符串处理
+CELL_VALUE_PARSERS: dict[str, Callable[[str], Any]] = {
+    'b': lambda value: value == '1',
+    'd': from_ISO8601,
+    'e': lambda _value: None,  # 错误值, 例如 #DIV/0!
+}
+
+
+def stringify_cell_value(value: Any) -> str | None:
+    """把单元格的原生值转换为字符串, 与 pandas.read_excel(dtype=str) 保持一致"""
+    if value is None:
+        return None
+    return normalize_na(value if isinstance(value, str) else str(value))
+
+
+class SharedStrings:
+    """按需解析 sharedStrings.xml, 只读取到需要的索引为止"""
+
+    def __init__(self, archive: zipfile.ZipFile, path: str | None):
+        self._values: list[str] = []
+        self._iterator: Iterator[str] | None = self._iter_values(archive, path) if path else None
+
+    def __getitem__(self, index: int) -> str:
+        while index >= len(self._values) and self._iterator is not None:
+            try:
+                self._values.append(next(self._iterator))
+            except StopIteration:
+                self._iterator = None
+        return self._values[index]
+
+    @staticmethod
+    def _iter_values(archive: zipfile.ZipFile, path: str) -> Iterator[str]:
+        with archive.open(path) as stream:
+            for _, element in iterparse(stream):
+                if local_name(element.tag) == 'si':
+                    yield _text_of(element)
+                    element.clear()
+
+
+class DateStyles:
+    """解析 styles.xml, 记录哪些单元格样式是日期格式, 与 openpyxl 的判断规则保持一致"""
+
+    def __init__(self, archive: zipfile.ZipFile, path: str | None):
+        self.date_styles: set[int] = set()
+        self.timedelta_styles: set[int] = set()
+        if path:
+            self._parse(archive, path)
+
+    def _parse(self, archive: zipfile.ZipFile, path: str) -> None:
+        with archive.open(path) as stream:
+            root = parse(stream).getroot()
+
+        custom_formats: dict[int, str] = {}
+        cell_formats: list[int] = []
+        for element in root:
+            match local_name(element.tag):
+                case 'numFmts':
+                    for num_fmt in element:
+                        custom_formats[int(num_fmt.get('numFmtId', 0))] = num_fmt.get('formatCode', '')
+                case 'cellXfs':
+                    cell_formats.extend(int(xf.get('numFmtId', 0)) for xf in element)
+
+        for style_id, num_fmt_id in enumerate(cell_formats):
+            fmt = custom_formats.get(num_fmt_id) or builtin_format_code(num_fmt_id)
+            if fmt and is_date_format(fmt):
+                self.date_styles.add(style_id)
+            if fmt and is_timedelta_format(fmt):
+                self.timedelta_styles.add(style_id)
+
+
+class SheetXml:
+    """读取 xlsx 中指定 Sheet 的 XML, 逐行返回单元格的字符串值, 空单元格为 None
+
+    parse_dates 为 True 时会额外读取样式表, 把日期格式的数值转换为日期, 与 openpyxl 保持一致;
+    typed 为 True 时返回单元格的原生值, 不转换为字符串; 指定 columns 时, 其余列的单元格不解析, 以 None 返回
+    """
+
+    def __init__(
+        self,
+        file: IO[bytes],
+        sheet_name: str,
+        parse_dates: bool = False,
+        typed: bool = False,
+        columns: Collection[int] | None = None,
+    ):
+        file.seek(0)
+        self.sheet_name = sheet_name
+        self.typed = typed
+        self.columns = columns
+        self.epoch = CALENDAR_WINDOWS_1900
+
+        with contextlib.ExitStack() as stack:  # 解析失败时关闭压缩包
+            self.archive = stack.enter_context(zipfile.ZipFile(file))
+            workbook_path = self._resolve_workbook_path()
+            workbook_rels = self._read_rels(workbook_path)
+            self.sheet_path = self._resolve_sheet_path(workbook_path, workbook_rels)
+            self.shared_strings = SharedStrings(self.archive, workbook_rels.get(SHARED_STRINGS_REL_TYPE))
+            self.date_styles = DateStyles(self.archive, workbook_rels.get(STYLES_REL_TYPE) if parse_dates else None)
+            self._exit_stack = stack.pop_all()
+
+    def iter_rows(self, skip_rows: int = 0) -> Iterator[RawRow]:
+        """逐行返回数据, XML 中缺失的行以空行补齐"""
+        next_row_number = skip_rows + 1
+        for row_number, cells in self._iter_row_elements():
+            if row_number < next_row_number:
+                continue
+            while next_row_number < row_number:  # XML 中不存在的行
+                yield []
+                next_row_number += 1
+            yield self._parse_row(cells)
+            next_row_number += 1
+
+    def close(self) -> None:
+        self._exit_stack.close()
+
+    def __enter__(self) -> 'SheetXml':
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def _iter_row_elements(self) -> Iterator[tuple[int, list[Element]]]:
+        with self.archive.open(self.sheet_path) as stream:
+            sheet_data: Element | None = None
+            row_number = 0
+            for event, element in iterparse(stream, events=('start', 'end')):
+                tag = local_name(element.tag)
+                if event == 'start':
+                    if tag == 'sheetData':
+                        sheet_data = element
+                    continue
+                if tag != 'row':
+                    continue
+
+                row_number = int(element.get('r') or row_number + 1)
+                yield row_number, list(element)
+                if sheet_data is not None:
+                    sheet_data.remove(element)  # 释放已经解析过的行
+
+    def _parse_row(self, cells: list[Element]) -> RawRow:
+        row: RawRow = []
+        for cell in cells:
+            coordinate = cell.get('r')
+            column_index = _column_index(coordinate) if coordinate else len(row)
+            if column_index > len(row):
+                row.extend([None] * (column_index - len(row)))
+            if self.columns is not None and column_index not in self.columns:
+                row.append(None)  # 不需要的列不查询 sharedStrings, 也不转换类型
+                continue
+            row.append(self._parse_cell(cell))
+        if not self.typed:
+            return [stringify_cell_value(value) for value in row]
+        return row
+
+    def _parse_cell(self, cell: Element) -> Any:
+        """返回单元格的原生值, 字符串已经处理过缺失值"""
+        cell_type = cell.get('t', 'n')
+        if cell_type == 'inlineStr':
+            inline = next((x for x in cell if local_name(x.tag) == 'is'), None)
+            return normalize_na(_text_of(inline)) if inline is not None else None
+
+        value = next((x.text for x in cell if local_name(x.tag) == 'v'), None)
+        if not value:
+            return None
+
+        if cell_type == 's':
+            return normalize_na(self.shared_strings[int(value)])
+        if cell_type == 'n':
+            return self._parse_number(value, int(cell.get('s', 0)))
+        return CELL_VALUE_PARSERS.get(cell_type, normalize_na)(value)
+
+    def _parse_number(self, value: str, style_id: int) -> Any:
+        number = _cast_number(value)
+        if style_id not in self.date_styles.date_styles:
+            return number
+        try:
+            return from_excel(number, self.epoch, timedelta=style_id in self.date_styles.timedelta_styles)
+        except (OverflowError, ValueError):
+            return None  # openpyxl 会将超出范围的日期视为错误
+
+    def _read_rels(self, part_path: str) -> dict[str, str]:
+        """读取部件的关系文件, 返回 {Id 或 Type: 部件路径}"""
+        directory, filename = posixpath.split(part_path)
+        rels_path = posixpath.join(directory, '_rels', f'{filename}.rels')
+        if rels_path not in self.archive.namelist():
+            return {}
+
+        rels: dict[str, str] = {}
+        with self.archive.open(rels_path) as stream:
+            for _, element in iterparse(stream):
+                if local_name(element.tag) != 'Relationship':
+                    continue
+                target = element.get('Target', '')
+                path = target.lstrip('/') if target.startswith('/') else posixpath.join(directory, target)
+                path = posixpath.normpath(path)
+                rels[element.get('Id', '')] = path
+                rels.setdefault(element.get('Type', ''), path)
+        return rels
+
+    def _resolve_workbook_path(self) -> str:
+        if ROOT_RELS_PATH not in self.archive.namelist():
+            return DEFAULT_WORKBOOK_PATH
+        return self._read_rels('').get(OFFICE_DOCUMENT_REL_TYPE, DEFAULT_WORKBOOK_PATH)
+
+    def _resolve_sheet_path(self, workbook_path: str, workbook_rels: dict[str, str]) -> str:
+        with self.archive.open(workbook_path) as stream:
+            for _, element in iterparse(stream):
+                tag = local_name(element.tag)
+                if tag == 'workbookPr' and element.get('date1904') in ('1', 'true'):
+                    self.epoch = CALENDAR_MAC_1904
+                if tag == 'sheet' and element.get('name') == self.sheet_name:
+                    relationship_id = element.get(RELATIONSHIP_ID_ATTR, '')
+                    if relationship_id in workbook_rels:
+                        return workbook_rels[relationship_id]
+
+        raise ConfigError(f'Excel 中不存在名为 {self.sheet_name} 的 Sheet')
@@ -0,0 +1,140 @@
+"""用户上传文件的来源, 导入时不再要求文件必须先上传到 Minio"""
+import io
+import os
+import threading
+from contextlib import contextmanager
+from os import PathLike
+from typing import IO
+from typing import Any
+from typing import Iterator
+
+from minio import Minio
+
+from excelalchemy.const import DEFAULT_SPOOL_MAX_SIZE
+from excelalchemy.core.abstract import ABCImportSource
+from excelalchemy.core.abstract import ImportSource
+from excelalchemy.exc import ConfigError
+from excelalchemy.util.file import read_file_from_minio_object
+
+
+class MinioSource(ABCImportSource):
+    """Minio 中的文件, 下载到临时文件后读取"""
+
+    def __init__(self, minio: Minio, bucket_name: str, name: str, spool_max_size: int = DEFAULT_SPOOL_MAX_SIZE):
+        self.minio = minio
+        self.bucket_name = bucket_name
+        self.name = name
+        self.spool_max_size = spool_max_size
+
+    @contextmanager
+    def open(self) -> Iterator[IO[bytes]]:
+        if self.minio is None:
+            raise ConfigError('未配置 minio, 无法读取文件')
+        # pyright: reportUnknownMemberType=false
+        # pyright: reportUnknownArgumentType=false
+        with read_file_from_minio_object(self.minio, self.bucket_name, self.name, self.spool_max_size) as file:
+            yield file
+
+
+class BytesSource(ABCImportSource):
+    """内存中的文件内容, 例如 HTTP 请求体"""
+
+    def __init__(self, content: bytes, name: str = ''):
+        self.content = content
+        self.name = name
+
+    @contextmanager
+    def open(self) -> Iterator[IO[bytes]]:
+        with io.BytesIO(self.content) as file:
+            yield file
+
+
+class PathSource(ABCImportSource):
+    """本地文件"""
+
+    def __init__(self, path: str | PathLike[str]):
+        self.path = path
+        self.name = os.fspath(path)
+
+    @contextmanager
+    def open(self) -> Iterator[IO[bytes]]:
+        with open(self.path, 'rb') as file:
+            yield file
+
+
+class FileSource(ABCImportSource):
+    """已经打开的二进制文件对象, 需要支持 seek; 导入结束后不会关闭该文件"""
+
+    def __init__(self, file: IO[bytes], name: str = ''):
+        self.file = file
+        file_name = getattr(file, 'name', None)  # 临时文件的 name 可能是文件描述符
+        self.name = name or (file_name if isinstance(file_name, str) else '')
+
+    @contextmanager
+    def open(self) -> Iterator[IO[bytes]]:
+        self.file.seek(0)
+        yield self.file
+
+
+class SharedFileView(io.RawIOBase):
+    """同一个文件对象的只读视图, 每个视图有独立的读取位置, 多个线程通过各自的视图并发读取同一个文件
+
+    底层文件对象的 seek 与 read 在共享的锁中执行, 不需要为每个线程复制一份文件内容
+    """
+
+    def __init__(self, file: IO[bytes], lock: threading.Lock):
+        super().__init__()
+        self.file = file
+        self.lock = lock
+        self.position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        with self.lock:
+            self.file.seek(self.position)
+            data = self.file.read(len(buffer))
+        buffer[: len(data)] = data
+        self.position += len(data)
+        return len(data)
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            self.position = offset
+        elif whence == io.SEEK_CUR:
+            self.position += offset
+        elif whence == io.SEEK_END:
+            with self.lock:
+                self.position = self.file.seek(0, io.SEEK_END) + offset
+        else:
+            raise ValueError(f'无效的 whence: {whence}')
+        return self.position
+
+    def tell(self) -> int:
+        return self.position
+
+
+def to_import_source(
+    source: ImportSource,
+    minio: Minio,
+    bucket_name: str,
+    spool_max_size: int = DEFAULT_SPOOL_MAX_SIZE,
+) -> ABCImportSource:
+    """把 import_data 的参数转换为文件来源"""
+    match source:
+        case ABCImportSource():
+            return source
+        case str():
+            return MinioSource(minio, bucket_name, source, spool_max_size)
+        case bytes():
+            return BytesSource(source)
+        case PathLike():
+            return PathSource(source)
+        case _ if hasattr(source, 'read') and hasattr(source, 'seek'):
+            return FileSource(source)
+        case _:
+            raise ConfigError(f'不支持的文件来源 {type(source).__name__}')
@@ -0,0 +1,190 @@
+"""逐行返回校验后的数据, 由调用方自行写入数据库, 例如按批调用自己的批量写入接口"""
+# pylint: disable=protected-access
+from contextlib import ExitStack
+from contextlib import aclosing
+from typing import IO
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import AsyncGenerator
+from typing import AsyncIterator
+from typing import Callable
+
+from pandas import DataFrame
+
+from excelalchemy.const import DEFAULT_STREAM_BATCH_SIZE
+from excelalchemy.core.abstract import ImportSource
+from excelalchemy.core.chunks import ResultT
+from excelalchemy.core.chunks import run_in_executor
+from excelalchemy.core.reader import get_csv_delimiter
+from excelalchemy.exc import ConfigError
+from excelalchemy.exc import ExcelCellError
+from excelalchemy.types.alchemy import ImporterConfig
+from excelalchemy.types.field import FieldMetaInfo
+from excelalchemy.types.identity import RowIndex
+from excelalchemy.types.result import ImportResult
+from excelalchemy.types.result import ValidateResult
+
+if TYPE_CHECKING:
+    from excelalchemy.core.alchemy import ExcelAlchemy
+
+# 数据流中的一行: 行索引与校验并转换后的数据, 校验失败时为错误列表
+StreamRow = tuple[RowIndex, dict[str, Any] | list[ExcelCellError]]
+
+
+class ImportRowStream:
+    """导入数据流, 由 ExcelAlchemy.iter_rows 创建
+
+    进入上下文时校验表头, 之后逐行返回 (row_index, data): data 为校验并转换后的 dict, 与传给 creator 的数据一致,
+    校验失败时为 ExcelCellError 列表. 调用方写入失败时通过 report_error 报告, 错误会写入导入结果文件.
+    退出上下文时统计已经返回的行, 存在失败数据时上传导入结果文件; 调用方提前停止迭代时, 导入结果只包含已经返回的行
+    """
+
+    def __init__(
+        self,
+        alchemy: 'ExcelAlchemy[Any, Any, Any, Any, Any, Any]',
+        input_excel_name: ImportSource,
+        output_excel_name: str,
+    ):
+        self.alchemy = alchemy
+        self.input_excel_name = input_excel_name
+        self.output_excel_name = output_excel_name
+        self.result: ImportResult | None = None  # 退出上下文之后可用; 表头错误时进入上下文之后即可用
+
+        self._exit_stack = ExitStack()
+        self._file_object: IO[bytes] | None = None
+        self._delimiter: str | None = None
+        self._row_count = 0  # 已经返回的行数
+        self._last_row_index: RowIndex | None = None
+        self._failed_rows: set[RowIndex] = set()  # 已经返回的行中校验失败或者报告了错误的行
+        self._exhausted = False  # 是否已经返回了所有数据
+        self._stopped_early = False  # 是否在返回所有数据之前停止了迭代
+        self._rows: AsyncGenerator[StreamRow, None] | None = None
+
+    async def __aenter__(self) -> 'ImportRowStream':
+        source = self.alchemy._import_source(self.input_excel_name)
+        self._delimiter = get_csv_delimiter(source.name)
+        self._file_object = self._exit_stack.enter_context(source.open())
+        try:
+            validate_header = await self._run(self.alchemy._validate_header, self._file_object, self._delimiter)
+        except BaseException:
+            self._exit_stack.close()
+            raise
+        if not validate_header.is_valid:
+            self.result = ImportResult.from_validate_header_result(validate_header)
+        return self
+
+    async def __aexit__(self, exc_type: type[BaseException] | None, *args: Any) -> None:
+        with self._exit_stack:
+            if self._rows is not None:
+                self._stopped_early = not self._exhausted
+                await self._rows.aclose()  # 调用方提前停止迭代时释放读取器
+            if exc_type is None and self.result is None:
+                self.result = await self._finish()
+
+    def __aiter__(self) -> AsyncIterator[StreamRow]:
+        return self._start(self._iter_rows(convert=True))
+
+    def iter_batches(self, batch_size: int = DEFAULT_STREAM_BATCH_SIZE) -> AsyncIterator[DataFrame]:
+        """按列返回校验通过的数据, 每批最多 batch_size 行, 与逐行迭代只能选择一种
+
+        DataFrame 的索引为行索引, 列为字段的 unique_key, 复合字段按子字段展开, 例如 `salary·start`;
+        没有空值的整数、浮点数与布尔列为原生类型, 其余列的类型为 object, 保留校验后的原值 (例如 Decimal、datetime 与 None),
+        可以直接用 pyarrow.RecordBatch.from_pandas 转换;
+        数据不经过 data_converter, 文件中没有的字段为空列; 校验失败的行不在批次中, 错误已经记录
+        """
+        if batch_size < 1:
+            raise ConfigError(f'批次大小 {batch_size} 必须大于 0')
+        return self._start(self._iter_batches(batch_size))
+
+    def _start(self, rows: AsyncGenerator[Any, None]) -> AsyncGenerator[Any, None]:
+        if self._rows is not None:
+            raise ConfigError('导入数据流只能迭代一次')
+        self._rows = rows
+        return rows
+
+    async def _iter_rows(self, convert: bool) -> AsyncGenerator[StreamRow, None]:
+        if self._file_object is None:
+            raise ConfigError('请在 async with 中迭代导入数据流')
+        if self.result is not None:
+            return  # 表头错误
+        rows = self.alchemy._iter_validated_rows(self._file_object, self._delimiter, convert=convert)
+        async with aclosing(rows):
+            async for row_index, data in rows:
+                self._row_count += 1
+                self._last_row_index = row_index
+                if not isinstance(data, dict):
+                    self._failed_rows.add(row_index)
+                yield row_index, data
+        self._exhausted = True
+
+    async def _iter_batches(self, batch_size: int) -> AsyncGenerator[DataFrame, None]:
+        field_metas = [x for x in self.alchemy.ordered_field_meta if not x.ignore_import]
+        batch: list[tuple[RowIndex, dict[str, Any]]] = []
+        rows = self._iter_rows(convert=False)
+        async with aclosing(rows):
+            async for row_index, data in rows:
+                if isinstance(data, dict):
+                    batch.append((row_index, data))
+                if len(batch) >= batch_size:
+                    yield to_columnar(field_metas, batch)
+                    batch = []
+        if batch:
+            yield to_columnar(field_metas, batch)
+
+    def report_error(self, row_index: RowIndex, error: Exception) -> None:
+        """报告一行数据写入失败, ExcelCellError 原样显示, 其他异常经过 exec_formatter 格式化
+
+        只能报告已经返回的行; 同一行报告多次时, 错误都会显示, 但只计为一行失败数据
+        """
+        assert isinstance(self.alchemy.config, ImporterConfig)  # only for type check
+        if self._last_row_index is None or row_index > self._last_row_index:
+            raise ConfigError(f'第 {row_index + 1} 行数据还没有返回, 不能报告错误')
+        self._failed_rows.add(row_index)
+        self.alchemy._register_dml_error(row_index, error, self.alchemy.config.exec_formatter)
+
+    async def _finish(self) -> ImportResult:
+        """统计导入结果, 存在失败数据时上传导入结果文件"""
+        assert self._file_object is not None  # only for type check
+        fail_count = len(self._failed_rows)
+        result = ImportResult(
+            result=ValidateResult.DATA_INVALID if fail_count else ValidateResult.SUCCESS,
+            success_count=self._row_count - fail_count,
+            fail_count=fail_count,
+            is_aborted=self._stopped_early,
+        )
+        if fail_count:
+            row_limit = None
+            if self._stopped_early:
+                row_limit = 0 if self._last_row_index is None else self._last_row_index + 1
+            await self._run(self.alchemy._load_import_result, self._file_object, self._delimiter, row_limit)
+            content_with_prefix = await self._run(self.alchemy._render_import_result_excel)
+            result.url = await self._run(self.alchemy._upload_file, self.output_excel_name, content_with_prefix)
+        return result
+
+    async def _run(self, func: Callable[..., ResultT], *args: Any) -> ResultT:
+        """配置了 executor 时在其中执行 CPU 密集的步骤"""
+        assert isinstance(self.alchemy.config, ImporterConfig)  # only for type check
+        return await run_in_executor(self.alchemy.config.executor, func, *args)
+
+
+def to_columnar(field_metas: list[FieldMetaInfo], rows: list[tuple[RowIndex, dict[str, Any]]]) -> DataFrame:
+    """把校验后的数据按列组织, 复合字段的值为 dict, 按子字段展开为单独的列, 缺少的值为 None
+
+    没有空值的整数、浮点数与布尔列转换为原生类型; 含有 None 的列与其他类型的列为 object, 调用方拿到的是校验后的原值
+    """
+    columns: dict[str, list[Any]] = {}
+    for field_meta in field_metas:
+        parent_key, key = str(field_meta.parent_key), str(field_meta.key)
+        values = [data.get(parent_key) for _, data in rows]
+        if key != parent_key:
+            values = [value.get(key) if isinstance(value, dict) else None for value in values]
+        columns[field_meta.unique_key] = values
+    # 先保留校验后的原值与 None, 避免 pandas 把含有空值的整数列推断为浮点数
+    df = DataFrame(columns, index=[row_index for row_index, _ in rows], dtype=object)
+    for name, values in columns.items():
+        if any(value is None for value in values):
+            continue
+        column = df[name].infer_objects()
+        if column.dtype.kind in 'biuf':  # 只转换可以无损表示的数值与布尔列
+            df[name] = column
+    return df
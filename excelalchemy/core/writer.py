@@ -1,6 +1,7 @@
 """负责将 pandas 写入 Excel 文件"""
 import base64
 from collections import defaultdict
+from dataclasses import dataclass
 from math import ceil
 from tempfile import NamedTemporaryFile
 from typing import Any
@@ -451,28 +452,27 @@ def render_merged_header_excel(
     return add_excel_prefix(content)
 
 
-def render_data_excel(
-    df: DataFrame,
-    errors: dict[RowIndex, dict[ColumnIndex, list[ExcelCellError]]],
-    field_meta_mapping: dict[UniqueLabel, FieldMetaInfo],
-    sheet_name: str = DEFAULT_SHEET_NAME,
-    file: BinaryIO | None = None,
-    close_file: bool = True,
-    has_merged_header: bool = False,
-) -> Base64Str:
-    if file is None:
-        close_file = True
+@dataclass
+class DataSheet:
+    """需要写入导入结果的一个 Sheet"""
 
-    tmp = _get_file(file)
-    writer = ExcelWriter(tmp, engine='openpyxl')
+    df: DataFrame
+    errors: dict[RowIndex, dict[ColumnIndex, list[ExcelCellError]]]
+    field_meta_mapping: dict[UniqueLabel, FieldMetaInfo]
+    has_merged_header: bool = False
 
-    _write_comment_header(df, tmp, sheet_name, writer=writer, close_file=False)
-    if has_merged_header:
+
+def _write_data_sheet(data_sheet: DataSheet, file: BinaryIO, sheet_name: str, writer: ExcelWriter) -> None:
+    """写入一个 Sheet 的表头与数据, 并标记错误"""
+    df, field_meta_mapping = data_sheet.df, data_sheet.field_meta_mapping
+
+    _write_comment_header(df, file, sheet_name, writer=writer, close_file=False)
+    if data_sheet.has_merged_header:
         pands_data_start_index = 1
         _write_merged_header(
             df,
             field_meta_mapping,
-            tmp,
+            file,
             sheet_name,
             row_write_offset=HEADER_HINT_LINE_COUNT,
             writer=writer,
@@ -483,7 +483,7 @@ def render_data_excel(
         _write_simple_header(
             df,
             field_meta_mapping,
-            tmp,
+            file,
             sheet_name,
             row_write_offset=HEADER_HINT_LINE_COUNT,
             writer=writer,
@@ -491,9 +491,9 @@ def render_data_excel(
         )
     _write_value_mark_error(
         df,
-        errors,
+        data_sheet.errors,
         field_meta_mapping,
-        tmp,
+        file,
         sheet_name,
         row_write_offset=HEADER_HINT_LINE_COUNT + 1,  # 表头 1 行，HEADER_HINT 一行
         writer=writer,
@@ -501,6 +501,34 @@ def render_data_excel(
         pands_data_start_index=pands_data_start_index,
     )
 
+
+def render_data_excel(
+    df: DataFrame,
+    errors: dict[RowIndex, dict[ColumnIndex, list[ExcelCellError]]],
+    field_meta_mapping: dict[UniqueLabel, FieldMetaInfo],
+    sheet_name: str = DEFAULT_SHEET_NAME,
+    file: BinaryIO | None = None,
+    close_file: bool = True,
+    has_merged_header: bool = False,
+) -> Base64Str:
+    data_sheet = DataSheet(df, errors, field_meta_mapping, has_merged_header)
+    return render_multi_sheet_data_excel({sheet_name: data_sheet}, file, close_file)
+
+
+def render_multi_sheet_data_excel(
+    data_sheets: dict[str, DataSheet],
+    file: BinaryIO | None = None,
+    close_file: bool = True,
+) -> Base64Str:
+    """把多个 Sheet 的导入结果写入同一个 Excel 文件, 按 data_sheets 的顺序写入"""
+    if file is None:
+        close_file = True
+
+    tmp = _get_file(file)
+    writer = ExcelWriter(tmp, engine='openpyxl')
+    for sheet_name, data_sheet in data_sheets.items():
+        _write_data_sheet(data_sheet, tmp, sheet_name, writer)
+
     writer.close()
     tmp.seek(0)
     content = base64.b64encode(tmp.read()).decode()
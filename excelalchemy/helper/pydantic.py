@@ -1,4 +1,5 @@
 from collections.abc import Sequence
+from functools import lru_cache
 from typing import Any
 from typing import Generator
 from typing import Iterable
@@ -11,6 +12,7 @@ from pydantic import NoneIsNotAllowedError
 from pydantic import ValidationError
 from pydantic.error_wrappers import ErrorList
 from pydantic.error_wrappers import ErrorWrapper
+from pydantic.fields import SHAPE_SINGLETON
 from pydantic.fields import ModelField
 from pydantic.fields import UndefinedType
 
@@ -20,6 +22,7 @@ from excelalchemy.exc import ExcelCellError
 from excelalchemy.exc import ProgrammaticError
 from excelalchemy.types.abstract import ABCValueType
 from excelalchemy.types.abstract import ComplexABCValueType
+from excelalchemy.types.abstract import ValidatedCell
 from excelalchemy.types.field import FieldMetaInfo
 from excelalchemy.types.identity import Key
 
@@ -37,6 +40,77 @@ def extract_pydantic_model(
     return list(_extract_pydantic_model(model))
 
 
+@lru_cache(maxsize=None)
+def get_column_validated_keys(model: type[BaseModel]) -> frozenset[Key]:
+    """可以在实例化模型之前按列校验的字段
+
+    字段类型必须是单一的 ValueType (可以为 Optional), 且字段上没有自定义的 validator;
+    模型有 pre=True 的 root_validator 时, 它需要看到原始值, 所有字段都不预先校验
+    """
+    if model.__pre_root_validators__:
+        return frozenset()
+    return frozenset(
+        Key(name)
+        for name, field in model.__fields__.items()
+        if field.shape == SHAPE_SINGLETON
+        and not field.sub_fields
+        and not field.class_validators
+        and isinstance(field.type_, type)
+        and issubclass(field.type_, ABCValueType)
+        and not issubclass(field.type_, ComplexABCValueType)
+    )
+
+
+@lru_cache(maxsize=None)
+def _get_fast_path_fields(model: type[BaseModel]) -> tuple[frozenset[Key], frozenset[Key]] | None:
+    """模型的所有字段都可以按列校验, 且没有 root_validator 与别名时, 返回 (可以为 None 的字段, 必填字段)"""
+    validated_keys = get_column_validated_keys(model)
+    if model.__post_root_validators__ or validated_keys != model.__fields__.keys():
+        return None
+    if any(field.alias != name for name, field in model.__fields__.items()):
+        return None
+    nullable = frozenset(Key(name) for name, field in model.__fields__.items() if field.allow_none)
+    required = frozenset(Key(name) for name, field in model.__fields__.items() if field.required is True)
+    return nullable, required
+
+
+def build_validated_data(data: dict[Key, Any], model: type[BaseModel]) -> dict[str, Any] | None:
+    """所有单元格都已经按列校验通过时, 不实例化模型, 直接返回与 model.dict(exclude_unset=True) 相同的结果
+
+    存在校验失败的单元格、缺少必填字段, 或者模型有自定义的校验时返回 None, 需要调用 instantiate_pydantic_model
+    """
+    fields = _get_fast_path_fields(model)
+    if fields is None:
+        return None
+    nullable, required = fields
+    if not required <= data.keys():
+        return None
+
+    result: dict[str, Any] = {}
+    for key, value in data.items():
+        if isinstance(value, ValidatedCell) and value.error is None:
+            result[key] = value.value
+        elif value is None and key in nullable:
+            result[key] = None
+        else:
+            return None
+    return result
+
+
+def validate_row_data(data: dict[Key, Any], model: type[BaseModel]) -> dict[str, Any] | list[ExcelCellError]:
+    """校验一行数据, 返回与 model.dict(exclude_unset=True) 相同的结果, 校验失败时返回错误; 不修改任何状态, 可以在其他线程中执行
+
+    所有单元格都已经按列校验通过时, 不需要实例化模型
+    """
+    validated_data = build_validated_data(data, model)
+    if validated_data is not None:
+        return validated_data
+    instance_or_errors = instantiate_pydantic_model(data, model)
+    if isinstance(instance_or_errors, model):
+        return instance_or_errors.dict(exclude_unset=True)
+    return cast(list[ExcelCellError], instance_or_errors)
+
+
 def instantiate_pydantic_model(  # noqa: C901
     data: dict[Key, Any],
     model: type[ModelT],
@@ -2,7 +2,9 @@ from abc import ABC
 from abc import abstractmethod
 from typing import TYPE_CHECKING
 from typing import Any
+from typing import Callable
 from typing import Iterable
+from typing import Sequence
 
 from pydantic.fields import ModelField
 
@@ -15,12 +17,35 @@ else:
     FieldMetaInfo = Any
 
 
+class ValidatedCell:
+    """已经按列校验过的单元格, 实例化 pydantic 模型时不再重复校验, 校验失败时抛出记录的异常"""
+
+    __slots__ = ('value', 'error')
+
+    def __init__(self, value: Any, error: Exception | None = None):
+        self.value = value
+        self.error = error
+
+    def unwrap(self) -> Any:
+        if self.error is not None:
+            raise self.error.with_traceback(None)  # 同一个异常可能被多行共享, 避免 traceback 逐次累积
+        return self.value
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}(value={self.value!r}, error={self.error!r})'
+
+
 class ABCValueType(ABC):
     """
     raw_data --> serialize --> __validate__
     raw_data--> deserialize
+
+    导入时按列批量调用 serialize_many 与 validate_many, 默认逐个调用 serialize 与 __validate__
     """
 
+    # 开启 typed_ingest 时, 是否接收单元格的原生值 (int/float/datetime 等), 否则 serialize 收到的总是字符串
+    typed_input: bool = False
+
     @classmethod
     @abstractmethod
     def comment(cls, field_meta: FieldMetaInfo) -> str:
@@ -38,9 +63,46 @@ class ABCValueType(ABC):
     def deserialize(cls, value: Any, field_meta: FieldMetaInfo) -> Any:
         """用于把 pandas 读取的 Excel 之后的数据，转回用户可识别的数据, 处理聚合之前的数据"""
 
+    @classmethod
+    def serialize_many(cls, values: Sequence[Any], field_meta: FieldMetaInfo) -> list[Any]:
+        """批量序列化一列数据, values 可以是 list、numpy.ndarray 或 pandas.Series, 不包含空值"""
+        return [cls.serialize(value, field_meta) for value in values]
+
+    @classmethod
+    def validate_many(cls, values: Sequence[Any], field_meta: FieldMetaInfo) -> tuple[list[Any], dict[int, Exception]]:
+        """批量校验一列 serialize 后的数据, 返回校验后的值与 {位置: 异常}, 校验失败的位置保留原值
+
+        与 pydantic 一样, 只有 ValueError, TypeError, AssertionError 视为校验失败, 其余异常直接抛出
+        """
+        return cls.__validate_each__(values, lambda value: cls.__validate__(value, field_meta))
+
+    @staticmethod
+    def __validate_each__(
+        values: Sequence[Any], validate_cell: Callable[[Any], Any]
+    ) -> tuple[list[Any], dict[int, Exception]]:
+        """逐个调用 validate_cell 校验一列数据, 返回值与 validate_many 相同;
+        validate_many 的实现在整列相同的配置只计算一次之后, 与 __validate__ 共用同一个 validate_cell
+        """
+        results: list[Any] = []
+        errors: dict[int, Exception] = {}
+        for index, value in enumerate(values):
+            try:
+                results.append(validate_cell(value))
+            except (ValueError, TypeError, AssertionError) as exc:
+                results.append(value)
+                errors[index] = exc
+        return results, errors
+
+    @classmethod
+    def __overrides__(cls, base: type['ABCValueType'], name: str) -> bool:
+        """子类是否重写了 base 的类方法; 重写了 serialize 或 __validate__ 的子类, 批量方法需要退回逐个调用"""
+        return getattr(cls, name).__func__ is not getattr(base, name).__func__
+
     @classmethod
     def __wrapped_validate__(cls, value: Any, field: ModelField) -> Any:
         # pyright: reportGeneralTypeIssues=false
+        if isinstance(value, ValidatedCell):
+            return value.unwrap()
         return cls.__validate__(value, field.field_info)  # type: ignore[arg-type]
 
     @classmethod
@@ -1,4 +1,6 @@
 """实例化 ExcelAlchemy 时的配置"""
+from concurrent.futures import Executor
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from dataclasses import field
 from enum import Enum
@@ -7,15 +9,24 @@ from typing import Awaitable
 from typing import Callable
 from typing import Generic
 from typing import Literal
+from typing import Sequence
 from typing import Type
 
 from minio import Minio
 
+from excelalchemy.const import DEFAULT_BULK_BATCH_SIZE
+from excelalchemy.const import DEFAULT_CELL_CACHE_SIZE
+from excelalchemy.const import DEFAULT_FAILURE_RATIO_WINDOW
+from excelalchemy.const import DEFAULT_PREFETCH_CHUNKS
+from excelalchemy.const import DEFAULT_SHEET_NAME
+from excelalchemy.const import DEFAULT_SPOOL_MAX_SIZE
+from excelalchemy.const import DEFAULT_YIELD_INTERVAL_ROWS
 from excelalchemy.const import ContextT
 from excelalchemy.const import ExporterModelT
 from excelalchemy.const import ImporterCreateModelT
 from excelalchemy.const import ImporterUpdateModelT
 from excelalchemy.exc import ConfigError
+from excelalchemy.types.identity import RowIndex
 from excelalchemy.util.convertor import export_data_converter
 from excelalchemy.util.convertor import import_data_converter
 
@@ -33,18 +44,43 @@ class ImportMode(str, Enum):
     CREATE_OR_UPDATE = 'CREATE_OR_UPDATE'  # 创建或更新
 
 
+class ReaderEngine(str, Enum):
+    """读取 Excel 的引擎"""
+
+    OPENPYXL = 'OPENPYXL'  # openpyxl 只读模式
+    XML = 'XML'  # 直接解析 Sheet 的 XML, 速度更快
+
+
 @dataclass
 class ImporterConfig(Generic[ContextT, ImporterCreateModelT, ImporterUpdateModelT]):
     create_importer_model: Type[ImporterCreateModelT] | None = field(default=None)
     update_importer_model: Type[ImporterUpdateModelT] | None = field(default=None)
+    # 创建或更新模式下, 在判断数据是否存在之前按模型校验并转换数据, 每行只校验与转换一次,
+    # is_data_exist/are_data_exist 与 creator/updater 接收同一份数据; 要求创建模型与更新模型为同一个类.
+    # 默认关闭, is_data_exist/are_data_exist 接收未经模型校验、只经过 data_converter 转换的数据
+    single_pass_upsert: bool = field(default=False)
 
     # Callable function receive Key as dict key instead of Label.
     data_converter: Callable[[dict[str, Any]], dict[str, Any]] | None = field(default=import_data_converter)
     creator: Callable[[dict[str, Any], ContextT | None], Awaitable[Any]] | None = field(default=None)
     updater: Callable[[dict[str, Any], ContextT | None], Awaitable[Any]] | None = field(default=None)
+    # 批量创建/更新函数, 配置后代替 creator/updater; 每次接收一批 (行索引, 转换后的数据),
+    # 按相同的顺序返回每行的结果, 异常 (包括 ExcelCellError) 表示该行失败, 其他值表示成功
+    bulk_creator: Callable[
+        [list[tuple[RowIndex, dict[str, Any]]], ContextT | None], Awaitable[Sequence[Any]]
+    ] | None = field(default=None)
+    bulk_updater: Callable[
+        [list[tuple[RowIndex, dict[str, Any]]], ContextT | None], Awaitable[Sequence[Any]]
+    ] | None = field(default=None)
+    # 每次调用批量创建/更新函数的行数
+    bulk_batch_size: int = field(default=DEFAULT_BULK_BATCH_SIZE)
 
     context: ContextT | None = field(default=None)
     is_data_exist: Callable[[dict[str, Any], ContextT | None], Awaitable[bool]] | None = field(default=None)
+    # 批量判断数据是否已经存在, 配置后代替 is_data_exist, 每次接收一块转换后的数据, 按相同的顺序返回每行是否存在
+    are_data_exist: Callable[[list[dict[str, Any]], ContextT | None], Awaitable[Sequence[bool]]] | None = field(
+        default=None
+    )
     exec_formatter: Callable[[Exception], str] = field(default=str)
 
     import_mode: ImportMode = field(default=ImportMode.CREATE)
@@ -52,8 +88,33 @@ class ImporterConfig(Generic[ContextT, ImporterCreateModelT, ImporterUpdateModel
     minio: Minio = field(default=None)
     bucket_name: str = field(default='excel')
     url_expires: int = field(default=3600)
-
-    sheet_name: Literal['Sheet1'] = field(default='Sheet1')
+    # 下载导入文件时, 小于该字节数的文件保存在内存中, 否则写入磁盘
+    spool_max_size: int = field(default=DEFAULT_SPOOL_MAX_SIZE)
+    reader_engine: ReaderEngine = field(default=ReaderEngine.OPENPYXL)
+    # 连续空行达到该数量则停止读取, 之后的数据不再导入; None 表示读取到最后一行, 中间的空行与其他数据一样校验
+    max_empty_rows: int | None = field(default=None)
+    # 按单元格的原生类型读取, 数值与日期直接交给 typed_input 的值类型, 不再转换为字符串后重新解析
+    typed_ingest: bool = field(default=False)
+    # 序列化与校验数据的进程数, 设置后按块在进程池中并行处理, DML 仍在事件循环中调用; 值类型与字段元数据需要可以被 pickle
+    validation_workers: int | None = field(default=None)
+    # 错误预算: 失败的行数超过该数量时提前终止导入, 导入结果文件只包含已经处理的数据; None 表示不限制
+    max_failed_rows: int | None = field(default=None)
+    # 错误预算: 处理完前 failure_ratio_window 行时, 失败比例超过该值则提前终止导入, 用于尽早发现使用了错误模版的文件
+    max_failure_ratio: float | None = field(default=None)
+    failure_ratio_window: int = field(default=DEFAULT_FAILURE_RATIO_WINDOW)
+    # 每列按原始单元格值缓存序列化与校验结果的数量, 重复的值只处理一次; 0 表示不缓存, 值类型的处理结果与调用次数有关时需要关闭
+    cell_cache_size: int = field(default=DEFAULT_CELL_CACHE_SIZE)
+    # 执行 CPU 密集步骤的线程池, 包括表头校验、读取与校验数据、渲染与上传导入结果, 避免阻塞事件循环; None 表示在事件循环中执行
+    executor: Executor | None = field(default=None)
+    # 在事件循环中处理数据时, 每处理多少行主动让出一次事件循环; 0 表示不主动让出
+    yield_interval_rows: int = field(default=DEFAULT_YIELD_INTERVAL_ROWS)
+    # 同时进行的 creator/updater 调用数量, 大于 1 时并发调用, 需要保证 creator/updater 与 is_data_exist 可以并发执行
+    dml_concurrency: int = field(default=1)
+    # 在后台提前读取并校验的数据块数量, 调用 DML 的同时准备后续的数据; 0 表示读完一块、写完一块之后再读取下一块
+    prefetch_chunks: int = field(default=DEFAULT_PREFETCH_CHUNKS)
+
+    # 导入的 Sheet, 多 Sheet 导入时每个配置对应一个 Sheet
+    sheet_name: str = field(default=DEFAULT_SHEET_NAME)
 
     def validate_model(self):
         if self.import_mode not in ImportMode.__members__.values():
@@ -67,8 +128,55 @@ class ImporterConfig(Generic[ContextT, ImporterCreateModelT, ImporterUpdateModel
             case ImportMode.CREATE_OR_UPDATE:
                 self._validate_create_or_update()
 
+        if self.single_pass_upsert and self.import_mode != ImportMode.CREATE_OR_UPDATE:
+            raise ConfigError('只有选择【创建或更新模式】时才能开启 single_pass_upsert')
+        self._validate_reader()
+        self._validate_error_budget()
+        self._validate_concurrency()
+        self._validate_bulk()
+
         return self
 
+    # 读取与校验选项验证
+    def _validate_reader(self):
+        if self.max_empty_rows is not None and self.max_empty_rows < 1:
+            raise ConfigError(f'连续空行上限 {self.max_empty_rows} 必须大于 0')
+        if self.validation_workers is not None and self.validation_workers < 1:
+            raise ConfigError(f'校验进程数 {self.validation_workers} 必须大于 0')
+        if self.cell_cache_size < 0:
+            raise ConfigError(f'单元格缓存数量 {self.cell_cache_size} 不能小于 0')
+
+    # 错误预算验证
+    def _validate_error_budget(self):
+        if self.max_failed_rows is not None and self.max_failed_rows < 0:
+            raise ConfigError(f'失败行数上限 {self.max_failed_rows} 不能小于 0')
+        if self.max_failure_ratio is not None and not 0 <= self.max_failure_ratio < 1:
+            raise ConfigError(f'失败比例上限 {self.max_failure_ratio} 必须在 [0, 1) 之间')
+        if self.failure_ratio_window < 1:
+            raise ConfigError(f'统计失败比例的行数 {self.failure_ratio_window} 必须大于 0')
+
+    # 线程池、并发与预读验证
+    def _validate_concurrency(self):
+        if isinstance(self.executor, ProcessPoolExecutor):
+            raise ConfigError('executor 只支持线程池, 在多进程中校验数据请设置 validation_workers')
+        if self.yield_interval_rows < 0:
+            raise ConfigError(f'让出事件循环的间隔行数 {self.yield_interval_rows} 不能小于 0')
+        if self.dml_concurrency < 1:
+            raise ConfigError(f'DML 并发数 {self.dml_concurrency} 必须大于 0')
+        if self.prefetch_chunks < 0:
+            raise ConfigError(f'预读的数据块数量 {self.prefetch_chunks} 不能小于 0')
+
+    # 批量写入验证
+    def _validate_bulk(self):
+        if self.bulk_batch_size < 1:
+            raise ConfigError(f'批量写入的行数 {self.bulk_batch_size} 必须大于 0')
+        if not self.bulk_creator and not self.bulk_updater:
+            return
+        if self.import_mode != ImportMode.UPDATE and self.bulk_creator is None:
+            raise ConfigError(f'导入模式 {self.import_mode} 使用批量写入时, bulk_creator 不能为空')
+        if self.import_mode != ImportMode.CREATE and self.bulk_updater is None:
+            raise ConfigError(f'导入模式 {self.import_mode} 使用批量写入时, bulk_updater 不能为空')
+
     # 创建模式验证
     def _validate_create(self):
         if self.import_mode != ImportMode.CREATE:
@@ -92,11 +200,13 @@ class ImporterConfig(Generic[ContextT, ImporterCreateModelT, ImporterUpdateModel
             raise ConfigError('当选择【创建或更新模式】时，创建模型不能为空')
         if not self.update_importer_model:
             raise ConfigError('当选择【创建或更新模式】时，更新模型不能为空')
-        if not self.is_data_exist:
+        if not self.is_data_exist and not self.are_data_exist:
             raise ConfigError('当选择【创建或更新模式】时，数据存在判断函数不能为空')
         # 创建模型和更新模型的字段必须一致
         if self.create_importer_model.__fields__.keys() != self.update_importer_model.__fields__.keys():
             raise ConfigError('创建模型和更新模型的字段名称必须一致')
+        if self.single_pass_upsert and self.create_importer_model is not self.update_importer_model:
+            raise ConfigError('开启 single_pass_upsert 时, 创建模型和更新模型必须为同一个类')
 
     def __post_init__(self):
         self.validate_model()
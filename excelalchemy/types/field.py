@@ -58,7 +58,7 @@ class FieldMetaInfo(FieldInfo):
     unique: bool | None = False  # 当前列是否唯一，不用于校验，用于渲染 Excel 表头的注释
 
     required: bool | None = False  # 当前列是否必填，不用于校验，用于渲染 Excel 表头的注释
-    ignore_import: bool | None = False  # 当前列是否忽略导入，不用于校验，用于渲染 Excel 表头的注释
+    ignore_import: bool | None = False  # 当前列是否忽略导入，忽略导入的列在导入时不会被解析
 
     order: int = 0  # 字段的顺序, 运行时必有
 
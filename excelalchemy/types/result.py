@@ -55,6 +55,7 @@ class ImportResult(BaseModel):
     url: str | None = Field(default=None, description='导入结果文件的下载链接, 失败时有值')
     success_count: int = Field(default=0, description='导入成功的数据条数')
     fail_count: int = Field(default=0, description='导入失败的数据条数')
+    is_aborted: bool = Field(default=False, description='失败数据超出错误预算, 导入被提前终止, 之后的数据没有处理')
 
     class Config:
         extra = Extra.allow
@@ -72,3 +73,32 @@ class ImportResult(BaseModel):
             duplicated=result.duplicated,
             missing_required=result.missing_required,
         )
+
+
+class MultiSheetImportResult(BaseModel):
+    """多 Sheet 导入数据结果"""
+
+    result: ValidateResult = Field(description='导入结果, 任一 Sheet 失败即为失败')
+    sheets: dict[str, ImportResult] = Field(default_factory=dict, description='每个 Sheet 的导入结果')
+
+    url: str | None = Field(default=None, description='导入结果文件的下载链接, 数据校验失败时有值')
+    success_count: int = Field(default=0, description='所有 Sheet 导入成功的数据条数')
+    fail_count: int = Field(default=0, description='所有 Sheet 导入失败的数据条数')
+    is_aborted: bool = Field(default=False, description='是否有 Sheet 因为超出错误预算被提前终止')
+
+    @classmethod
+    def from_sheet_results(cls, sheets: dict[str, ImportResult]) -> 'MultiSheetImportResult':
+        """汇总每个 Sheet 的导入结果, 表头错误优先于数据错误"""
+        results = {x.result for x in sheets.values()}
+        result = ValidateResult.SUCCESS
+        for invalid_result in (ValidateResult.HEADER_INVALID, ValidateResult.DATA_INVALID):
+            if invalid_result in results:
+                result = invalid_result
+                break
+        return cls(
+            result=result,
+            sheets=sheets,
+            success_count=sum(x.success_count for x in sheets.values()),
+            fail_count=sum(x.fail_count for x in sheets.values()),
+            is_aborted=any(x.is_aborted for x in sheets.values()),
+        )
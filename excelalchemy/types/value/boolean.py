@@ -1,10 +1,14 @@
 import logging
 from typing import Any
+from typing import Sequence
 
 from excelalchemy.types.abstract import ABCValueType
 from excelalchemy.types.field import FieldMetaInfo
 from excelalchemy.types.value import excel_choice
 
+# 用户可以输入的布尔值
+BOOLEAN_VALUES = {'是': True, '否': False}
+
 
 @excel_choice
 class Boolean(ABCValueType):
@@ -23,6 +27,18 @@ class Boolean(ABCValueType):
     def serialize(cls, value: Any, field_meta: FieldMetaInfo) -> str:
         return str(value).strip()
 
+    @classmethod
+    def serialize_many(cls, values: Sequence[Any], field_meta: FieldMetaInfo) -> list[Any]:
+        if cls.__overrides__(Boolean, 'serialize'):
+            return super().serialize_many(values, field_meta)
+        return [str(value).strip() for value in values]
+
+    @classmethod
+    def validate_many(cls, values: Sequence[Any], field_meta: FieldMetaInfo) -> tuple[list[Any], dict[int, Exception]]:
+        if cls.__overrides__(Boolean, '__validate__'):
+            return super().validate_many(values, field_meta)
+        return cls.__validate_each__(values, _validate_boolean)
+
     @classmethod
     def deserialize(cls, value: bool | str | None | Any, field_meta: FieldMetaInfo) -> str:
         if value is None or value == '':
@@ -44,12 +60,16 @@ class Boolean(ABCValueType):
 
     @classmethod
     def __validate__(cls, value: str | bool | Any, field_meta: FieldMetaInfo) -> bool:
-        if isinstance(value, bool):
-            return value
+        return _validate_boolean(value)
+
 
-        value_str = str(value)
+def _validate_boolean(value: str | bool | Any) -> bool:
+    """校验单个单元格, 布尔值没有需要按列计算的配置, 单个校验与批量校验共用"""
+    if isinstance(value, bool):
+        return value
 
-        if value_str not in ('是', '否'):
-            raise ValueError('请输入“是”或“否”')
+    parsed = BOOLEAN_VALUES.get(str(value))
+    if parsed is None:
+        raise ValueError('请输入“是”或“否”')
 
-        return value_str == '是'
+    return parsed
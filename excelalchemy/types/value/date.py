@@ -1,6 +1,8 @@
 import logging
 from datetime import datetime
 from typing import Any
+from typing import Callable
+from typing import Sequence
 from typing import cast
 
 import pendulum
@@ -16,6 +18,7 @@ from excelalchemy.types.field import FieldMetaInfo
 
 class Date(ABCValueType, datetime):
     __name__ = '日期选择'
+    typed_input = True
 
     @classmethod
     def comment(cls, field_meta: FieldMetaInfo) -> str:
@@ -35,6 +38,8 @@ class Date(ABCValueType, datetime):
         if isinstance(value, DateTime):
             logging.info('类型【%s】无需序列化: %s, 返回原值 %s ', cls.__name__, field_meta.label, value)
             return value
+        if isinstance(value, datetime):
+            return pendulum.instance(value).replace(tzinfo=field_meta.timezone)  # 原生日期不需要解析字符串
 
         if not field_meta.date_format:
             raise ConfigError('日期格式未定义')
@@ -51,6 +56,45 @@ class Date(ABCValueType, datetime):
             logging.warning('ValueType 类型 <%s> 无法解析 Excel 输入，返回原值：%s，原因：%s', cls.__name__, value, exc)
             return value
 
+    @classmethod
+    def serialize_many(cls, values: Sequence[Any], field_meta: FieldMetaInfo) -> list[Any]:
+        if cls.__overrides__(Date, 'serialize'):
+            return super().serialize_many(values, field_meta)
+        parsed: dict[Any, Any] = {}  # 同一列中的日期大量重复, 相同的输入只解析一次
+        results: list[Any] = []
+        for value in values:
+            if isinstance(value, DateTime):
+                results.append(value)
+                continue
+            key = (type(value), value)
+            if key not in parsed:
+                parsed[key] = cls.serialize(value, field_meta)
+            results.append(parsed[key])
+        return results
+
+    @classmethod
+    def validate_many(cls, values: Sequence[Any], field_meta: FieldMetaInfo) -> tuple[list[Any], dict[int, Exception]]:
+        if cls.__overrides__(Date, '__validate__') or len(values) == 0:
+            return super().validate_many(values, field_meta)
+        validate_cell = cls.__cell_validator__(field_meta)
+        validated: dict[tuple[datetime, Any], int | ValueError] = {}  # 相同的日期只校验一次, 时区偏移不同时墙上时间不同
+
+        def validate_cached(value: Any) -> int:
+            if not isinstance(value, datetime):
+                return validate_cell(value)
+            key = (value, value.utcoffset())
+            if key not in validated:
+                try:
+                    validated[key] = validate_cell(value)
+                except ValueError as exc:
+                    validated[key] = exc
+            result = validated[key]
+            if isinstance(result, ValueError):
+                raise result
+            return result
+
+        return cls.__validate_each__(values, validate_cached)
+
     @classmethod
     def deserialize(cls, value: str | datetime | None | Any, field_meta: FieldMetaInfo) -> str:
         match value:
@@ -67,20 +111,28 @@ class Date(ABCValueType, datetime):
 
     @classmethod
     def __validate__(cls, value: Any, field_meta: FieldMetaInfo) -> int:
+        return cls.__cell_validator__(field_meta)(value)
+
+    @classmethod
+    def __cell_validator__(cls, field_meta: FieldMetaInfo) -> Callable[[Any], int]:
+        """返回校验单个单元格的函数, 日期格式与错误信息对整列都相同, 只计算一次"""
         if field_meta.date_format is None:
             raise ConfigError('日期格式未定义')
+        format_error = f'请输入格式为{DATE_FORMAT_TO_HINT_MAPPING[field_meta.date_format]}的日期'
 
-        if not isinstance(value, datetime):
-            raise ValueError(f'请输入格式为{DATE_FORMAT_TO_HINT_MAPPING[field_meta.date_format]}的日期')
+        def validate_cell(value: Any) -> int:
+            if not isinstance(value, datetime):
+                raise ValueError(format_error)
 
-        parsed = cls._parse_date(value, field_meta)
-        errors = cls._validate_date_range(parsed, field_meta)
+            parsed = cls._parse_date(value, field_meta)
+            errors = cls._validate_date_range(parsed, field_meta)
 
-        if errors:
-            raise ValueError(*errors)
-        else:
+            if errors:
+                raise ValueError(*errors)
             return int(parsed.timestamp() * MILLISECOND_TO_SECOND)
 
+        return validate_cell
+
     @staticmethod
     def _parse_date(v: datetime, field_meta: FieldMetaInfo) -> datetime:
         format_ = field_meta.python_date_format
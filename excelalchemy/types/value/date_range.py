@@ -26,6 +26,7 @@ class DateRange(ComplexABCValueType):
     end: datetime | None
 
     __name__ = '日期范围'
+    typed_input = True
 
     @classmethod
     def parse_obj(cls, obj: Any) -> 'DateRange':
@@ -67,23 +68,9 @@ class DateRange(ComplexABCValueType):
         match value:
             case dict():
                 try:
-                    start_str, end_str = value.get('start'), value.get('end')
-                    # pyright: reportGeneralTypeIssues=false
-                    # pyright: reportUnknownArgumentType=false
-                    start_time = (
-                        pendulum.parse(start_str).replace(  # type: ignore
-                            tzinfo=field_meta.timezone,
-                        )
-                        if start_str
-                        else None
-                    )
-                    end_time = (
-                        pendulum.parse(end_str).replace(  # type: ignore
-                            tzinfo=field_meta.timezone,
-                        )
-                        if end_str
-                        else None
-                    )
+                    start, end = value.get('start'), value.get('end')
+                    start_time = cls._parse_datetime(start, field_meta) if start else None
+                    end_time = cls._parse_datetime(end, field_meta) if end else None
 
                     return {'start': start_time, 'end': end_time}
                 except Exception as e:
@@ -101,6 +88,14 @@ class DateRange(ComplexABCValueType):
             case _:
                 return value
 
+    @staticmethod
+    def _parse_datetime(value: str | datetime | Any, field_meta: FieldMetaInfo) -> DateTime:
+        if isinstance(value, datetime):
+            return pendulum.instance(value).replace(tzinfo=field_meta.timezone)  # 原生日期不需要解析字符串
+        # pyright: reportGeneralTypeIssues=false
+        # pyright: reportUnknownArgumentType=false
+        return pendulum.parse(str(value)).replace(tzinfo=field_meta.timezone)  # type: ignore
+
     @classmethod
     def __validate__(
         cls,
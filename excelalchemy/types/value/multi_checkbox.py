@@ -1,5 +1,7 @@
 import logging
 from typing import Any
+from typing import Callable
+from typing import Sequence
 from typing import cast
 
 from excelalchemy.const import MULTI_CHECKBOX_SEPARATOR
@@ -38,26 +40,41 @@ class MultiCheckbox(ABCValueType, list[str]):
         return value
 
     @classmethod
-    def __validate__(cls, value: list[str] | Any, field_meta: FieldMetaInfo) -> list[str]:  # OptionId
-        if not isinstance(value, list):
-            raise ValueError('选项不存在，请参照表头的注释填写')
+    def validate_many(cls, values: Sequence[Any], field_meta: FieldMetaInfo) -> tuple[list[Any], dict[int, Exception]]:
+        if cls.__overrides__(MultiCheckbox, '__validate__') or len(values) == 0:
+            return super().validate_many(values, field_meta)
+        return cls.__validate_each__(values, cls.__cell_validator__(field_meta))
 
-        if field_meta.options is None:
-            raise ProgrammaticError(f'options cannot be None when validate {cls.__name__}')
+    @classmethod
+    def __validate__(cls, value: list[str] | Any, field_meta: FieldMetaInfo) -> list[str]:  # OptionId
+        return cls.__cell_validator__(field_meta)(value)
 
-        if not field_meta.options:  # empty
+    @classmethod
+    def __cell_validator__(cls, field_meta: FieldMetaInfo) -> Callable[[Any], list[str]]:
+        """返回校验单个单元格的函数, 选项对整列都相同, 只查找一次"""
+        options = field_meta.options
+        if options is not None and not options:  # empty
             logging.warning('类型【%s】的字段【%s】的选项为空, 将返回原值', cls.__name__, field_meta.label)
-            return value
+        options_name_map = field_meta.options_name_map
+
+        def validate_cell(value: list[str] | Any) -> list[str]:
+            if not isinstance(value, list):
+                raise ValueError('选项不存在，请参照表头的注释填写')
+
+            if options is None:
+                raise ProgrammaticError(f'options cannot be None when validate {cls.__name__}')
+
+            if not options:
+                return value
 
-        if len(value) != len(set(value)):
-            raise ValueError('选项有重复')
+            if len(value) != len(set(value)):
+                raise ValueError('选项有重复')
 
-        result, errors = field_meta.exchange_names_to_option_ids_with_errors(value)
+            if all(name in options_name_map for name in value):
+                return [options_name_map[name].id for name in value]
+            raise ValueError(*field_meta.exchange_names_to_option_ids_with_errors(value)[1])
 
-        if errors:
-            raise ValueError(*errors)
-        else:
-            return result
+        return validate_cell
 
     @classmethod
     def deserialize(cls, value: str | list[OptionId] | None, field_meta: FieldMetaInfo) -> str:
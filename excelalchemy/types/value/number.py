@@ -4,6 +4,8 @@ from decimal import Context
 from decimal import Decimal
 from decimal import InvalidOperation
 from typing import Any
+from typing import Callable
+from typing import Sequence
 
 from excelalchemy.types.abstract import ABCValueType
 from excelalchemy.types.field import FieldMetaInfo
@@ -40,8 +42,14 @@ def transform_decimal(value: Decimal | int | float | None) -> float | int | None
         return float(value)
 
 
+def is_native_number(value: Any) -> bool:
+    """是否为 int 或 float, bool 是 int 的子类, 不属于数值"""
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
 class Number(Decimal, ABCValueType):
     __name__ = '数值输入'
+    typed_input = True
 
     @classmethod
     def comment(cls, field_meta: FieldMetaInfo) -> str:
@@ -57,6 +65,8 @@ class Number(Decimal, ABCValueType):
 
     @classmethod
     def serialize(cls, value: str | int | float | None, field_meta: FieldMetaInfo) -> Decimal | Any:
+        if is_native_number(value):
+            return value  # 原生数值不需要经过 Decimal 解析
         if isinstance(value, str):
             value = value.strip()
         try:
@@ -65,6 +75,19 @@ class Number(Decimal, ABCValueType):
             logging.warning('ValueType 类型 <%s> 无法解析 Excel 输入, 返回原值:%s, 原因: %s', cls.__name__, value, exc)
             return str(value) if value is not None else ''
 
+    @classmethod
+    def serialize_many(cls, values: Sequence[Any], field_meta: FieldMetaInfo) -> list[Any]:
+        if cls.__overrides__(Number, 'serialize'):
+            return super().serialize_many(values, field_meta)
+        # 大部分单元格是原生数值, 不需要逐个调用 serialize
+        return [value if is_native_number(value) else cls.serialize(value, field_meta) for value in values]
+
+    @classmethod
+    def validate_many(cls, values: Sequence[Any], field_meta: FieldMetaInfo) -> tuple[list[Any], dict[int, Exception]]:
+        if cls.__overrides__(Number, '__validate__'):
+            return super().validate_many(values, field_meta)
+        return cls.__validate_each__(values, cls.__cell_validator__(field_meta))
+
     @classmethod
     def deserialize(cls, value: str | None | Any, field_meta: FieldMetaInfo) -> str:
         if value is None or value == '':
@@ -111,29 +134,44 @@ class Number(Decimal, ABCValueType):
 
         # 确保解析后的 decimal 在接受范围内。
         if not importer_ge <= value <= importer_le:
-            if field_meta.importer_le and field_meta.importer_ge:
-                errors.append(f'请输入在 {field_meta.importer_ge} 和 {field_meta.importer_le} 之间的数字。')
-            elif field_meta.importer_le:
-                errors.append(f'请输入在 -∞ 和 {field_meta.importer_le} 之间的数字。')
-            elif field_meta.importer_ge:
-                errors.append(f'请输入在 {field_meta.importer_ge} 和 +∞ 之间的数字。')
-            else:
-                pass
+            errors.extend(Number.__range_errors__(field_meta))
 
         return errors
 
+    @staticmethod
+    def __range_errors__(field_meta: FieldMetaInfo) -> list[str]:
+        """超出范围时的错误信息"""
+        if field_meta.importer_le and field_meta.importer_ge:
+            return [f'请输入在 {field_meta.importer_ge} 和 {field_meta.importer_le} 之间的数字。']
+        elif field_meta.importer_le:
+            return [f'请输入在 -∞ 和 {field_meta.importer_le} 之间的数字。']
+        elif field_meta.importer_ge:
+            return [f'请输入在 {field_meta.importer_ge} 和 +∞ 之间的数字。']
+        return []
+
     @classmethod
     def __validate__(cls, value: Decimal | Any, field_meta: FieldMetaInfo) -> float | int:
-        # 如果输入不是 Decimal 类型，尝试转换。
-        parsed = cls.__maybe_decimal__(value)
-        if parsed is None:
-            raise ValueError('无效输入，请输入数字。')
-        # 初始化一个错误信息列表。
-        errors: list[str] = cls.__check_range__(value, field_meta)
-        if errors:
-            raise ValueError(*errors)
-        parsed = canonicalize_decimal(parsed, field_meta.fraction_digits)
-        value = transform_decimal(parsed)
-        if value is None:
-            raise ValueError('无效输入，请输入数字。')
-        return value
+        return cls.__cell_validator__(field_meta)(value)
+
+    @classmethod
+    def __cell_validator__(cls, field_meta: FieldMetaInfo) -> Callable[[Any], float | int]:
+        """返回校验单个单元格的函数, 范围、精度与错误信息对整列都相同, 只计算一次"""
+        importer_le = field_meta.importer_le or Decimal('Infinity')
+        importer_ge = field_meta.importer_ge or Decimal('-Infinity')
+        range_errors = cls.__range_errors__(field_meta)
+        fraction_digits = field_meta.fraction_digits
+
+        def validate_cell(value: Decimal | Any) -> float | int:
+            # 如果输入不是 Decimal 类型，尝试转换。
+            parsed = cls.__maybe_decimal__(value)
+            if parsed is None:
+                raise ValueError('无效输入，请输入数字。')
+            # 确保输入在接受范围内。
+            if not importer_ge <= value <= importer_le and range_errors:
+                raise ValueError(*range_errors)
+            result = transform_decimal(canonicalize_decimal(parsed, fraction_digits))
+            if result is None:
+                raise ValueError('无效输入，请输入数字。')
+            return result
+
+        return validate_cell
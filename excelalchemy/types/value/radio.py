@@ -1,5 +1,7 @@
 import logging
 from typing import Any
+from typing import Callable
+from typing import Sequence
 
 from excelalchemy.const import MULTI_CHECKBOX_SEPARATOR
 from excelalchemy.exc import ProgrammaticError
@@ -22,6 +24,12 @@ class Radio(ABCValueType, str):
     def serialize(cls, value: Any, field_meta: FieldMetaInfo) -> str:
         return str(value).strip()
 
+    @classmethod
+    def validate_many(cls, values: Sequence[Any], field_meta: FieldMetaInfo) -> tuple[list[Any], dict[int, Exception]]:
+        if cls.__overrides__(Radio, '__validate__') or len(values) == 0:
+            return super().validate_many(values, field_meta)
+        return cls.__validate_each__(values, cls.__cell_validator__(field_meta))
+
     @classmethod
     def deserialize(cls, value: Any | None, field_meta: FieldMetaInfo) -> str:
         if value is None or value == '':
@@ -41,22 +49,31 @@ class Radio(ABCValueType, str):
 
     @classmethod
     def __validate__(cls, value: str, field_meta: FieldMetaInfo) -> OptionId | str:  # return Option.id
-        if MULTI_CHECKBOX_SEPARATOR in value:
-            raise ValueError('多选不支持')
+        return cls.__cell_validator__(field_meta)(value)
 
-        parsed = value.strip()
+    @classmethod
+    def __cell_validator__(cls, field_meta: FieldMetaInfo) -> Callable[[str], OptionId | str]:
+        """返回校验单个单元格的函数, 选项对整列都相同, 只查找一次"""
+        options = field_meta.options
+        if options is not None and not options:  # empty
+            logging.warning('%s 类型字段"%s"的选项为空，将返回原值', cls.__name__, field_meta.label)
+        options_id_map, options_name_map = field_meta.options_id_map, field_meta.options_name_map
 
-        if field_meta.options is None:
-            raise ProgrammaticError('当验证【RADIO / MULTI_CHECKBOX / SELECT】类型字段时，选项不得为空！')
+        def validate_cell(value: str) -> OptionId | str:
+            if MULTI_CHECKBOX_SEPARATOR in value:
+                raise ValueError('多选不支持')
 
-        if not field_meta.options:  # empty
-            logging.warning('%s 类型字段"%s"的选项为空，将返回原值', cls.__name__, field_meta.label)
-            return parsed
+            parsed = value.strip()
+
+            if options is None:
+                raise ProgrammaticError('当验证【RADIO / MULTI_CHECKBOX / SELECT】类型字段时，选项不得为空！')
+
+            if not options or parsed in options_id_map:
+                return parsed
 
-        if parsed in field_meta.options_id_map:
-            return parsed
+            if parsed not in options_name_map:
+                raise ValueError('选项不存在，请参照字段注释填写')
 
-        if parsed not in field_meta.options_name_map:
-            raise ValueError('选项不存在，请参照字段注释填写')
+            return options_name_map[parsed].id
 
-        return field_meta.options_name_map[parsed].id
+        return validate_cell
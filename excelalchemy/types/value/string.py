@@ -1,4 +1,6 @@
 from typing import Any
+from typing import Callable
+from typing import Sequence
 
 from excelalchemy.const import CharacterSet
 from excelalchemy.exc import ProgrammaticError
@@ -94,36 +96,46 @@ class String(str, ABCValueType):
     def serialize(cls, value: Any, field_meta: FieldMetaInfo) -> str:
         return str(value).strip()
 
+    @classmethod
+    def validate_many(cls, values: Sequence[Any], field_meta: FieldMetaInfo) -> tuple[list[Any], dict[int, Exception]]:
+        if cls.__overrides__(String, '__validate__') or len(values) == 0:
+            return super().validate_many(values, field_meta)
+        return cls.__validate_each__(values, cls.__cell_validator__(field_meta))
+
     @classmethod
     def deserialize(cls, value: str | None | Any, field_meta: FieldMetaInfo) -> str:
         return str(value).strip() if value is not None else ''
 
-    # mccabe-complexity: 12
     @classmethod
     def __validate__(cls, value: str, field_meta: FieldMetaInfo) -> str:
-        parsed = str(value)
-        errors: list[str] = []
-
-        if field_meta.importer_max_length is not None:
-            if len(parsed) > field_meta.importer_max_length:
-                errors.append(f'最长为{field_meta.importer_max_length}个字')
-
-        errors.extend(cls.__check_character_set__(parsed, field_meta))
-
-        if errors:
-            raise ValueError(*errors)
-        else:
-            return parsed
+        return cls.__cell_validator__(field_meta)(value)
 
     @classmethod
-    def __check_character_set__(cls, value: str, field_meta: FieldMetaInfo) -> list[str]:
-        errors: list[str] = []
+    def __cell_validator__(cls, field_meta: FieldMetaInfo) -> Callable[[Any], str]:
+        """返回校验单个单元格的函数, 长度限制与字符集对整列都相同, 只计算一次"""
         if field_meta.character_set is None:
             raise ProgrammaticError('character_set 未设置')
 
-        for single_character in value:
-            if not any(_CHARACTER_SET_TO_VALIDATOR[cs](single_character) for cs in field_meta.character_set):
-                errors.append(f'仅允许输入{_format_character_set_names(field_meta.character_set)}')
-                break
+        max_length = field_meta.importer_max_length
+        character_validators = [_CHARACTER_SET_TO_VALIDATOR[cs] for cs in field_meta.character_set]
+        character_set_error = f'仅允许输入{_format_character_set_names(field_meta.character_set)}'
+        allowed: dict[str, bool] = {}  # 同一列中的字符大量重复, 每个字符只判断一次
+
+        def validate_cell(value: Any) -> str:
+            parsed = str(value)
+            errors: list[str] = []
+            if max_length is not None and len(parsed) > max_length:
+                errors.append(f'最长为{max_length}个字')
+            for character in parsed:
+                is_allowed = allowed.get(character)
+                if is_allowed is None:
+                    is_allowed = allowed[character] = any(x(character) for x in character_validators)
+                if not is_allowed:
+                    errors.append(character_set_error)
+                    break
+
+            if errors:
+                raise ValueError(*errors)
+            return parsed
 
-        return errors
+        return validate_cell
@@ -1,17 +1,22 @@
 import base64
+import contextlib
 import io
+import shutil
 from datetime import timedelta
-from tempfile import TemporaryFile
+from tempfile import SpooledTemporaryFile
 from typing import IO
 from typing import Any
+from typing import cast
 
 import pandas
 from minio import Minio
 from urllib3.response import HTTPResponse
 
+from excelalchemy.const import DEFAULT_SPOOL_MAX_SIZE
 from excelalchemy.const import UNIQUE_HEADER_CONNECTOR
 
 EXCEL_PREFIX = 'data:application/vnd.openxmlformats-officedocument.spreadsheetml.sheet;base64'
+DOWNLOAD_CHUNK_SIZE = 64 * 1024  # 每次从 HTTPResponse 读取的字节数
 
 
 def add_excel_prefix(content: str) -> str:
@@ -25,26 +30,36 @@ def remove_excel_prefix(content: str) -> str:
     return content.lstrip(f'{EXCEL_PREFIX},')
 
 
-def construct_file_like_object(response: HTTPResponse) -> IO[bytes]:
+def construct_file_like_object(response: HTTPResponse, spool_max_size: int = DEFAULT_SPOOL_MAX_SIZE) -> IO[bytes]:
     """Construct a file like object from HTTPResponse.
 
+    The response is copied in chunks, files smaller than `spool_max_size` stay in memory,
+    larger ones roll over to disk. The connection is released back to the pool right after.
     You must close the file after you finished using it.
     """
-    tmp = TemporaryFile()
-    tmp.write(response.read())
+    try:
+        with contextlib.ExitStack() as stack:  # 复制失败时关闭临时文件
+            tmp = stack.enter_context(SpooledTemporaryFile(max_size=spool_max_size))
+            shutil.copyfileobj(response, tmp, DOWNLOAD_CHUNK_SIZE)
+            stack.pop_all()
+    finally:
+        response.close()
+        if hasattr(response, 'release_conn'):
+            response.release_conn()
     tmp.seek(0)
-    return tmp
+    return cast(IO[bytes], tmp)
 
 
 def read_file_from_minio_object(
     client: Minio,
     bucket_name: str,
     filename: str,
+    spool_max_size: int = DEFAULT_SPOOL_MAX_SIZE,
 ) -> IO[bytes]:
     """ "Read file content by <Minio> object."""
     # pyright: reportUnknownMemberType=false
     response: HTTPResponse = client.get_object(bucket_name, filename)
-    return construct_file_like_object(response)
+    return construct_file_like_object(response, spool_max_size)
 
 
 def upload_file_from_minio_object(
@@ -1,8 +1,10 @@
+import io
 from typing import Any
 from typing import cast
 from unittest import IsolatedAsyncioTestCase
 
 from minio import Minio
+from openpyxl import Workbook
 from pydantic import BaseModel
 
 from excelalchemy import ColumnIndex
@@ -13,6 +15,21 @@ from tests.mock_minio import LocalMockMinio
 from tests.mock_minio import local_minio
 
 
+def build_excel_content(rows: list[list[Any]], merged_cells: list[str] | None = None) -> bytes:
+    """按行生成名为 Sheet1 的 Excel 文件内容, merged_cells 为需要合并的单元格范围, 例如 A2:A3"""
+    workbook = Workbook()
+    worksheet = workbook.active
+    worksheet.title = 'Sheet1'
+    for row in rows:
+        worksheet.append(row)
+    for cell_range in merged_cells or []:
+        worksheet.merge_cells(cell_range)
+
+    file = io.BytesIO()
+    workbook.save(file)
+    return file.getvalue()
+
+
 class BaseTestCase(IsolatedAsyncioTestCase):
     minio = local_minio
     first_data_row: RowIndex = 0
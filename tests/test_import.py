@@ -1,11 +1,20 @@
 import asyncio
 import datetime
+import io
+import multiprocessing
 import random
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 from typing import cast
+from unittest import mock
 
+import pandas
 from minio import Minio
+from openpyxl import load_workbook
 from pydantic import BaseModel
+from pydantic import root_validator
 
 from excelalchemy import Boolean
 from excelalchemy import ColumnIndex
@@ -33,6 +42,7 @@ from excelalchemy import OptionId
 from excelalchemy import PhoneNumber
 from excelalchemy import ProgrammaticError
 from excelalchemy import Radio
+from excelalchemy import ReaderEngine
 from excelalchemy import RowIndex
 from excelalchemy import SingleOrganization
 from excelalchemy import SingleStaff
@@ -41,7 +51,11 @@ from excelalchemy import String
 from excelalchemy import UniqueKey
 from excelalchemy import Url
 from excelalchemy import ValidateResult
+from excelalchemy.const import BACKGROUND_ERROR_COLOR
+from excelalchemy.core import chunks
+from excelalchemy.core.pipeline import ImportPipeline
 from tests import BaseTestCase
+from tests import build_excel_content
 from tests.registry import FileRegistry
 
 
@@ -325,6 +339,713 @@ class TestImport(BaseTestCase):
             }
         }
 
+    async def test_import_with_xml_reader_engine(self):
+        """XML 引擎与 openpyxl 引擎的导入结果一致"""
+        results, cell_errors = [], []
+        for reader_engine in (ReaderEngine.OPENPYXL, ReaderEngine.XML):
+            config = ImporterConfig(
+                self.NoMergeHeaderImporter,
+                creator=self.creator,
+                minio=cast(Minio, self.minio),
+                reader_engine=reader_engine,
+            )
+            alchemy = ExcelAlchemy(config)
+            results.append(
+                await alchemy.import_data(
+                    input_excel_name=FileRegistry.TEST_SIMPLE_IMPORT_WITH_ERROR,
+                    output_excel_name='result.xlsx',
+                )
+            )
+            cell_errors.append(alchemy.cell_errors)
+
+        assert results[0].result == results[1].result == ValidateResult.DATA_INVALID
+        assert results[0].fail_count == results[1].fail_count
+        assert cell_errors[0] == cell_errors[1]
+
+    async def test_import_with_typed_ingest(self):
+        """按原生类型读取时, 导入结果与默认读取方式一致"""
+        for input_excel_name in (FileRegistry.TEST_SIMPLE_IMPORT, FileRegistry.TEST_SIMPLE_IMPORT_WITH_ERROR):
+            created_data, cell_errors = [], []
+            for typed_ingest in (False, True):
+                created: list[dict[str, Any]] = []
+
+                async def creator(data: dict[str, Any], context: Any) -> Any:
+                    created.append(data)
+
+                config = ImporterConfig(
+                    self.NoMergeHeaderImporter,
+                    creator=creator,
+                    minio=cast(Minio, self.minio),
+                    typed_ingest=typed_ingest,
+                )
+                alchemy = ExcelAlchemy(config)
+                await alchemy.import_data(input_excel_name=input_excel_name, output_excel_name='result.xlsx')
+                created_data.append(created)
+                cell_errors.append(alchemy.cell_errors)
+
+            assert created_data[0] == created_data[1]
+            assert cell_errors[0] == cell_errors[1]
+
+    async def test_import_csv(self):
+        """CSV/TSV 与 xlsx 使用相同的校验流程"""
+        data = self.minio.get_object(self.minio.bucket_name, FileRegistry.TEST_SIMPLE_IMPORT_WITH_ERROR)
+        df = pandas.read_excel(data, header=None, dtype=str)
+        for input_excel_name, sep, encoding in (('import.csv', ',', 'gb18030'), ('import.tsv', '\t', 'utf-8-sig')):
+            content = df.to_csv(index=False, header=False, sep=sep).encode(encoding)
+            self.minio.put_object(self.minio.bucket_name, input_excel_name, io.BytesIO(content), len(content))
+
+            config = ImporterConfig(self.NoMergeHeaderImporter, creator=self.creator, minio=cast(Minio, self.minio))
+            alchemy = ExcelAlchemy(config)
+            result = await alchemy.import_data(input_excel_name=input_excel_name, output_excel_name='result.xlsx')
+            assert result.result == ValidateResult.DATA_INVALID
+            assert result.fail_count == 1
+            assert result.url is not None
+            assert len(alchemy.cell_errors[0]) == 12
+
+    async def test_validation_workers(self):
+        """在进程池中校验时, 导入结果与错误位置与在当前进程中校验一致; 导入结束后进程池关闭"""
+        results = []
+        for validation_workers in (None, 2):
+            config = ImporterConfig(
+                self.NoMergeHeaderImporter,
+                creator=self.creator,
+                minio=cast(Minio, self.minio),
+                validation_workers=validation_workers,
+            )
+            alchemy = ExcelAlchemy(config)
+            result = await alchemy.import_data(FileRegistry.TEST_SIMPLE_IMPORT_WITH_ERROR, 'result.xlsx')
+            results.append((result.result, result.success_count, result.fail_count, alchemy.cell_errors))
+
+        assert results[0] == results[1]
+        assert results[0][3]  # 存在单元格错误
+
+        assert not multiprocessing.active_children()  # 进程池只在一次导入中使用, 导入结束时已经关闭
+
+        # 提前终止时同样关闭进程池
+        config = ImporterConfig(
+            self.NoMergeHeaderImporter,
+            creator=self.creator,
+            minio=cast(Minio, self.minio),
+            validation_workers=2,
+            max_failed_rows=0,
+        )
+        result = await ExcelAlchemy(config).import_data(FileRegistry.TEST_SIMPLE_IMPORT_WITH_ERROR, 'result.xlsx')
+        assert result.is_aborted
+        assert not multiprocessing.active_children()
+        self.assertRaises(
+            ConfigError, ImporterConfig, self.NoMergeHeaderImporter, creator=self.creator, validation_workers=0
+        )
+
+    async def test_validate_data(self):
+        """只校验时不调用 creator, 错误与导入时一致"""
+        created: list[dict[str, Any]] = []
+
+        async def creator(data: dict[str, Any], context: Any) -> dict[str, Any]:
+            created.append(data)
+            return data
+
+        config = ImporterConfig(self.NoMergeHeaderImporter, creator=creator, minio=cast(Minio, self.minio))
+        alchemy = ExcelAlchemy(config)
+        result = await alchemy.validate_data(FileRegistry.TEST_SIMPLE_IMPORT_WITH_ERROR, 'validate_result.xlsx')
+        assert not created
+        assert result.result == ValidateResult.DATA_INVALID
+        assert result.url is not None
+
+        imported = ExcelAlchemy(config)
+        import_result = await imported.import_data(FileRegistry.TEST_SIMPLE_IMPORT_WITH_ERROR, 'result.xlsx')
+        assert (result.success_count, result.fail_count) == (import_result.success_count, import_result.fail_count)
+        assert alchemy.cell_errors == imported.cell_errors
+
+    async def test_column_projection(self):
+        """忽略导入的列与重新上传的导入结果列不会被解析"""
+
+        class Importer(BaseModel):
+            email: Email = FieldMeta(label='邮箱', order=1)
+            remark: String | None = FieldMeta(label='备注', order=2, ignore_import=True)
+
+        created: list[dict[str, Any]] = []
+
+        async def creator(data: dict[str, Any], context: Any) -> dict[str, Any]:
+            created.append(data)
+            return data
+
+        content = build_excel_content([['提示'], ['邮箱', '备注'], ['123', '无效邮箱'], ['noreply@example.com', '有效邮箱']])
+
+        config = ImporterConfig(Importer, creator=creator, minio=cast(Minio, self.minio))
+        alchemy = ExcelAlchemy(config)
+        result = await alchemy.import_data(content, 'projection_result.xlsx')
+        assert result.result == ValidateResult.DATA_INVALID
+        assert created == [{'email': 'noreply@example.com'}]
+        assert alchemy.cell_errors[0].keys() == {2}
+        assert alchemy.df.iloc[0].tolist()[-1] == '无效邮箱'  # 导入结果中保留忽略导入的列
+
+        # 修正导入结果后直接重新上传, 结果列与失败原因列被跳过
+        report = load_workbook(io.BytesIO(self.minio.storage['projection_result.xlsx']['data'].getvalue()))
+        report.active.cell(row=3, column=3).value = 'admin@example.com'
+        file = io.BytesIO()
+        report.save(file)
+
+        created.clear()
+        alchemy = ExcelAlchemy(config)
+        result = await alchemy.import_data(file.getvalue(), 'projection_result.xlsx')
+        assert result.result == ValidateResult.SUCCESS
+        assert created == [{'email': 'admin@example.com'}, {'email': 'noreply@example.com'}]
+        assert alchemy.input_excel_columns == ['邮箱', '备注']
+
+    async def test_error_budget(self):
+        """失败数据超出错误预算时提前终止, 导入结果只包含已经处理的行"""
+
+        class Importer(BaseModel):
+            email: Email = FieldMeta(label='邮箱', order=1)
+
+        created: list[dict[str, Any]] = []
+
+        async def creator(data: dict[str, Any], context: Any) -> dict[str, Any]:
+            created.append(data)
+            return data
+
+        emails = ['noreply@example.com', '1', '2', 'admin@example.com', '3', 'root@example.com']
+        content = build_excel_content([['提示'], ['邮箱'], *([x] for x in emails)])
+
+        config = ImporterConfig(Importer, creator=creator, minio=cast(Minio, self.minio), max_failed_rows=2)
+        alchemy = ExcelAlchemy(config)
+        result = await alchemy.import_data(content, 'budget_result.xlsx')
+        assert result.result == ValidateResult.DATA_INVALID
+        assert result.is_aborted
+        assert (result.success_count, result.fail_count) == (2, 3)
+        assert created == [{'email': 'noreply@example.com'}, {'email': 'admin@example.com'}]
+        assert len(alchemy.df) == 5
+
+        config = ImporterConfig(
+            Importer, creator=creator, minio=cast(Minio, self.minio), max_failure_ratio=0.5, failure_ratio_window=3
+        )
+        result = await ExcelAlchemy(config).validate_data(content, 'budget_result.xlsx')
+        assert result.is_aborted
+        assert (result.success_count, result.fail_count) == (1, 2)
+
+        config = ImporterConfig(Importer, creator=creator, minio=cast(Minio, self.minio), max_failed_rows=3)
+        result = await ExcelAlchemy(config).validate_data(content, 'budget_result.xlsx')
+        assert not result.is_aborted
+        assert (result.success_count, result.fail_count) == (3, 3)
+
+        self.assertRaises(ConfigError, ImporterConfig, Importer, creator=creator, max_failure_ratio=1)
+
+        # 一次统计多行结果时可能越过 failure_ratio_window, 失败比例仍然判断, 且只判断一次
+        config = ImporterConfig(
+            Importer, creator=creator, minio=cast(Minio, self.minio), max_failure_ratio=0.5, failure_ratio_window=3
+        )
+        pipeline = ImportPipeline(ExcelAlchemy(config))
+        pipeline.success_count, pipeline.fail_count = 1, 3
+        assert pipeline._exceeds_error_budget()
+        assert not pipeline._exceeds_error_budget()
+
+    async def test_error_budget_with_bulk(self):
+        """提前终止后不再写入剩余的批次, 这些行记为失败"""
+
+        class Importer(BaseModel):
+            email: Email = FieldMeta(label='邮箱', order=1)
+
+        batches: list[list[RowIndex]] = []
+
+        async def bulk_creator(rows: list[tuple[RowIndex, dict[str, Any]]], context: Any) -> list[Any]:
+            batches.append([row_index for row_index, _ in rows])
+            return [None] * len(rows)
+
+        emails = ['a@example.com', 'b@example.com', '1', '2', 'c@example.com']
+        content = build_excel_content([['提示'], ['邮箱'], *([x] for x in emails)])
+
+        config = ImporterConfig(
+            Importer, bulk_creator=bulk_creator, bulk_batch_size=3, max_failed_rows=1, minio=cast(Minio, self.minio)
+        )
+        alchemy = ExcelAlchemy(config)
+        result = await alchemy.import_data(content, 'bulk_budget_result.xlsx')
+        assert result.is_aborted
+        assert not batches  # 前两行的批次在提前终止时还没有写满, 不再写入
+        assert (result.success_count, result.fail_count) == (0, 4)
+        assert sorted(alchemy.row_errors) == [0, 1, 2, 3]
+        assert [str(x) for x in alchemy.row_errors[0]] == ['失败数据超出错误预算, 导入提前终止, 该行没有写入']
+        assert len(alchemy.df) == 4
+
+    async def test_cooperative_yield(self):
+        """DML 没有挂起时, 每处理 yield_interval_rows 行也会让出事件循环; 配置 executor 时结果不变"""
+
+        class Importer(BaseModel):
+            email: Email = FieldMeta(label='邮箱', order=1)
+
+        events: list[str] = []
+
+        async def creator(data: dict[str, Any], context: Any) -> dict[str, Any]:
+            events.append(data['email'])
+            return data
+
+        async def ticker():
+            while True:
+                events.append('tick')
+                await asyncio.sleep(0)
+
+        content = build_excel_content(
+            [['提示'], ['邮箱'], ['a@example.com'], ['b@example.com'], ['c@example.com'], ['123']]
+        )
+
+        config = ImporterConfig(Importer, creator=creator, minio=cast(Minio, self.minio), yield_interval_rows=2)
+        task = asyncio.create_task(ticker())
+        await asyncio.sleep(0)
+        result = await ExcelAlchemy(config).import_data(content, 'yield_result.xlsx')
+        task.cancel()
+        start = events.index('a@example.com')  # 预读的后台任务启动时也会让出事件循环
+        assert events[start : start + 3] == ['a@example.com', 'b@example.com', 'tick']
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            config = ImporterConfig(Importer, creator=creator, minio=cast(Minio, self.minio), executor=executor)
+            alchemy = ExcelAlchemy(config)
+            threaded_result = await alchemy.import_data(content, 'yield_result.xlsx')
+        assert threaded_result.result == result.result == ValidateResult.DATA_INVALID
+        assert (threaded_result.success_count, threaded_result.fail_count) == (3, 1)
+        assert threaded_result.url is not None
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            self.assertRaises(ConfigError, ImporterConfig, Importer, creator=creator, executor=pool)
+
+    async def test_validate_chunk_in_executor(self):
+        """配置 executor 时, 模型校验与 data_converter 按块在 executor 中执行, 结果与在事件循环中逐行校验一致"""
+
+        class Importer(BaseModel):
+            email: Email = FieldMeta(label='邮箱', order=1)
+
+            @root_validator
+            def record_thread(cls, values: dict[str, Any]) -> dict[str, Any]:
+                validated_threads.add(threading.current_thread().name)
+                return values
+
+        validated_threads: set[str] = set()
+        converted_threads: set[str] = set()
+        created: list[dict[str, Any]] = []
+
+        def data_converter(data: dict[str, Any]) -> dict[str, Any]:
+            converted_threads.add(threading.current_thread().name)
+            return {**data, 'converted': True}
+
+        async def creator(data: dict[str, Any], context: Any) -> Any:
+            created.append(data)
+
+        content = build_excel_content([['提示'], ['邮箱'], ['a@example.com'], ['123'], ['b@example.com']])
+        results = []
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix='validate') as executor:
+            for config_executor in (None, executor):
+                validated_threads.clear()
+                converted_threads.clear()
+                created.clear()
+                config = ImporterConfig(
+                    Importer,
+                    creator=creator,
+                    data_converter=data_converter,
+                    minio=cast(Minio, self.minio),
+                    executor=config_executor,
+                )
+                alchemy = ExcelAlchemy(config)
+                result = await alchemy.import_data(content, 'executor_result.xlsx')
+                results.append((result.success_count, result.fail_count, list(created), alchemy.cell_errors))
+                in_executor = {x.startswith('validate') for x in validated_threads | converted_threads}
+                assert in_executor == {config_executor is not None}
+
+            assert results[0] == results[1]
+            assert results[1][:3] == (
+                2,
+                1,
+                [{'email': x, 'converted': True} for x in ('a@example.com', 'b@example.com')],
+            )
+
+            # 错误预算提前终止时, 整块校验注册的后续行的错误被丢弃
+            config = ImporterConfig(
+                Importer, creator=creator, minio=cast(Minio, self.minio), executor=executor, max_failed_rows=0
+            )
+            alchemy = ExcelAlchemy(config)
+            content = build_excel_content([['提示'], ['邮箱'], ['1'], ['2'], ['c@example.com']])
+            result = await alchemy.import_data(content, 'executor_result.xlsx')
+            assert result.is_aborted
+            assert list(alchemy.cell_errors) == list(alchemy.row_errors) == [0]
+
+    async def test_dml_concurrency(self):
+        """并发调用 creator 时, 进行中的调用不超过上限, 错误记录在对应的行"""
+
+        class Importer(BaseModel):
+            email: Email = FieldMeta(label='邮箱', order=1)
+
+        in_flight, max_in_flight = 0, 0
+
+        async def creator(data: dict[str, Any], context: Any) -> dict[str, Any]:
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01 if data['email'].startswith('slow') else 0)
+            in_flight -= 1
+            if 'fail' in data['email']:
+                raise ValueError('写入失败')
+            return data
+
+        emails = ['slow@example.com', 'fail@example.com', '123', 'a@example.com', 'slow-fail@example.com']
+        content = build_excel_content([['提示'], ['邮箱'], *([x] for x in emails)])
+
+        config = ImporterConfig(Importer, creator=creator, minio=cast(Minio, self.minio), dml_concurrency=2)
+        alchemy = ExcelAlchemy(config)
+        result = await alchemy.import_data(content, 'concurrency_result.xlsx')
+        assert max_in_flight == 2
+        assert (result.success_count, result.fail_count) == (2, 3)
+        assert sorted(alchemy.row_errors) == [1, 2, 4]
+        assert [str(x) for x in alchemy.row_errors[1]] == ['写入失败']
+
+    async def test_upsert_single_pass(self):
+        """开启 single_pass_upsert 时每行只校验与转换一次, is_data_exist 与 creator/updater 接收同一份数据"""
+
+        class Importer(BaseModel):
+            email: Email = FieldMeta(label='邮箱', order=1)
+
+        class UpdateImporter(BaseModel):
+            email: Email = FieldMeta(label='邮箱', order=1)
+
+        converted: list[str] = []
+        checked: list[dict[str, Any]] = []
+        written: list[tuple[str, dict[str, Any]]] = []
+
+        def data_converter(data: dict[str, Any]) -> dict[str, Any]:
+            converted.append(data['email'])
+            return {**data, 'converted': True}
+
+        async def is_data_exist(data: dict[str, Any], context: Any) -> bool:
+            checked.append(data)
+            return data['email'].startswith('old')
+
+        async def creator(data: dict[str, Any], context: Any) -> Any:
+            written.append(('create', data))
+
+        async def updater(data: dict[str, Any], context: Any) -> Any:
+            written.append(('update', data))
+
+        content = build_excel_content([['提示'], ['邮箱'], ['old@example.com'], ['123'], ['new@example.com']])
+
+        def build_alchemy(single_pass_upsert: bool) -> ExcelAlchemy:
+            config = ImporterConfig(
+                create_importer_model=Importer,
+                update_importer_model=Importer,
+                data_converter=data_converter,
+                is_data_exist=is_data_exist,
+                creator=creator,
+                updater=updater,
+                minio=cast(Minio, self.minio),
+                import_mode=ImportMode.CREATE_OR_UPDATE,
+                single_pass_upsert=single_pass_upsert,
+            )
+            return ExcelAlchemy(config)
+
+        alchemy = build_alchemy(single_pass_upsert=True)
+        result = await alchemy.import_data(content, 'upsert_result.xlsx')
+        assert (result.success_count, result.fail_count) == (2, 1)
+        assert converted == ['old@example.com', 'new@example.com']  # 校验失败的行不转换, 也不判断是否存在
+        assert checked == [
+            {'email': 'old@example.com', 'converted': True},
+            {'email': 'new@example.com', 'converted': True},
+        ]
+        assert written == [('update', checked[0]), ('create', checked[1])]
+        assert list(alchemy.cell_errors[1]) == [2]
+
+        # 默认不开启: is_data_exist 接收只经过 data_converter 转换的原始数据, creator/updater 的数据按各自的模型校验并转换
+        converted.clear()
+        checked.clear()
+        written.clear()
+        alchemy = build_alchemy(single_pass_upsert=False)
+        result = await alchemy.import_data(content, 'upsert_result.xlsx')
+        assert (result.success_count, result.fail_count) == (2, 1)
+        assert [x['email'] for x in checked] == ['old@example.com', '123', 'new@example.com']
+        assert converted == ['old@example.com', 'old@example.com', '123', 'new@example.com', 'new@example.com']
+        assert written == [('update', checked[0]), ('create', checked[2])]
+        assert list(alchemy.cell_errors[1]) == [2]
+
+        self.assertRaises(ConfigError, ImporterConfig, Importer, creator=creator, single_pass_upsert=True)
+        self.assertRaises(
+            ConfigError,
+            ImporterConfig,
+            create_importer_model=Importer,
+            update_importer_model=UpdateImporter,
+            is_data_exist=is_data_exist,
+            import_mode=ImportMode.CREATE_OR_UPDATE,
+            single_pass_upsert=True,
+        )
+
+    async def test_upsert_single_pass_aborted(self):
+        """开启 single_pass_upsert 时整块预先校验, 提前终止后未处理的行不保留错误, 导入结果中也不标记"""
+
+        class Importer(BaseModel):
+            email: Email = FieldMeta(label='邮箱', order=1)
+
+        async def is_data_exist(data: dict[str, Any], context: Any) -> bool:
+            return False
+
+        async def creator(data: dict[str, Any], context: Any) -> Any:
+            return None
+
+        config = ImporterConfig(
+            create_importer_model=Importer,
+            update_importer_model=Importer,
+            is_data_exist=is_data_exist,
+            creator=creator,
+            updater=creator,
+            minio=cast(Minio, self.minio),
+            import_mode=ImportMode.CREATE_OR_UPDATE,
+            single_pass_upsert=True,
+            max_failed_rows=1,
+        )
+        content = build_excel_content([['提示'], ['邮箱'], ['1'], ['2'], ['3'], ['new@example.com']])
+        alchemy = ExcelAlchemy(config)
+        result = await alchemy.import_data(content, 'upsert_aborted_result.xlsx')
+        assert result.is_aborted
+        assert (result.success_count, result.fail_count) == (0, 2)
+        assert list(alchemy.cell_errors) == [0, 1]
+        assert list(alchemy.row_errors) == [0, 1]
+
+        report = load_workbook(io.BytesIO(self.minio.storage['upsert_aborted_result.xlsx']['data'].getvalue()))
+        colored_rows = {
+            cell.row
+            for row in report.active.iter_rows()
+            for cell in row
+            if cell.fill.fgColor.rgb.endswith(BACKGROUND_ERROR_COLOR)
+        }
+        assert colored_rows == {3, 4}
+        assert report.active.max_row == 4
+
+    async def test_prefetch_chunks(self):
+        """调用 DML 时后续的数据块已经在后台读取并校验; 提前终止时停止预读"""
+
+        class Importer(BaseModel):
+            email: Email = FieldMeta(label='邮箱', order=1)
+
+        reads: list[int] = []  # 每次读取的行数
+        reads_before_dml: list[int] = []  # 第一次调用 creator 时已经读取的块数
+
+        original_read_chunk = chunks.read_chunk
+
+        def read_chunk(rows):
+            chunk = original_read_chunk(rows)
+            reads.append(len(chunk))
+            return chunk
+
+        async def creator(data: dict[str, Any], context: Any) -> dict[str, Any]:
+            if not reads_before_dml:
+                reads_before_dml.append(len(reads))
+            await asyncio.sleep(0)
+            return data
+
+        content = build_excel_content([['提示'], ['邮箱'], ['123'], *([f'user{x}@example.com'] for x in range(599))])
+
+        for prefetch_chunks in (2, 0):
+            reads.clear()
+            reads_before_dml.clear()
+            config = ImporterConfig(
+                Importer, creator=creator, minio=cast(Minio, self.minio), prefetch_chunks=prefetch_chunks
+            )
+            with mock.patch('excelalchemy.core.chunks.read_chunk', read_chunk):
+                result = await ExcelAlchemy(config).import_data(content, 'prefetch_result.xlsx')
+            assert (result.success_count, result.fail_count) == (599, 1)
+            assert reads == [256, 256, 88, 0]
+            assert reads_before_dml == [3 if prefetch_chunks else 1]
+
+        reads.clear()
+        config = ImporterConfig(Importer, creator=creator, minio=cast(Minio, self.minio), max_failed_rows=0)
+        with mock.patch('excelalchemy.core.chunks.read_chunk', read_chunk):
+            result = await ExcelAlchemy(config).import_data(content, 'prefetch_result.xlsx')
+        assert result.is_aborted
+        assert (result.success_count, result.fail_count) == (0, 1)
+        assert len(reads) <= 3  # 预读的块数有上限, 提前终止后不再读取
+        self.assertRaises(ConfigError, ImporterConfig, Importer, creator=creator, prefetch_chunks=-1)
+
+    async def test_bulk_creator(self):
+        """批量创建函数按批接收数据, 每行的结果对应回行索引"""
+
+        class Importer(BaseModel):
+            email: Email = FieldMeta(label='邮箱', order=1)
+
+        batches: list[list[RowIndex]] = []
+
+        async def bulk_creator(rows: list[tuple[RowIndex, dict[str, Any]]], context: Any) -> list[Any]:
+            batches.append([row_index for row_index, _ in rows])
+            if any(data['email'] == 'down@example.com' for _, data in rows):
+                raise RuntimeError('服务不可用')
+            return [
+                ExcelCellError(label=Label('邮箱'), message='邮箱已存在') if data['email'] == 'dup@example.com' else None
+                for _, data in rows
+            ]
+
+        emails = ['a@example.com', 'dup@example.com', '123', 'b@example.com', 'down@example.com', 'c@example.com']
+        content = build_excel_content([['提示'], ['邮箱'], *([x] for x in emails)])
+
+        config = ImporterConfig(
+            Importer, bulk_creator=bulk_creator, bulk_batch_size=2, minio=cast(Minio, self.minio), dml_concurrency=2
+        )
+        alchemy = ExcelAlchemy(config)
+        result = await alchemy.import_data(content, 'bulk_result.xlsx')
+        assert batches == [[0, 1], [3, 4], [5]]  # 校验失败的行不传给批量函数
+        assert (result.success_count, result.fail_count) == (2, 4)
+        assert sorted(alchemy.row_errors) == [1, 2, 3, 4]
+        assert [str(x) for x in alchemy.row_errors[1]] == ['【邮箱】邮箱已存在']
+        assert list(alchemy.cell_errors[1]) == [2]  # ExcelCellError 标记对应的单元格
+        assert [str(x) for x in alchemy.row_errors[3]] == ['服务不可用']
+
+        self.assertRaises(ConfigError, ImporterConfig, Importer, bulk_updater=bulk_creator)
+
+    async def test_creator_cell_error(self):
+        """逐行调用 creator 时, 抛出的 ExcelCellError 与其他异常一样只记录在行上, 不标记单元格"""
+
+        class Importer(BaseModel):
+            email: Email = FieldMeta(label='邮箱', order=1)
+
+        async def creator(data: dict[str, Any], context: Any) -> Any:
+            if data['email'] == 'dup@example.com':
+                raise ExcelCellError(label=Label('邮箱'), message='邮箱已存在')
+            if data['email'] == 'down@example.com':
+                raise RuntimeError('服务不可用')
+            return data
+
+        content = build_excel_content([['提示'], ['邮箱'], ['a@example.com'], ['dup@example.com'], ['down@example.com']])
+
+        alchemy = ExcelAlchemy(ImporterConfig(Importer, creator=creator, minio=cast(Minio, self.minio)))
+        result = await alchemy.import_data(content, 'creator_cell_error_result.xlsx')
+        assert (result.success_count, result.fail_count) == (1, 2)
+        assert [str(x) for x in alchemy.row_errors[1]] == ['【邮箱】邮箱已存在']
+        assert [str(x) for x in alchemy.row_errors[2]] == ['服务不可用']
+        assert not alchemy.cell_errors
+
+    async def test_are_data_exist(self):
+        """创建或更新模式下按块批量判断数据是否存在, 不再逐行调用 is_data_exist"""
+
+        class Importer(BaseModel):
+            email: Email = FieldMeta(label='邮箱', order=1)
+
+        lookups: list[list[str]] = []
+        created: list[str] = []
+        updated: list[str] = []
+
+        async def are_data_exist(rows: list[dict[str, Any]], context: Any) -> list[bool]:
+            lookups.append([data['email'] for data in rows])
+            return [data['email'].startswith('old') for data in rows]
+
+        async def creator(data: dict[str, Any], context: Any) -> Any:
+            created.append(data['email'])
+
+        async def updater(data: dict[str, Any], context: Any) -> Any:
+            updated.append(data['email'])
+
+        emails = ['old1@example.com', 'new1@example.com', 'old2@example.com', 'new2@example.com']
+        content = build_excel_content([['提示'], ['邮箱'], *([x] for x in emails)])
+
+        config = ImporterConfig(
+            create_importer_model=Importer,
+            update_importer_model=Importer,
+            are_data_exist=are_data_exist,
+            creator=creator,
+            updater=updater,
+            minio=cast(Minio, self.minio),
+            import_mode=ImportMode.CREATE_OR_UPDATE,
+        )
+        result = await ExcelAlchemy(config).import_data(content, 'exist_result.xlsx')
+        assert result.result == ValidateResult.SUCCESS
+        assert lookups == [emails]  # 一块数据只查询一次
+        assert created == ['new1@example.com', 'new2@example.com']
+        assert updated == ['old1@example.com', 'old2@example.com']
+
+        async def wrong_length(rows: list[dict[str, Any]], context: Any) -> list[bool]:
+            return [True]
+
+        config.are_data_exist = wrong_length
+        with self.assertRaises(ProgrammaticError):
+            await ExcelAlchemy(config).import_data(content, 'exist_result.xlsx')
+
+    async def test_iter_rows(self):
+        """调用方逐行取得校验后的数据, 自行写入并报告失败的行"""
+
+        class Importer(BaseModel):
+            email: Email = FieldMeta(label='邮箱', order=1)
+
+        content = build_excel_content([['提示'], ['邮箱'], ['noreply@example.com'], ['123'], ['admin@example.com']])
+
+        config = ImporterConfig(Importer, creator=self.creator, minio=cast(Minio, self.minio))
+        alchemy = ExcelAlchemy(config)
+        batch: list[tuple[RowIndex, dict[str, Any]]] = []
+        async with alchemy.iter_rows(content, 'stream_result.xlsx') as rows:
+            async for row_index, data in rows:
+                if isinstance(data, dict):
+                    batch.append((row_index, data))
+            assert batch == [(0, {'email': 'noreply@example.com'}), (2, {'email': 'admin@example.com'})]
+            rows.report_error(batch[1][0], ValueError('邮箱已存在'))
+
+        assert rows.result is not None
+        assert rows.result.result == ValidateResult.DATA_INVALID
+        assert (rows.result.success_count, rows.result.fail_count) == (1, 2)
+        assert not rows.result.is_aborted
+        assert alchemy.df.iloc[:, 0].tolist() == ['校验通过', '校验不通过', '校验不通过']
+
+        # 提前停止迭代时, 导入结果只包含已经返回的行
+        alchemy = ExcelAlchemy(config)
+        async with alchemy.iter_rows(content, 'stream_result.xlsx') as rows:
+            async for row_index, data in rows:
+                rows.report_error(row_index, ValueError('写入失败'))
+                break
+        assert rows.result is not None
+        assert rows.result.is_aborted
+        assert (rows.result.success_count, rows.result.fail_count) == (0, 1)
+        assert len(alchemy.df) == 1
+        assert not alchemy.cell_errors  # 整块校验时已经注册的后续行的错误被丢弃
+        assert list(alchemy.row_errors) == [0]
+
+        # 同一行报告多次只计为一行失败数据, 不能报告还没有返回的行
+        alchemy = ExcelAlchemy(config)
+        async with alchemy.iter_rows(content, 'stream_result.xlsx') as rows:
+            async for row_index, data in rows:
+                with self.assertRaises(ConfigError):
+                    rows.report_error(RowIndex(row_index + 1), ValueError('写入失败'))
+                rows.report_error(row_index, ValueError('写入失败'))
+                rows.report_error(row_index, ValueError('写入失败'))
+                break
+        assert rows.result is not None
+        assert (rows.result.success_count, rows.result.fail_count) == (0, 1)
+        assert [str(x) for x in alchemy.row_errors[0]] == ['写入失败', '写入失败']
+
+        # 没有迭代时不视为提前终止
+        async with ExcelAlchemy(config).iter_rows(content, 'stream_result.xlsx') as rows:
+            pass
+        assert rows.result is not None
+        assert rows.result.result == ValidateResult.SUCCESS
+        assert not rows.result.is_aborted
+
+    async def test_iter_batches(self):
+        """按列返回校验通过的数据, 复合字段按子字段展开"""
+
+        class Importer(BaseModel):
+            email: Email = FieldMeta(label='邮箱', order=1)
+            salary: NumberRange | None = FieldMeta(label='薪资', order=2)
+
+        rows = [
+            ['提示'],
+            ['邮箱', '薪资', None],
+            [None, '最小值', '最大值'],
+            ['noreply@example.com', '100', '200'],
+            ['123', None, None],
+            ['admin@example.com', None, None],
+            ['root@example.com', '300', '400'],
+        ]
+        content = build_excel_content(rows, merged_cells=['A2:A3', 'B2:C2'])
+
+        config = ImporterConfig(Importer, creator=self.creator, minio=cast(Minio, self.minio))
+        alchemy = ExcelAlchemy(config)
+        async with alchemy.iter_rows(content, 'batch_result.xlsx') as stream:
+            batches = [batch async for batch in stream.iter_batches(batch_size=2)]
+
+        assert [batch.index.tolist() for batch in batches] == [[1, 3], [4]]
+        assert batches[0].columns.tolist() == ['email', 'salary·start', 'salary·end']
+        assert batches[0]['email'].tolist() == ['noreply@example.com', 'admin@example.com']
+        assert batches[0]['salary·start'].tolist() == [100, None]
+        assert batches[0]['salary·start'].dtype == object  # 含有空值的列保留原值
+        assert batches[1]['salary·start'].dtype.kind in 'iuf'  # 没有空值的数值列为原生类型
+        assert stream.result is not None
+        assert (stream.result.success_count, stream.result.fail_count) == (3, 1)
+
     async def test_no_merge_header_export(self):
         config = ExporterConfig(self.NoMergeHeaderImporter, minio=cast(Minio, self.minio))
         alchemy = ExcelAlchemy(config)
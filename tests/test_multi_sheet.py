@@ -0,0 +1,140 @@
+import io
+from concurrent.futures import Executor
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from typing import cast
+
+from minio import Minio
+from openpyxl import Workbook
+from openpyxl import load_workbook
+from pydantic import BaseModel
+
+from excelalchemy import ConfigError
+from excelalchemy import Email
+from excelalchemy import FieldMeta
+from excelalchemy import ImporterConfig
+from excelalchemy import MultiSheetExcelAlchemy
+from excelalchemy import Number
+from excelalchemy import String
+from excelalchemy import ValidateResult
+from excelalchemy.const import HEADER_HINT
+from excelalchemy.const import RESULT_COLUMN_LABEL
+from tests import BaseTestCase
+
+
+class TestMultiSheetImport(BaseTestCase):
+    class StaffImporter(BaseModel):
+        name: String = FieldMeta(label='姓名', order=1)
+        email: Email = FieldMeta(label='邮箱', order=2)
+
+    class DepartmentImporter(BaseModel):
+        name: String = FieldMeta(label='部门名称', order=1)
+        size: Number = FieldMeta(label='人数', order=2)
+
+    def put_workbook(self, filename: str, sheets: dict[str, list[list[Any]]]) -> None:
+        workbook = Workbook()
+        workbook.remove(workbook.active)
+        for sheet_name, rows in sheets.items():
+            worksheet = workbook.create_sheet(sheet_name)
+            for row in [[HEADER_HINT]] + rows:
+                worksheet.append(row)
+        file = io.BytesIO()
+        workbook.save(file)
+        self.minio.put_object(self.minio.bucket_name, filename, io.BytesIO(file.getvalue()), len(file.getvalue()))
+
+    def build_multi_sheet_alchemy(
+        self, created: dict[str, list[dict[str, Any]]], executor: Executor | None = None
+    ) -> MultiSheetExcelAlchemy[Any]:
+        def creator_of(sheet_name: str):
+            async def creator(data: dict[str, Any], context: Any) -> dict[str, Any]:
+                created.setdefault(sheet_name, []).append(data)
+                return data
+
+            return creator
+
+        return MultiSheetExcelAlchemy(
+            [
+                ImporterConfig(
+                    importer,
+                    creator=creator_of(sheet_name),
+                    minio=cast(Minio, self.minio),
+                    sheet_name=sheet_name,
+                    executor=executor,
+                )
+                for sheet_name, importer in (('员工', self.StaffImporter), ('部门', self.DepartmentImporter))
+            ]
+        )
+
+    async def test_import_multi_sheet(self):
+        self.put_workbook(
+            'multi_sheet.xlsx',
+            {
+                '部门': [['部门名称', '人数'], ['研发部', 10], ['市场部', 5]],
+                '员工': [['姓名', '邮箱'], ['张三', 'zhangsan@example.com']],
+            },
+        )
+        created: dict[str, list[dict[str, Any]]] = {}
+        result = await self.build_multi_sheet_alchemy(created).import_data('multi_sheet.xlsx', 'result.xlsx')
+
+        assert result.result == ValidateResult.SUCCESS
+        assert result.success_count == 3
+        assert result.sheets['员工'].success_count == 1
+        assert result.sheets['部门'].success_count == 2
+        assert result.url is None
+        assert [x['name'] for x in created['部门']] == ['研发部', '市场部']
+
+    async def test_import_multi_sheet_with_errors(self):
+        self.put_workbook(
+            'multi_sheet_with_errors.xlsx',
+            {
+                '员工': [['姓名', '邮箱'], ['张三', '123'], ['李四', 'lisi@example.com']],
+                '部门': [['部门名称', '人数'], ['研发部', 10]],
+            },
+        )
+        submitted: list[str] = []
+
+        class CountingExecutor(ThreadPoolExecutor):
+            def submit(self, fn, /, *args, **kwargs):
+                submitted.append(getattr(fn, '__name__', ''))
+                return super().submit(fn, *args, **kwargs)
+
+        with CountingExecutor(max_workers=2) as executor:
+            alchemy = self.build_multi_sheet_alchemy({}, executor)
+            result = await alchemy.import_data('multi_sheet_with_errors.xlsx', 'multi_sheet_result.xlsx')
+        # 配置的 executor 用于校验表头、读取数据、渲染与上传导入结果
+        expected = {'_validate_header', 'aggregate_chunk', 'render_multi_sheet_data_excel', '_upload_file'}
+        assert expected <= set(submitted)
+
+        assert result.result == ValidateResult.DATA_INVALID
+        assert result.sheets['员工'].result == ValidateResult.DATA_INVALID
+        assert result.sheets['部门'].result == ValidateResult.SUCCESS
+        assert (result.success_count, result.fail_count) == (2, 1)
+        assert alchemy.alchemies['员工'].cell_errors[0].keys() == {3}
+
+        content = self.minio.storage['multi_sheet_result.xlsx']['data'].getvalue()
+        workbook = load_workbook(io.BytesIO(content))
+        assert workbook.sheetnames == ['员工']  # 只包含存在失败数据的 Sheet
+        assert workbook['员工'].cell(row=2, column=1).value == RESULT_COLUMN_LABEL
+
+    async def test_import_multi_sheet_header_invalid(self):
+        self.put_workbook(
+            'multi_sheet_header_invalid.xlsx',
+            {
+                '员工': [['姓名', '邮箱'], ['张三', 'zhangsan@example.com']],
+                '部门': [['部门', '人数'], ['研发部', 10]],
+            },
+        )
+        created: dict[str, list[dict[str, Any]]] = {}
+        result = await self.build_multi_sheet_alchemy(created).import_data(
+            'multi_sheet_header_invalid.xlsx', 'result.xlsx'
+        )
+
+        assert result.result == ValidateResult.HEADER_INVALID
+        assert list(result.sheets) == ['部门']
+        assert result.sheets['部门'].unrecognized == ['部门']
+        assert not created  # 任一 Sheet 表头错误时不导入任何数据
+
+    async def test_duplicated_sheet_name(self):
+        config = ImporterConfig(self.StaffImporter, creator=self.fake_creator, minio=cast(Minio, self.minio))
+        self.assertRaises(ConfigError, MultiSheetExcelAlchemy, [config, config])
+        self.assertRaises(ConfigError, MultiSheetExcelAlchemy, [])
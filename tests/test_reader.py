@@ -0,0 +1,157 @@
+import csv
+import datetime
+import io
+from tempfile import TemporaryFile
+from typing import IO
+from typing import Any
+from unittest import TestCase
+
+import pandas
+from openpyxl import Workbook
+
+from excelalchemy.core.reader import ENCODING_DETECT_SAMPLE_SIZE
+from excelalchemy.core.reader import CsvReader
+from excelalchemy.core.reader import OpenpyxlReader
+from excelalchemy.core.reader import XmlReader
+from excelalchemy.core.reader import probe_header
+from excelalchemy.core.sheet_xml import NA_VALUES
+from excelalchemy.exc import ConfigError
+from tests import build_excel_content
+
+
+def build_excel_file(rows: list[list[Any]]) -> IO[bytes]:
+    return io.BytesIO(build_excel_content(rows))
+
+
+class TestExcelReader(TestCase):
+    rows: list[list[Any]] = [
+        ['hint'],
+        ['名称', '数量', '日期'],
+        ['张三', 1, datetime.datetime(2021, 1, 1)],
+        [],
+        [None, 2.5, True],
+        ['NA', 3.0, None, None, 'out of header'],
+        [],
+        [],
+    ]
+
+    def test_iter_rows_same_as_pandas(self):
+        with build_excel_file(self.rows) as file:
+            expected = pandas.read_excel(file, sheet_name='Sheet1', skiprows=1, header=None, dtype=str)
+            expected = expected.iloc[:, :3].astype(object).where(expected.iloc[:, :3].notna(), None)
+
+            with OpenpyxlReader(file, 'Sheet1', skip_rows=1) as reader:
+                assert list(reader.iter_rows()) == expected.values.tolist()
+
+    def test_read_header(self):
+        with build_excel_file(self.rows) as file, OpenpyxlReader(file, 'Sheet1', skip_rows=1) as reader:
+            assert reader.read_header() == [['名称', '数量', '日期'], ['张三', '1', '2021-01-01 00:00:00']]
+            assert reader.column_count == 3
+
+    def test_probe_header_same_as_reader(self):
+        rows = [['hint'], ['日期范围', None, '数量'], [None, '开始日期', 1.0, None], ['2021-01-01', '2021-02-01', 2]]
+        with build_excel_file(rows) as file:
+            with OpenpyxlReader(file, 'Sheet1', skip_rows=1) as reader:
+                expected = reader.read_header()
+
+            assert probe_header(file, 'Sheet1', skip_rows=1) == expected
+            assert probe_header(file, 'Sheet1', skip_rows=1, row_count=1) == [['日期范围', None, '数量']]
+
+    def test_xml_reader_same_as_openpyxl(self):
+        rows = self.rows + [
+            [datetime.date(2021, 1, 2), datetime.time(8, 30), '#N/A', 1e20, -0.5],
+            ['last', None, None],
+        ]
+        with build_excel_file(rows) as file:
+            with OpenpyxlReader(file, 'Sheet1', skip_rows=1) as reader:
+                expected_header = reader.read_header()
+                expected_rows = list(reader.iter_rows())
+
+            with XmlReader(file, 'Sheet1', skip_rows=1) as reader:
+                assert reader.read_header() == expected_header
+                assert list(reader.iter_rows()) == expected_rows
+
+    def test_na_values_same_as_pandas(self):
+        rows = [['hint'], [*sorted(NA_VALUES), 'NAN', 'none', 'n/a ']]
+        with build_excel_file(rows) as file:
+            expected = pandas.read_excel(file, sheet_name='Sheet1', skiprows=1, header=None, dtype=str)
+            expected = expected.astype(object).where(expected.notna(), None)
+
+            with XmlReader(file, 'Sheet1', skip_rows=1) as reader:
+                assert list(reader.iter_rows()) == expected.values.tolist()
+
+    def test_csv_reader(self):
+        rows = [['hint\n第二行'], ['名称', '数量', '备注'], ['张三', '1', ''], [], ['NA', '2.5', '逗号,引号"'], ['', '', '']]
+        expected = [['名称', '数量', '备注'], ['张三', '1', None], [None, None, None], [None, '2.5', '逗号,引号"']]
+        for delimiter, encoding in ((',', 'utf-8'), (',', 'utf-8-sig'), (',', 'gb18030'), ('\t', 'utf-16')):
+            text = io.StringIO(newline='')
+            csv.writer(text, delimiter=delimiter).writerows(rows)
+            file = io.BytesIO(text.getvalue().encode(encoding))
+
+            with CsvReader(file, 'Sheet1', skip_rows=1, delimiter=delimiter) as reader:
+                assert reader.encoding == encoding
+                assert list(reader.iter_rows()) == expected
+            assert not file.closed
+
+    def test_csv_encoding_after_sample(self):
+        """文件开头只有 ASCII 字符时检测为 UTF-8, 读到 GB18030 字符时切换编码继续读取"""
+        padding = ['a' * 99] * (ENCODING_DETECT_SAMPLE_SIZE // 100 + 1)
+        content = '\n'.join(['hint', 'name', *padding, '张三', '李四']).encode('gb18030')
+        with CsvReader(io.BytesIO(content), 'Sheet1', skip_rows=1) as reader:
+            assert reader.encoding == 'utf-8'
+            rows = list(reader.iter_rows())
+            assert reader.encoding == 'gb18030'
+        assert rows == [['name'], *([x] for x in padding), ['张三'], ['李四']]
+
+        # 已经读取的行中有 UTF-8 字符时, 无法确定文件的编码
+        content = ('名称\n' + '\n'.join(padding)).encode() + '\n张三'.encode('gb18030')
+        with CsvReader(io.BytesIO(content), 'Sheet1') as reader:
+            assert reader.encoding == 'utf-8'
+            self.assertRaises(ConfigError, list, reader.iter_rows())
+
+    def test_stop_at_phantom_empty_rows(self):
+        workbook = Workbook()
+        worksheet = workbook.active
+        worksheet.title = 'Sheet1'
+        for row in [['hint'], ['名称'], ['张三'], [], ['李四']]:
+            worksheet.append(row)
+        worksheet.cell(row=200000, column=16384).number_format = '@'  # 只有格式的单元格, 维度被撑大
+        worksheet.cell(row=300000, column=1).value = '被忽略'
+        file = TemporaryFile()
+        workbook.save(file)
+
+        with file:
+            for reader_class in (OpenpyxlReader, XmlReader):
+                with reader_class(file, 'Sheet1', skip_rows=1, max_empty_rows=100) as reader:
+                    assert list(reader.iter_rows()) == [['名称'], ['张三'], [None], ['李四']]
+                with reader_class(file, 'Sheet1', skip_rows=1, max_empty_rows=1) as reader:
+                    assert list(reader.iter_rows()) == [['名称'], ['张三']]
+
+    def test_typed_rows(self):
+        rows = [
+            ['hint'],
+            ['名称', '数量', '日期', '启用'],
+            ['张三', 1, datetime.datetime(2021, 1, 1, 8, 30), True],
+            ['NA', 2.5, '2021-01-02', False],
+        ]
+        expected = [
+            ['名称', '数量', '日期', '启用'],
+            ['张三', 1, datetime.datetime(2021, 1, 1, 8, 30), True],
+            [None, 2.5, '2021-01-02', False],
+        ]
+        with build_excel_file(rows) as file:
+            for reader_class in (OpenpyxlReader, XmlReader):
+                with reader_class(file, 'Sheet1', skip_rows=1, typed=True) as reader:
+                    assert list(reader.iter_rows()) == expected
+
+    def test_read_selected_columns(self):
+        rows = [['hint'], ['名称', '数量', '备注'], ['张三', 1, '忽略'], [None, None, '只有忽略的列有值'], ['李四', 2]]
+        expected = [['数量', '名称'], ['1', '张三'], [None, None], ['2', '李四']]
+        with build_excel_file(rows) as file:
+            for reader_class in (OpenpyxlReader, XmlReader):
+                with reader_class(file, 'Sheet1', skip_rows=1, column_count=3, columns=[1, 0]) as reader:
+                    assert list(reader.iter_rows()) == expected
+
+        content = '\n'.join(','.join('' if x is None else str(x) for x in row) for row in rows).encode()
+        with CsvReader(io.BytesIO(content), 'Sheet1', skip_rows=1, column_count=3, columns=[1, 0]) as reader:
+            assert list(reader.iter_rows()) == expected
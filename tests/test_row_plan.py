@@ -0,0 +1,105 @@
+from unittest import TestCase
+
+from pydantic import BaseModel
+from pydantic import validator
+
+from excelalchemy import FieldMeta
+from excelalchemy import Number
+from excelalchemy import NumberRange
+from excelalchemy import String
+from excelalchemy.core.row_plan import RowPlan
+from excelalchemy.helper.pydantic import build_validated_data
+from excelalchemy.helper.pydantic import extract_pydantic_model
+from excelalchemy.helper.pydantic import get_column_validated_keys
+from excelalchemy.types.abstract import ValidatedCell
+
+
+class TestRowPlan(TestCase):
+    class Importer(BaseModel):
+        name: String = FieldMeta(label='名称', order=1)
+        age: Number = FieldMeta(label='年龄', order=2)
+        salary: NumberRange = FieldMeta(label='薪资', order=3)
+
+    def compile(self, keep_missing: bool, validated_keys: set | None = None) -> RowPlan:
+        field_metas = extract_pydantic_model(self.Importer)
+        parent_key_to_field_metas: dict = {}
+        for field_meta in field_metas:
+            parent_key_to_field_metas.setdefault(field_meta.parent_key, []).append(field_meta)
+        return RowPlan.compile(field_metas, parent_key_to_field_metas, keep_missing, validated_keys or set())
+
+    def test_aggregate(self):
+        plan = self.compile(keep_missing=False)
+        assert [x.position for x in plan.slots] == [0, 1, 2, 3]
+        row = ['张三', '18', '100', '200']
+        assert plan.aggregate(row) == {'name': '张三', 'age': 18, 'salary': NumberRange(100, 200)}
+        assert plan.aggregate([None, float('nan'), None, '200']) == {'salary': {'end': '200'}}  # 序列化失败时返回原值
+        assert plan.aggregate([None, None, None, None]) == {}
+
+    def test_keep_missing(self):
+        plan = self.compile(keep_missing=True)
+        assert plan.aggregate([None, None, None, None]) == {
+            'name': None,
+            'age': None,
+            'salary': NumberRange(None, None),
+        }
+
+    def test_validate_columns(self):
+        plan = self.compile(keep_missing=False, validated_keys=get_column_validated_keys(self.Importer))
+        records = plan.aggregate_many([['张三', '18', '1', '2'], ['李四', 'abc', '1', '2']])
+        assert all(isinstance(x['age'], ValidatedCell) for x in records)
+        assert records[0]['age'].unwrap() == 18
+        self.assertRaises(ValueError, records[1]['age'].unwrap)
+        assert self.Importer.parse_obj(records[0]).age == 18
+
+    def test_cell_cache(self):
+        field_metas = extract_pydantic_model(self.Importer)
+        parent_key_to_field_metas: dict = {}
+        for field_meta in field_metas:
+            parent_key_to_field_metas.setdefault(field_meta.parent_key, []).append(field_meta)
+        validated_keys = get_column_validated_keys(self.Importer)
+        plan = RowPlan.compile(field_metas, parent_key_to_field_metas, False, validated_keys, cache_size=2)
+
+        records = plan.aggregate_many([['张三', '18', '1', '2'], ['张三', 'abc', '1', '2'], ['李四', 'abc', '1', '2']])
+        assert records[0]['age'].unwrap() == 18
+        self.assertRaises(ValueError, records[1]['age'].unwrap)
+        self.assertRaises(ValueError, records[2]['age'].unwrap)
+        assert records[1]['age'] is not records[2]['age']  # 命中缓存时每行返回新的 ValidatedCell
+        assert plan.cache_stats() == {'name': (1, 2), 'age': (1, 2)}  # 复合字段不缓存
+
+        plan.aggregate_many([['王五', '20', '1', '2'], ['张三', '18', '1', '2']])
+        assert plan.cache_stats()['name'] == (2, 3)
+        plan.aggregate_many([['李四', '18', '1', '2']])
+        assert plan.cache_stats()['name'] == (2, 4)  # 超出容量时淘汰最久未使用的值
+
+    def test_column_validated_keys(self):
+        class Importer(BaseModel):
+            name: String = FieldMeta(label='名称', order=1)
+            age: Number | None = FieldMeta(label='年龄', order=2)
+            salary: NumberRange = FieldMeta(label='薪资', order=3)
+            code: String = FieldMeta(label='编码', order=4)
+
+            @validator('code')
+            def check_code(cls, value: str) -> str:
+                return value
+
+        assert get_column_validated_keys(Importer) == {'name', 'age'}  # 复合字段与自定义校验的字段不预先校验
+
+    def test_build_validated_data(self):
+        class Importer(BaseModel):
+            name: String = FieldMeta(label='名称', order=1)
+            age: Number | None = FieldMeta(label='年龄', order=2)
+
+        assert build_validated_data({'name': ValidatedCell('张三'), 'age': None}, Importer) == {
+            'name': '张三',
+            'age': None,
+        }
+        assert build_validated_data({'age': ValidatedCell(18)}, Importer) is None  # 缺少必填字段
+        assert build_validated_data({'name': ValidatedCell('张三', ValueError('错误'))}, Importer) is None
+        assert build_validated_data({'name': '张三'}, Importer) is None  # 没有按列校验
+
+        class ImporterWithValidator(Importer):
+            @validator('age')
+            def check_age(cls, value: int) -> int:
+                return value
+
+        assert build_validated_data({'name': ValidatedCell('张三')}, ImporterWithValidator) is None
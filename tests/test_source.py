@@ -0,0 +1,100 @@
+import io
+import threading
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import cast
+
+from minio import Minio
+from openpyxl import Workbook
+from pydantic import BaseModel
+
+from excelalchemy import BytesSource
+from excelalchemy import ConfigError
+from excelalchemy import ExcelAlchemy
+from excelalchemy import FieldMeta
+from excelalchemy import FileSource
+from excelalchemy import ImporterConfig
+from excelalchemy import MinioSource
+from excelalchemy import PathSource
+from excelalchemy import String
+from excelalchemy import ValidateResult
+from excelalchemy.core.source import SharedFileView
+from excelalchemy.core.source import to_import_source
+from tests import BaseTestCase
+from tests.registry import FileRegistry
+
+
+class TestImportSource(BaseTestCase):
+    class Importer(BaseModel):
+        email: String = FieldMeta(label='邮箱', order=1)
+
+    @property
+    def content(self) -> bytes:
+        return self.minio.get_object(self.minio.bucket_name, FileRegistry.TEST_EMAIL_CORRECT_FORMAT).getvalue()
+
+    async def test_import_without_minio(self):
+        with TemporaryDirectory() as directory:
+            path = Path(directory) / 'input.xlsx'
+            path.write_bytes(self.content)
+            file = io.BytesIO(self.content)
+
+            for source in (self.content, path, file, BytesSource(self.content), PathSource(str(path))):
+                alchemy = self.build_alchemy(self.Importer)
+                result = await alchemy.import_data(source, 'result.xlsx')
+                assert result.result == ValidateResult.SUCCESS
+                assert result.success_count == 1
+
+            assert not file.closed  # 调用方传入的文件对象不会被关闭
+
+    async def test_import_csv_bytes(self):
+        alchemy = self.build_alchemy(self.Importer)
+        content = '提示\n邮箱\nnoreply@example.com\n'.encode()
+        result = await alchemy.import_data(BytesSource(content, name='input.csv'), 'result.xlsx')
+        assert result.result == ValidateResult.SUCCESS
+        assert result.success_count == 1
+
+    def test_to_import_source(self):
+        minio = cast(Minio, self.minio)
+        assert isinstance(to_import_source('input.xlsx', minio, 'excel'), MinioSource)
+        assert isinstance(to_import_source(b'', minio, 'excel'), BytesSource)
+        assert isinstance(to_import_source(Path('input.xlsx'), minio, 'excel'), PathSource)
+        assert to_import_source(io.BytesIO(), minio, 'excel').name == ''
+        assert isinstance(to_import_source(io.BytesIO(), minio, 'excel'), FileSource)
+        self.assertRaises(ConfigError, to_import_source, 1, minio, 'excel')
+
+    def test_shared_file_view(self):
+        """每个视图有独立的读取位置, 互不影响"""
+        file, lock = io.BytesIO(b'0123456789'), threading.Lock()
+        first, second = SharedFileView(file, lock), SharedFileView(file, lock)
+        assert first.read(3) == b'012'
+        assert second.read(2) == b'01'
+        assert first.read(2) == b'34'
+        assert second.seek(-3, io.SEEK_END) == 7
+        assert second.read() == b'789'
+        assert first.tell() == 5
+        assert io.BufferedReader(first).read() == b'56789'
+
+    async def test_interior_empty_rows(self):
+        """中间的空行与其他数据一样校验; 设置 max_empty_rows 后末尾连续的空行不再读取"""
+        workbook = Workbook()
+        workbook.active.title = 'Sheet1'
+        for row in [['提示'], ['邮箱'], ['noreply@example.com'], [], ['admin@example.com']]:
+            workbook.active.append(row)
+        workbook.active.cell(row=100000, column=1).number_format = '@'
+        file = io.BytesIO()
+        workbook.save(file)
+
+        for max_empty_rows in (None, 1000):
+            alchemy = ExcelAlchemy(
+                ImporterConfig(
+                    self.Importer,
+                    creator=self.fake_creator,
+                    minio=cast(Minio, self.minio),
+                    max_empty_rows=max_empty_rows,
+                )
+            )
+            result = await alchemy.import_data(file.getvalue(), 'result.xlsx')
+            assert result.result == ValidateResult.DATA_INVALID
+            assert (result.success_count, result.fail_count) == (2, 1)
+            assert list(alchemy.cell_errors) == [1]  # 中间的空行缺少必填项
+            assert len(alchemy.df) == 3
@@ -1,4 +1,9 @@
+import io
+from tempfile import SpooledTemporaryFile
+from typing import Any
+from typing import cast
 from unittest import IsolatedAsyncioTestCase
+from unittest import mock
 
 from pydantic import BaseModel
 
@@ -9,6 +14,23 @@ from excelalchemy import String
 from excelalchemy import extract_pydantic_model
 from excelalchemy.util.convertor import export_data_converter
 from excelalchemy.util.convertor import import_data_converter
+from excelalchemy.util.file import construct_file_like_object
+
+
+class FakeResponse(io.BytesIO):
+    released = False
+
+    def release_conn(self) -> None:
+        self.released = True
+
+
+class BrokenResponse(FakeResponse):
+    """读取到一半时连接中断"""
+
+    def read(self, size: int | None = -1) -> bytes:
+        if self.tell():
+            raise ConnectionResetError
+        return super().read(size)
 
 
 class TestUtil(IsolatedAsyncioTestCase):
@@ -45,3 +67,26 @@ class TestUtil(IsolatedAsyncioTestCase):
         input_data = {'name': 'name', 'address': 'address', 'field_data': {'ID': 'id', 'Name': 'name'}}
         expected = {'address': 'address', 'fieldData.ID': 'id', 'fieldData.Name': 'name', 'name': 'name'}
         assert export_data_converter(input_data, to_camel=True) == expected
+
+    @classmethod
+    def test_construct_file_like_object(cls):
+        content = b'excel' * 1024
+        for spool_max_size, rolled in ((len(content) + 1, False), (len(content) - 1, True)):
+            response = FakeResponse(content)
+            with construct_file_like_object(cast(Any, response), spool_max_size=spool_max_size) as file:
+                assert file.read() == content
+                assert getattr(file, '_rolled') is rolled
+            assert response.closed and response.released
+
+    def test_construct_file_like_object_error(self):
+        response = BrokenResponse(b'excel' * 1024 * 64)
+        files: list[SpooledTemporaryFile[bytes]] = []
+
+        def spool(max_size: int) -> SpooledTemporaryFile[bytes]:
+            files.append(SpooledTemporaryFile(max_size=max_size))
+            return files[-1]
+
+        with mock.patch('excelalchemy.util.file.SpooledTemporaryFile', spool):
+            self.assertRaises(ConnectionResetError, construct_file_like_object, cast(Any, response))
+        assert files and files[0].closed
+        assert response.closed and response.released
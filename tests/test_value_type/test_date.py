@@ -1,3 +1,4 @@
+from datetime import datetime
 from decimal import Decimal
 from typing import cast
 
@@ -88,6 +89,10 @@ class TestDate(BaseTestCase):
         assert field.value_type.serialize(
             DateTime(2022, 2, 2, 12, 12, 12, tzinfo=Timezone('Asia/Shanghai')), field
         ) == DateTime(2022, 2, 2, 12, 12, 12, tzinfo=Timezone('Asia/Shanghai'))
+        # 按原生类型读取时, Excel 中的日期为 datetime
+        assert field.value_type.serialize(datetime(2022, 2, 2, 12, 12, 12), field) == field.value_type.serialize(
+            '2022-02-02 12:12:12', field
+        )
 
     async def test_deserialize(self):
         class Importer(BaseModel):
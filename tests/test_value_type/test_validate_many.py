@@ -0,0 +1,140 @@
+import datetime
+from decimal import Decimal
+from typing import Any
+
+from pendulum import DateTime
+from pendulum import today
+from pendulum.tz.timezone import Timezone
+from pydantic import create_model
+
+from excelalchemy import Boolean
+from excelalchemy import Date
+from excelalchemy import DateFormat
+from excelalchemy import Email
+from excelalchemy import FieldMeta
+from excelalchemy import Money
+from excelalchemy import MultiCheckbox
+from excelalchemy import Number
+from excelalchemy import Option
+from excelalchemy import OptionId
+from excelalchemy import Radio
+from excelalchemy import String
+from excelalchemy.const import MULTI_CHECKBOX_SEPARATOR
+from excelalchemy.const import DataRangeOption
+from excelalchemy.types.abstract import ABCValueType
+from excelalchemy.types.field import FieldMetaInfo
+from tests import BaseTestCase
+
+OPTIONS = [Option(id=OptionId('1'), name='选项1'), Option(id=OptionId('2'), name='选项2')]
+LETTER_OPTIONS = [Option(id=OptionId('a'), name='a'), Option(id=OptionId('b'), name='b')]
+SHANGHAI = Timezone('Asia/Shanghai')
+NEXT_YEAR = DateTime(1970, 2, 2, 12, 12, 12, tzinfo=SHANGHAI).add(today().year)
+DATES = [
+    '',
+    '2022-02-02',
+    '2022/02/02',
+    '2022-02-02 12:12:12',
+    '2022-02-02 25:00:00',
+    datetime.datetime(2022, 2, 2, 12, 12, 12),
+    DateTime(2022, 2, 2, 12, 12, 12, tzinfo=SHANGHAI),
+    '2022-02-02',
+]
+
+# (值类型, FieldMeta 参数, 输入的值), 取自各个值类型的单元测试
+CASES: list[tuple[type[ABCValueType], dict[str, Any], list[Any]]] = [
+    (Number, {}, [1.23, 1.234, Decimal('1.234'), 'ddd', 1, 2, True, ' 5 ', '']),
+    (Number, {'fraction_digits': 2}, [1.234, 1.235, 1.236, 1.2345, '1.2345']),
+    (Number, {'importer_ge': 1, 'importer_le': 2}, [0, 1, 2, 3, '2']),
+    (Number, {'importer_le': 2}, [1, 2, 3]),
+    (Number, {'importer_ge': 1}, [0, 1, 2]),
+    (Number, {'importer_le': 100, 'fraction_digits': 1}, ['1', 2, 3.14159, '101', 'abc', ' 5 ']),
+    (String, {'importer_max_length': 3}, ['张三', '很长的名字', 'a b', 1, '', 'a\tb']),
+    (String, {}, ['张三', 'abc', 'ABC', '123', '，。', '😀']),
+    (Boolean, {}, [True, False, '是', '否', '对', 1]),
+    (Radio, {'options': OPTIONS}, ['1', '2', '选项1', '选项2', '选项3', f'选项1{MULTI_CHECKBOX_SEPARATOR}选项2', 1]),
+    (Radio, {'options': []}, ['选项1', ' a ']),
+    (Date, {'date_format': DateFormat.DAY}, DATES),
+    (Date, {'date_format': DateFormat.MONTH}, DATES),
+    (Date, {'date_format': DateFormat.YEAR}, DATES),
+    (Date, {'date_format': DateFormat.MINUTE}, DATES),
+    (Date, {'date_format': DateFormat.DAY, 'date_range_option': DataRangeOption.NEXT}, [*DATES, NEXT_YEAR]),
+    (Date, {'date_format': DateFormat.DAY, 'date_range_option': DataRangeOption.PRE}, [*DATES, NEXT_YEAR]),
+    (
+        MultiCheckbox,
+        {'options': LETTER_OPTIONS},
+        [
+            None,
+            'ddd',
+            ['a', 'b'],
+            ['a', 'b', 'c'],
+            ['a', 'b', 'c', 'c'],
+            ['a', 'b', 'c', ''],
+            f'a{MULTI_CHECKBOX_SEPARATOR}b',
+        ],
+    ),
+    (MultiCheckbox, {'options': OPTIONS}, [f'选项1{MULTI_CHECKBOX_SEPARATOR}选项2', '选项1', '选项1，选项1', '选项3', 1]),
+    (MultiCheckbox, {'options': []}, [['a'], 'a']),
+    (Money, {}, ['1.234', 'abc']),
+    (Email, {}, ['noreply@example.com', 'abc']),
+]
+
+
+class TestValidateMany(BaseTestCase):
+    def build_field_meta(self, value_type: type[ABCValueType], field_meta_kwargs: dict[str, Any]) -> FieldMetaInfo:
+        importer = create_model('Importer', value=(value_type, FieldMeta(label='字段', order=1, **field_meta_kwargs)))
+        return self.build_alchemy(importer).ordered_field_meta[0]
+
+    @staticmethod
+    def validate_one_by_one(values: list[Any], field_meta: FieldMetaInfo) -> tuple[list[Any], dict[int, Exception]]:
+        results: list[Any] = []
+        errors: dict[int, Exception] = {}
+        for index, value in enumerate(values):
+            try:
+                results.append(field_meta.value_type.__validate__(value, field_meta))
+            except (ValueError, TypeError, AssertionError) as exc:
+                results.append(value)
+                errors[index] = exc
+        return results, errors
+
+    def assert_same_as_one_by_one(self, values: list[Any], field_meta: FieldMetaInfo) -> None:
+        results, errors = field_meta.value_type.validate_many(values, field_meta)
+        expected_results, expected_errors = self.validate_one_by_one(values, field_meta)
+        assert results == expected_results
+        assert {k: (type(v), v.args) for k, v in errors.items()} == {
+            k: (type(v), v.args) for k, v in expected_errors.items()
+        }
+
+    async def test_same_as_one_by_one(self):
+        """按列批量处理与逐个调用 serialize/__validate__ 的结果一致"""
+        for value_type, field_meta_kwargs, values in CASES:
+            with self.subTest(value_type=value_type.__name__, **field_meta_kwargs):
+                field_meta = self.build_field_meta(value_type, field_meta_kwargs)
+                serialized = value_type.serialize_many(values, field_meta)
+                assert serialized == [value_type.serialize(x, field_meta) for x in values]
+
+                self.assert_same_as_one_by_one(serialized, field_meta)
+                self.assert_same_as_one_by_one(values, field_meta)  # 未经过 serialize 的值
+
+    async def test_empty_column(self):
+        for value_type, field_meta_kwargs, _ in CASES:
+            field_meta = self.build_field_meta(value_type, field_meta_kwargs)
+            assert value_type.serialize_many([], field_meta) == []
+            assert value_type.validate_many([], field_meta) == ([], {})
+
+    async def test_boolean_column(self):
+        """布尔值按列批量处理, 无法识别的值保留原值并记录错误; 子类覆盖 __validate__ 时逐个调用"""
+        field_meta = self.build_field_meta(Boolean, {})
+        values = Boolean.serialize_many([' 是 ', '否', True, '对'], field_meta)
+        assert values == ['是', '否', 'True', '对']
+
+        results, errors = Boolean.validate_many([*values[:2], True, '对'], field_meta)
+        assert results == [True, False, True, '对']
+        assert {k: v.args for k, v in errors.items()} == {3: ('请输入“是”或“否”',)}
+
+        class YesNo(Boolean):
+            @classmethod
+            def __validate__(cls, value: Any, field_meta: FieldMetaInfo) -> bool:
+                return str(value).lower() == 'yes'
+
+        field_meta = self.build_field_meta(YesNo, {})
+        assert YesNo.validate_many(['yes', '是'], field_meta) == ([True, False], {})